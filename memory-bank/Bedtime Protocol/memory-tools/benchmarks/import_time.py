@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for memory_manager.py.
+
+Imports the module in a fresh interpreter under ``python -X importtime``,
+compares the cumulative import time against a budget, and checks that the
+import left no new files behind (log files, the catalog database, ...).
+
+Usage:
+    python benchmarks/import_time.py [--budget-ms MS] [--runs N]
+
+Exits with status 1 when the budget is exceeded or the import had side effects.
+"""
+
+import argparse
+import py_compile
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET_MS = 150.0
+IMPORTTIME_PATTERN = re.compile(
+    r"import time:\s+\d+\s+\|\s+(\d+)\s+\|\s+memory_manager$"
+)
+
+
+def snapshot_tree(root: Path) -> set[Path]:
+    """
+    List every file and directory under a root, ignoring bytecode caches.
+
+    Args:
+        root: Directory to snapshot
+
+    Returns:
+        Set of paths relative to the root
+    """
+    return {
+        path.relative_to(root)
+        for path in root.rglob("*")
+        if "__pycache__" not in path.parts
+    }
+
+
+def measure_import_ms() -> float:
+    """
+    Import memory_manager in a fresh interpreter and report its import time.
+
+    Returns:
+        Cumulative import time of the module in milliseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import memory_manager"],
+        cwd=TOOLS_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    if result.stdout:
+        raise RuntimeError(
+            f"Importing memory_manager printed output: {result.stdout!r}"
+        )
+
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.search(line)
+        if match:
+            return int(match.group(1)) / 1000
+    raise RuntimeError("memory_manager missing from -X importtime output")
+
+
+def main() -> int:
+    """Run the import-time budget check."""
+    parser = argparse.ArgumentParser(
+        description="Check the memory_manager import-time budget"
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help="Maximum cumulative import time in milliseconds "
+        f"(default: {DEFAULT_BUDGET_MS:g})",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="Number of imports to time; the fastest run is compared (default: 5)",
+    )
+    args = parser.parse_args()
+
+    # Compile the bytecode up front (even under PYTHONDONTWRITEBYTECODE) and
+    # warm up, so bytecode compilation is not part of the measurement
+    py_compile.compile(str(TOOLS_DIR / "memory_manager.py"), doraise=True)
+    measure_import_ms()
+
+    before = snapshot_tree(TOOLS_DIR)
+    timings = [measure_import_ms() for _ in range(max(1, args.runs))]
+    created = snapshot_tree(TOOLS_DIR) - before
+
+    best = min(timings)
+    print(
+        f"memory_manager import: best {best:.1f} ms over {len(timings)} runs "
+        f"(budget {args.budget_ms:g} ms)"
+    )
+
+    failed = False
+    if best > args.budget_ms:
+        print(f"FAIL: import time exceeds budget by {best - args.budget_ms:.1f} ms")
+        failed = True
+    if created:
+        print("FAIL: importing memory_manager created files:")
+        for path in sorted(created):
+            print(f"  {path}")
+        failed = True
+
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark harness for memory_manager.py.
+
+For each bank size, generates a synthetic memory bank in a temporary
+directory and times the main phases of the script against it, in the order
+a real run performs them:
+
+    analyze_long_term_memory, auto_detect_files_to_archive, compile_plan,
+    run_dry_run, perform_operations, verify_operations,
+    generate_operation_report, reorganize_existing_files
+
+Every phase records its wall time and the number of filesystem calls it made
+(stat, lstat, scandir, listdir, DirEntry.stat and open), in total and per
+file of the bank. Results are written as JSON so that runs can be compared
+over time.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--sizes 1000,10000,100000]
+                                        [--no-catalog] [--output results.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import memory_manager as mm  # noqa: E402
+from benchmarks.synthetic_bank import BankSpec, generate_memory_bank  # noqa: E402
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+COUNTED_CALLS = {
+    "stat": (os, "stat"),
+    "lstat": (os, "lstat"),
+    "scandir": (os, "scandir"),
+    "listdir": (os, "listdir"),
+    "open": (io, "open"),
+}
+
+
+class _CountingEntry:
+    """DirEntry proxy counting the first stat() of each entry (later ones are cached)."""
+
+    def __init__(self, entry: os.DirEntry, counts: dict[str, int]) -> None:
+        self._entry = entry
+        self._counts = counts
+        self._stat_counted = False
+        self.name = entry.name
+        self.path = entry.path
+
+    def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+        if not self._stat_counted:
+            self._counts["dirent_stat"] += 1
+            self._stat_counted = True
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._entry, name)
+
+    def __fspath__(self) -> str:
+        return self.path
+
+
+class _CountingScandir:
+    """Scandir iterator yielding counting DirEntry proxies."""
+
+    def __init__(self, iterator: Any, counts: dict[str, int]) -> None:
+        self._iterator = iterator
+        self._counts = counts
+
+    def __enter__(self) -> _CountingScandir:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._iterator.close()
+
+    def __iter__(self) -> Iterator[_CountingEntry]:
+        for entry in self._iterator:
+            yield _CountingEntry(entry, self._counts)
+
+    def close(self) -> None:
+        self._iterator.close()
+
+
+@contextlib.contextmanager
+def count_fs_calls() -> Iterator[dict[str, int]]:
+    """
+    Count filesystem calls made inside the block.
+
+    Wraps os.stat, os.lstat, os.scandir, os.listdir and io.open (which also
+    serves builtins.open and Path.open) for the duration of the block. Entries
+    returned by os.scandir count their first stat() as "dirent_stat".
+
+    Yields:
+        Dict of call counts, filled in as calls are made
+    """
+    counts = {name: 0 for name in COUNTED_CALLS}
+    counts["dirent_stat"] = 0
+    originals = {
+        name: getattr(module, attr) for name, (module, attr) in COUNTED_CALLS.items()
+    }
+
+    def counting(name: str, function: Callable[..., Any]) -> Callable[..., Any]:
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            counts[name] += 1
+            return function(*args, **kwargs)
+
+        return wrapper
+
+    for name, (module, attr) in COUNTED_CALLS.items():
+        setattr(module, attr, counting(name, originals[name]))
+    os.scandir = lambda *args: _CountingScandir(  # type: ignore[assignment]
+        counting("scandir", originals["scandir"])(*args), counts
+    )
+    builtins.open = io.open
+    try:
+        yield counts
+    finally:
+        for name, (module, attr) in COUNTED_CALLS.items():
+            setattr(module, attr, originals[name])
+        builtins.open = originals["open"]
+
+
+def time_phase(
+    results: list[dict[str, Any]],
+    files: int,
+    phase: str,
+    function: Callable[..., Any],
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    """
+    Time one phase, with its console output suppressed, and record the result.
+
+    Args:
+        results: List to append the phase record to
+        files: Size of the bank being benchmarked
+        phase: Name of the phase
+        function: Function to call
+        *args: Positional arguments for the function
+        **kwargs: Keyword arguments for the function
+
+    Returns:
+        The function's return value
+    """
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        with count_fs_calls() as fs_calls:
+            start = time.perf_counter()
+            value = function(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+
+    total_calls = sum(fs_calls.values())
+    results.append(
+        {
+            "files": files,
+            "phase": phase,
+            "seconds": round(elapsed, 6),
+            "fs_calls": fs_calls,
+            "fs_calls_per_file": round(total_calls / files, 3),
+        }
+    )
+    print(
+        f"  {phase:<30} {elapsed:>10.3f}s  {total_calls:>10} fs calls  "
+        f"{total_calls / files:>7.2f} per file",
+        file=sys.stderr,
+    )
+    return value
+
+
+def benchmark_bank_size(
+    files: int, detection: str, workers: int, seed: int, use_catalog: bool = True
+) -> list[dict[str, Any]]:
+    """
+    Benchmark every phase against a freshly generated bank of the given size.
+
+    Args:
+        files: Number of files in the synthetic bank
+        detection: Category detection method
+        workers: Number of worker threads for operations and verification
+        seed: Random seed for the generator
+        use_catalog: If False, benchmark the direct directory scans instead
+            of the file catalog
+
+    Returns:
+        List of phase records
+    """
+    results: list[dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory(prefix="memory-bench-") as temp_dir:
+        root = Path(temp_dir) / "memory-bank"
+
+        start = time.perf_counter()
+        counts = generate_memory_bank(root, BankSpec(total_files=files, seed=seed))
+        print(
+            f"Bank of {files} files generated in "
+            f"{time.perf_counter() - start:.1f}s: {counts}",
+            file=sys.stderr,
+        )
+
+        # Fresh process-wide state, with the catalog kept next to the bank
+        mm.catalog_enabled = use_catalog
+        mm._catalog = (
+            mm.MemoryCatalog(Path(temp_dir) / mm.CATALOG_FILENAME)
+            if use_catalog
+            else None
+        )
+        mm._search_index = mm.SearchIndex(Path(temp_dir) / mm.SEARCH_INDEX_FILENAME)
+        mm.category_cache = mm.CategorizationCache()
+        mm.copy_backend_counts.clear()
+
+        def phase(name: str, function: Callable[..., Any], *args: Any) -> Any:
+            return time_phase(results, files, name, function, *args)
+
+        try:
+            phase(
+                "analyze_long_term_memory", mm.analyze_long_term_memory, root, detection
+            )
+            operations = phase(
+                "auto_detect_files_to_archive", mm.auto_detect_files_to_archive, root
+            )
+            operations = phase(
+                "compile_plan",
+                lambda: mm.compile_plan(
+                    operations, root, True, detection, include_hashes=False
+                )["operations"],
+            )
+            phase(
+                "run_dry_run", mm.run_dry_run, operations, root, False, True, detection
+            )
+            phase(
+                "perform_operations",
+                mm.perform_operations,
+                operations,
+                root,
+                False,
+                True,
+                detection,
+                workers,
+            )
+            phase("verify_operations", mm.verify_operations, operations, root, workers)
+            phase(
+                "generate_operation_report",
+                mm.generate_operation_report,
+                operations,
+                operations,
+                [],
+                Path(temp_dir) / "report.md",
+            )
+
+            # Reorganize each archive from a fresh (untimed) analysis, since
+            # perform_operations has just added files to the archives
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                analysis = mm.analyze_long_term_memory(root, detection)
+
+            def reorganize_all() -> None:
+                for memory_type in mm.MEMORY_TYPES:
+                    mm.reorganize_existing_files(
+                        root / memory_type / "archive",
+                        analysis["memory_types"][memory_type],
+                        False,
+                        {
+                            "force_overwrite": False,
+                            "create_metadata": True,
+                            "category_detection": detection,
+                        },
+                    )
+
+            phase("reorganize_existing_files", reorganize_all)
+        finally:
+            if mm._catalog is not None:
+                mm._catalog.close()
+            mm._catalog = None
+            mm._search_index.close()
+            mm._search_index = None
+
+    for record in results:
+        record["operations"] = len(operations)
+    return results
+
+
+def main() -> int:
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description="Benchmark memory_manager.py at scale")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="Comma-separated bank sizes in files (default: 1000,10000,100000)",
+    )
+    parser.add_argument(
+        "--detection",
+        choices=["basic", "smart", "content-based"],
+        default="smart",
+        help="Category detection method (default: smart)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Worker threads (default: 1)"
+    )
+    parser.add_argument(
+        "--classify-mode",
+        choices=mm.CLASSIFY_MODES,
+        default="auto",
+        help="Classification mode for content-based detection (default: auto)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument(
+        "--no-catalog",
+        action="store_true",
+        help="Benchmark direct directory scans instead of the file catalog",
+    )
+    parser.add_argument(
+        "--output", type=Path, help="Write JSON results to this file (default: stdout)"
+    )
+    args = parser.parse_args()
+
+    # Keep the script's log records out of the console
+    logging.getLogger().addHandler(logging.NullHandler())
+    mm.classification_mode = args.classify_mode
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    results = []
+    for size in sizes:
+        results.extend(
+            benchmark_bank_size(
+                size, args.detection, args.workers, args.seed, not args.no_catalog
+            )
+        )
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "detection": args.detection,
+        "workers": args.workers,
+        "classify_mode": args.classify_mode,
+        "catalog": not args.no_catalog,
+        "copy_backend": mm.copy_backend,
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Synthetic memory bank generator for benchmarks.
+
+Creates a memory bank with the BIG BRAIN layout (core/episodic/semantic/
+procedural, each with active/ and archive/) filled with generated markdown
+files:
+
+- versioned ``_vX.Y`` series in the active directories, whose older
+  versions are picked up by auto-detection
+- unversioned active files
+- loose archive files, named and written so that category detection has
+  something to find
+- archive files already sorted into category folders
+
+Usage:
+    python benchmarks/synthetic_bank.py DEST --files 10000 [--seed 0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from memory_manager import CONTENT_KEYWORDS, MEMORY_TYPES  # noqa: E402
+
+
+@dataclass
+class BankSpec:
+    """Shape of a synthetic memory bank."""
+
+    total_files: int = 1000
+    versioned_fraction: float = 0.2
+    active_fraction: float = 0.05
+    loose_fraction: float = 0.45
+    max_versions: int = 5
+    body_lines: int = 20
+    seed: int = 0
+
+
+def _file_body(title: str, keywords: list[str], lines: int, rng: random.Random) -> str:
+    """
+    Build markdown content mentioning a category's keywords.
+
+    Args:
+        title: Heading of the document
+        keywords: Keywords to weave into the body
+        lines: Number of body lines
+        rng: Random number generator
+
+    Returns:
+        Markdown text
+    """
+    body = [f"# {title}", ""]
+    for i in range(lines):
+        keyword = rng.choice(keywords)
+        body.append(f"- Note {i}: the {keyword} was reviewed and recorded.")
+    return "\n".join(body) + "\n"
+
+
+def _write(path: Path, content: str, mtime: float) -> None:
+    """Write a file and set its modification time."""
+    path.write_text(content, encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def generate_memory_bank(root: Path, spec: BankSpec) -> dict[str, int]:
+    """
+    Generate a synthetic memory bank.
+
+    Files are spread evenly over the memory types. The requested total is
+    split into versioned series, unversioned active files, loose archive
+    files and categorized archive files according to the spec.
+
+    Args:
+        root: Memory bank root directory to create
+        spec: Shape of the bank
+
+    Returns:
+        Dict with the number of files written of each kind
+    """
+    rng = random.Random(spec.seed)
+    base_time = 1_700_000_000.0
+    counts = {"versioned": 0, "active": 0, "loose": 0, "categorized": 0}
+
+    per_type = max(1, spec.total_files // len(MEMORY_TYPES))
+    for memory_type in MEMORY_TYPES:
+        active_dir = root / memory_type / "active"
+        archive_dir = root / memory_type / "archive"
+        active_dir.mkdir(parents=True, exist_ok=True)
+        archive_dir.mkdir(parents=True, exist_ok=True)
+
+        categories = CONTENT_KEYWORDS[memory_type]
+        category_names = list(categories)
+
+        # Versioned series: base.md plus base_vX.Y.md, newest last
+        versioned_budget = int(per_type * spec.versioned_fraction)
+        series = 0
+        while versioned_budget > 0:
+            category = category_names[series % len(category_names)]
+            base = f"{category}_{series:06d}"
+            versions = min(versioned_budget, rng.randint(2, spec.max_versions))
+            for version in range(versions):
+                name = f"{base}.md" if version == 0 else f"{base}_v1.{version}.md"
+                content = _file_body(
+                    f"{base} v1.{version}", categories[category], spec.body_lines, rng
+                )
+                _write(active_dir / name, content, base_time + series * 10 + version)
+            counts["versioned"] += versions
+            versioned_budget -= versions
+            series += 1
+
+        for i in range(int(per_type * spec.active_fraction)):
+            category = category_names[i % len(category_names)]
+            name = f"{category}_active_{i:06d}.md"
+            content = _file_body(name, categories[category], spec.body_lines, rng)
+            _write(active_dir / name, content, base_time + i)
+            counts["active"] += 1
+
+        # Loose archive files, named after a category so that smart detection
+        # finds it, and mentioning the category's keywords for content detection
+        for i in range(int(per_type * spec.loose_fraction)):
+            category = category_names[i % len(category_names)]
+            name = f"{category.lower()}_note_{i:06d}.md"
+            content = _file_body(name, categories[category], spec.body_lines, rng)
+            _write(archive_dir / name, content, base_time + i)
+            counts["loose"] += 1
+
+        categorized = per_type - sum(
+            int(per_type * fraction)
+            for fraction in (
+                spec.versioned_fraction,
+                spec.active_fraction,
+                spec.loose_fraction,
+            )
+        )
+        for i in range(max(0, categorized)):
+            category = category_names[i % len(category_names)]
+            category_dir = archive_dir / category
+            category_dir.mkdir(exist_ok=True)
+            name = f"archived_{i:06d}.md"
+            content = _file_body(name, categories[category], spec.body_lines, rng)
+            _write(category_dir / name, content, base_time + i)
+            counts["categorized"] += 1
+
+    return counts
+
+
+def main() -> int:
+    """Generate a synthetic memory bank from the command line."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic memory bank")
+    parser.add_argument("destination", type=Path, help="Memory bank root to create")
+    parser.add_argument(
+        "--files", type=int, default=1000, help="Total number of files (default: 1000)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Random seed (default: 0)"
+    )
+    args = parser.parse_args()
+
+    if args.destination.exists() and any(args.destination.iterdir()):
+        print(f"Destination is not empty: {args.destination}")
+        return 1
+
+    counts = generate_memory_bank(
+        args.destination, BankSpec(total_files=args.files, seed=args.seed)
+    )
+    print(f"Generated {sum(counts.values())} files in {args.destination}: {counts}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
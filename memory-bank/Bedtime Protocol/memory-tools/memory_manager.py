@@ -25,9 +25,27 @@ Usage:
     python memory_manager.py [config_file] [--organize-by-category]
     python memory_manager.py [config_file] [--reorganize-existing]
     python memory_manager.py [config_file] [--analyze-organization]
+    python memory_manager.py [config_file] [--pack-archive] [--pack-age DAYS] [--pack-codec {zlib,lzma,zstd}]
     python memory_manager.py [config_file] [--non-interactive] [--report-file REPORT_FILE]
+    python memory_manager.py [config_file] [--report-file REPORT_FILE] [--report-format {md,json,csv}]
     python memory_manager.py [config_file] [--mode {plan,act,auto}]
     python memory_manager.py [config_file] [--auto-version]
+    python memory_manager.py [config_file] [--mode plan] [--emit-plan PLAN_FILE]
+    python memory_manager.py [--apply-plan PLAN_FILE]
+    python memory_manager.py [--resume]
+    python memory_manager.py [--query-storage-log DATE]
+    python memory_manager.py [--search QUERY] [--search-limit N] [--search-type TYPE] [--search-category CATEGORY]
+    python memory_manager.py [config_file] [--no-catalog]
+    python memory_manager.py [config_file] [--workers N]
+    python memory_manager.py [config_file] [--copy-backend {auto,reflink,copy_file_range,sendfile,buffered}]
+    python memory_manager.py [config_file] [--fast-move]
+    python memory_manager.py [config_file] [--dedupe-archive] [--dedupe]
+    python memory_manager.py [config_file] [--delta-archive] [--delta-versions] [--delta-keyframe N]
+    python memory_manager.py [config_file] [--mode act] [--pipeline]
+    python memory_manager.py [config_file] [--classify-mode {auto,serial,thread,process}]
+    python memory_manager.py [config_file] [--watch] [--watch-backend {auto,inotify,poll}] [--watch-debounce SECONDS]
+    python memory_manager.py [config_file] [--verbosity {quiet,summary,detail}] [--log-format {text,json}]
+    python memory_manager.py [config_file] [--metrics-dir DIR]
 
 Arguments:
     config_file          Path to the memory configuration JSON file (default: memory_config.json)
@@ -36,66 +54,103 @@ Arguments:
     --organize-by-category   Organize files into category folders in archive directories
     --reorganize-existing    Organize existing files in archive directories into category folders
     --analyze-organization   Analyze current organization without making changes
+    --pack-archive           Roll cold archive files into compressed packs with a random-access index
+    --pack-age DAYS          With --pack-archive, pack files not modified for DAYS days (default: 30)
+    --pack-codec             With --pack-archive, compression codec: zlib, lzma or zstd (default: zlib)
+    --dedupe-archive         Replace duplicate archive files with hardlinks into the blob store
+    --delta-archive          Convert the _vX.Y version series in archive folders to delta chains
+    --delta-versions         Store archived _vX.Y versions as line diffs against their predecessor
+    --delta-keyframe N       Store a full keyframe every N versions of a delta chain (default: 10)
     --category-detection     Method for detecting file categories (basic, smart, content-based)
     --non-interactive        Run all operations without prompting for confirmation (for AI assistants)
     --report-file            Path to write operation report (useful with --non-interactive)
+    --report-format          Operation report format: md, json or csv (default: from the report file extension)
     --mode                   Operation mode: plan (analyze only), act (perform operations), auto (determine from activeContext.md)
     --auto-version           Automatically create versioned copies of files before archiving
+    --emit-plan PLAN_FILE    In PLAN mode, write the compiled execution plan to PLAN_FILE
+    --apply-plan PLAN_FILE   Execute a compiled plan in ACT mode, skipping the dry run if nothing changed
+    --resume                 Resume an interrupted run from its operation journal
+    --query-storage-log DATE List storage log entries for a day, month or year (uses the log index)
+    --search QUERY           Search memory files by BM25 rank, with file, version and heading
+    --search-limit N         Maximum number of search results (default: 10)
+    --search-type            Only search files of one memory type
+    --search-category        Only search files in one archive category folder
+    --no-search-index        Do not update the full-text search index while moving files
+    --no-catalog             Scan directories directly instead of using the persistent file catalog
+    --workers N              Run independent copy, verify and recycle operations on N threads
+    --copy-backend           File copy backend (reflink, copy_file_range, sendfile, buffered; default: auto)
+    --fast-move              Hardlink into the archive on the same filesystem, then unlink originals
+    --dedupe                 Link archive copies of already stored content to its blob
+    --pipeline               Stream operations through version, copy, verify and recycle stages
+    --classify-mode          Serial, thread or process classification for content-based detection
+    --watch                  Keep running and organize the memory bank incrementally as files change
+    --watch-backend          How to watch for changes: inotify, poll or auto (default: auto)
+    --watch-debounce         Seconds files must stop changing before they are organized (default: 2)
+    --verbosity              Console output: quiet, summary or detail (default: detail)
+    --log-format             Log file format: text, or json lines with operation IDs and durations
+    --metrics-dir DIR        Directory for each run's JSON metrics summary and Prometheus textfile
 """
 
-import argparse
-import ctypes
+from __future__ import annotations
+
+import atexit
+import contextlib
+import copy
+import functools
 import gc
+import hashlib
+import importlib
+import io
 import json
 import logging
 import os
 import re
-import shutil
 import sys
-import textwrap
-from collections.abc import Callable
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterable, Iterator
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Any, TypeVar
-
-try:
-    import psutil  # type: ignore
+from typing import TYPE_CHECKING, Any, NamedTuple, TextIO, TypeVar
 
-    PSUTIL_AVAILABLE = True
-except ImportError:
-    PSUTIL_AVAILABLE = False
-    print("Note: psutil not available. Memory usage monitoring disabled.")
+if TYPE_CHECKING:
+    import sqlite3
 
-try:
-    import markdown  # type: ignore
+# Optional dependencies are imported on first use so that importing this
+# module stays fast and free of side effects
+_optional_modules: dict[str, Any] = {}
 
-    MARKDOWN_AVAILABLE = True
-except ImportError:
-    MARKDOWN_AVAILABLE = False
-    print("Note: markdown package not available. Some formatting features disabled.")
 
-try:
-    import concurrent.futures  # type: ignore
+def _import_optional(module_name: str) -> Any | None:
+    """
+    Import an optional dependency on first use.
 
-    CONCURRENT_AVAILABLE = True
-except ImportError:
-    CONCURRENT_AVAILABLE = False
-    print(
-        "Note: concurrent.futures not available. Some parallel processing features disabled."
-    )
+    Args:
+        module_name: Name of the module to import
 
-try:
-    import fnmatch  # type: ignore
+    Returns:
+        The module, or None if it is not installed
+    """
+    if module_name not in _optional_modules:
+        try:
+            _optional_modules[module_name] = importlib.import_module(module_name)
+        except ImportError:
+            _optional_modules[module_name] = None
+            logger.info(f"Optional module not available: {module_name}")
+    return _optional_modules[module_name]
 
-    FNMATCH_AVAILABLE = True
-except ImportError:
-    FNMATCH_AVAILABLE = (
-        True  # Built into Python standard library, should always be available
-    )
 
 # Define constants
 MEMORY_TYPES = ["core", "episodic", "semantic", "procedural"]
+CATALOG_FILENAME = "memory_catalog.db"
+JOURNAL_FILENAME = "memory_journal.jsonl"
+JOURNAL_SYNC_INTERVAL = 64  # Journal records written between fsyncs
+HASH_CHUNK_SIZE = 1024 * 1024
+CATEGORY_CACHE_SIZE = 10000
+# Bump when the categorization logic changes to invalidate cached categories
+CATEGORIZATION_RULES_REVISION = 1
 
 
 # ANSI color codes for console output
@@ -109,36 +164,160 @@ class Colors:
     END = "\033[0m"
 
 
+# Console verbosity levels: "detail" prints everything, "summary" drops the
+# per-file lines of large runs, and "quiet" prints only warnings and errors
+VERBOSITY_LEVELS = ["quiet", "summary", "detail"]
+LOG_FORMATS = ["text", "json"]
+console_verbosity = "detail"
+
+# Per-thread output capture used by parallel operations to keep console and
+# log output in operation order
+_output_capture = threading.local()
+
+# Operation the current thread is working on, attached to its log records
+_operation_context = threading.local()
+
+
+def _stamp_operation(record: logging.LogRecord) -> None:
+    """Attach the current thread's operation ID to a log record, if it has none."""
+    if not hasattr(record, "operation_id"):
+        operation_id = getattr(_operation_context, "operation_id", None)
+        if operation_id is not None:
+            record.operation_id = operation_id
+
+
+@contextlib.contextmanager
+def operation_log_context(operation: dict[str, Any], phase: str) -> Iterator[None]:
+    """
+    Tag the log records of one phase of an operation and log its duration.
+
+    Records logged inside the block carry the operation's ID (its journal ID,
+    or its source path if it has none), and a closing record gives the phase
+    and its duration in milliseconds, for the JSON log format.
+
+    Args:
+        operation: Operation being worked on
+        phase: Name of the phase (e.g. "copy", "verify", "recycle")
+    """
+    operation_id = operation.get("journal_id", operation.get("source"))
+    previous = getattr(_operation_context, "operation_id", None)
+    _operation_context.operation_id = operation_id
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration_ms = round((time.perf_counter() - start) * 1000, 3)
+        logger.info(
+            f"{phase} finished in {duration_ms:.1f} ms",
+            extra={"phase": phase, "duration_ms": duration_ms},
+        )
+        _operation_context.operation_id = previous
+
+
+class _CaptureFilter(logging.Filter):
+    """Logger filter that diverts records into the current thread's capture buffer."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        buffer = getattr(_output_capture, "lines", None)
+        if buffer is None:
+            return True
+        # Stamped now, since the record is replayed on another thread
+        _stamp_operation(record)
+        buffer.append(record)
+        return False
+
+
+_capture_filter = _CaptureFilter()
+
+
+def _emit(text: str) -> None:
+    """Write a line to the console, or to the capture buffer if one is active."""
+    buffer = getattr(_output_capture, "lines", None)
+    if buffer is not None:
+        buffer.append(text)
+    else:
+        print(text)
+
+
+def _replay_output(lines: list[str | logging.LogRecord]) -> None:
+    """Replay captured console lines and log records on the current thread."""
+    for line in lines:
+        if isinstance(line, logging.LogRecord):
+            logging.getLogger(line.name).handle(line)
+        else:
+            print(line)
+
+
+def _shown(level: int, detail: bool = False) -> bool:
+    """Check whether the console verbosity lets a message through."""
+    if level >= logging.WARNING or console_verbosity == "detail":
+        return True
+    return console_verbosity == "summary" and not detail
+
+
+def _console(
+    prefix: str, message: str, color: str, level: int, detail: bool = False
+) -> None:
+    """
+    Write a message to the console sink and to the log.
+
+    This is the single console sink: the line is printed if the console
+    verbosity lets it through, and the message is logged at `level` either
+    way, so call sites need no separate logger call.
+
+    Args:
+        prefix: Console-only prefix (e.g. "✓ SUCCESS: ")
+        message: Message text
+        color: ANSI color of the console line
+        level: Logging level of the record
+        detail: True for per-file lines, which "summary" verbosity drops
+    """
+    if _shown(level, detail):
+        _emit(f"{color}{prefix}{message}{Colors.END}")
+    if logger.isEnabledFor(level):
+        logger.log(level, message, extra={"console": True})
+
+
 def print_colored(message: str, color: str) -> None:
     """Print colored text to console."""
-    print(f"{color}{message}{Colors.END}")
+    _console("", message, color, logging.INFO)
 
 
-def print_header(message: str) -> None:
-    """Print a header message."""
-    print("\n" + "=" * 80)
-    print_colored(f" {message}", Colors.BOLD + Colors.BLUE)
-    print("=" * 80)
+def print_header(message: str, detail: bool = False) -> None:
+    """Print a header message (a per-file header if detail is True)."""
+    shown = _shown(logging.INFO, detail)
+    if shown:
+        _emit("\n" + "=" * 80)
+    _console(" ", message, Colors.BOLD + Colors.BLUE, logging.INFO, detail)
+    if shown:
+        _emit("=" * 80)
 
 
-def print_success(message: str) -> None:
-    """Print a success message."""
-    print_colored(f"✓ SUCCESS: {message}", Colors.GREEN)
+def print_success(message: str, detail: bool = False) -> None:
+    """Print a success message (a per-file line if detail is True)."""
+    _console("✓ SUCCESS: ", message, Colors.GREEN, logging.INFO, detail)
 
 
 def print_warning(message: str) -> None:
     """Print a warning message."""
-    print_colored(f"⚠ WARNING: {message}", Colors.YELLOW)
+    _console("⚠ WARNING: ", message, Colors.YELLOW, logging.WARNING)
 
 
 def print_error(message: str) -> None:
     """Print an error message."""
-    print_colored(f"✗ ERROR: {message}", Colors.RED)
+    _console("✗ ERROR: ", message, Colors.RED, logging.ERROR)
+
 
+def print_info(message: str, detail: bool = False) -> None:
+    """Print an info message (a per-file line if detail is True)."""
+    _console("ℹ ", message, Colors.BLUE, logging.INFO, detail)
 
-def print_info(message: str) -> None:
-    """Print an info message."""
-    print_colored(f"ℹ {message}", Colors.BLUE)
+
+def print_result(message: str) -> None:
+    """Print a line of a command's output, whatever the console verbosity."""
+    _emit(message)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(message, extra={"console": True})
 
 
 # Error handling helper functions
@@ -155,9 +334,10 @@ def handle_exception(e: Exception, error_msg: str, log_error: bool = True) -> No
         log_error: Whether to log the error message (default: True)
     """
     full_msg = f"{error_msg}: {e}"
-    print_error(full_msg)
-    if log_error and "logger" in globals():
-        logger.error(full_msg)
+    if log_error:
+        print_error(full_msg)
+    elif _shown(logging.ERROR):
+        _emit(f"{Colors.RED}✗ ERROR: {full_msg}{Colors.END}")
 
 
 def safe_operation(
@@ -220,37 +400,24 @@ def find_memory_bank_root() -> Path:
     # (script is in memory-bank/Bedtime Protocol/memory-tools)
     memory_bank_path = script_path.parent.parent
 
-    print_info(f"Memory bank root identified as: {memory_bank_path}")
     return memory_bank_path
 
 
-# Get the script directory and memory-bank root
+# Get the script directory and memory-bank root. Nothing is created or
+# configured at import time: logs/ and log handlers are set up by main().
 script_dir = Path(os.path.dirname(os.path.abspath(__file__)))
 logs_dir = script_dir / "logs"
 memory_bank_root = find_memory_bank_root()
 
-# Ensure logs directory exists
-if not logs_dir.exists():
-    logs_dir.mkdir(parents=True, exist_ok=True)
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler(
-            logs_dir / f"memory_manager_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-        ),
-    ],
-)
 logger = logging.getLogger("memory_manager")
+# Without configure_logging() (e.g. when imported as a library), log records
+# are dropped instead of going to logging's last-resort stderr handler
+logger.addHandler(logging.NullHandler())
 
 
 def ensure_directory_exists(directory: Path) -> None:
     """Create directory if it doesn't exist."""
     if not directory.exists():
-        logger.info(f"Creating directory: {directory}")
         print_info(f"Creating directory: {directory}")
         directory.mkdir(parents=True, exist_ok=True)
 
@@ -284,7 +451,8 @@ def get_user_confirmation(prompt: str, non_interactive: bool = False) -> bool:
 
 def log_memory_usage() -> str:
     """Log current memory usage if psutil is available."""
-    if not PSUTIL_AVAILABLE:
+    psutil = _import_optional("psutil")
+    if psutil is None:
         return "Memory monitoring not available (psutil not installed)"
 
     process = psutil.Process(os.getpid())
@@ -298,22 +466,285 @@ def log_memory_usage() -> str:
 
 def trigger_garbage_collection() -> None:
     """Explicitly trigger garbage collection to free memory."""
-    if PSUTIL_AVAILABLE:
+    psutil = _import_optional("psutil")
+    if psutil is not None:
         before = psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024)
 
     gc.collect()
 
-    if PSUTIL_AVAILABLE:
+    if psutil is not None:
         after = psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024)
         freed = before - after
         if freed > 0:
             logger.info(f"Garbage collection freed {freed:.2f} MB of memory")
 
 
+METRICS_TEXTFILE_NAME = "memory_manager.prom"
+METRICS_PREFIX = "memory_manager"
+
+
+class RunMetrics:
+    """
+    Timing and resource metrics of one run of the script.
+
+    Phases record their wall time, CPU time (of the whole process, so worker
+    threads are included) and the number of items they handled; counters
+    record filesystem work such as directory scans, file stats and bytes
+    copied. Phases may nest (e.g. perform inside pipeline) and may run more
+    than once (e.g. once per watch pass), in which case their times add up.
+    At the end of a run, write() saves a JSON run summary and a Prometheus
+    textfile.
+    """
+
+    def __init__(self) -> None:
+        self.started = datetime.now()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._lock = threading.Lock()
+        self.phases: dict[str, dict[str, float]] = {}
+        self.counters: dict[str, int] = {}
+        self.mode: str | None = None
+        self.output_dir: Path | None = None
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """Add to a counter."""
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def record_phase(
+        self, phase: str, wall: float, cpu: float, items: int | None
+    ) -> None:
+        """Add one run of a phase to its totals."""
+        with self._lock:
+            totals = self.phases.setdefault(
+                phase, {"runs": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "items": 0}
+            )
+            totals["runs"] += 1
+            totals["wall_seconds"] += wall
+            totals["cpu_seconds"] += cpu
+            totals["items"] += items or 0
+
+    def summary(self, exit_code: int) -> dict[str, Any]:
+        """
+        Build the run summary.
+
+        Args:
+            exit_code: Exit status of the run
+
+        Returns:
+            Dict of run, phase, file and resource metrics
+        """
+        wall = time.perf_counter() - self._wall_start
+        with self._lock:
+            phases = {
+                phase: {
+                    **totals,
+                    "wall_seconds": round(totals["wall_seconds"], 6),
+                    "cpu_seconds": round(totals["cpu_seconds"], 6),
+                    "items_per_second": round(
+                        totals["items"] / max(totals["wall_seconds"], 1e-9), 3
+                    ),
+                }
+                for phase, totals in self.phases.items()
+            }
+            counters = dict(self.counters)
+        with _copy_backend_lock:
+            backends = dict(copy_backend_counts)
+        files_archived = sum(backends.values())
+
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "finished": datetime.now().isoformat(timespec="seconds"),
+            "mode": self.mode,
+            "exit_code": exit_code,
+            "success": exit_code == 0,
+            "wall_seconds": round(wall, 6),
+            "cpu_seconds": round(time.process_time() - self._cpu_start, 6),
+            "peak_memory_bytes": peak_memory_bytes(),
+            "files_archived": files_archived,
+            "files_per_second": round(files_archived / max(wall, 1e-9), 3),
+            "files_by_backend": backends,
+            "counters": counters,
+            "phases": phases,
+        }
+
+    def write(self, exit_code: int) -> None:
+        """
+        Write the JSON run summary and the Prometheus textfile to output_dir.
+
+        The summary gets a new timestamped file for every run, so a directory
+        of them is a history of runs. The textfile, for node_exporter's
+        textfile collector, is replaced atomically with the latest run.
+        Failures are logged and never fail the run.
+
+        Args:
+            exit_code: Exit status of the run
+        """
+        if self.output_dir is None:
+            return
+        summary = self.summary(exit_code)
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            timestamp = self.started.strftime("%Y%m%d_%H%M%S")
+            summary_path = self.output_dir / f"memory_manager_{timestamp}.metrics.json"
+            with open(summary_path, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2)
+
+            textfile = self.output_dir / METRICS_TEXTFILE_NAME
+            temp_textfile = textfile.with_name(f".{textfile.name}.tmp")
+            with open(temp_textfile, "w", encoding="utf-8") as f:
+                f.write(format_prometheus_metrics(summary))
+            os.replace(temp_textfile, textfile)
+        except OSError as e:
+            logger.warning(f"Could not write run metrics: {e}")
+            return
+        logger.info(f"Run metrics written to {summary_path} and {textfile}")
+
+
+def peak_memory_bytes() -> int | None:
+    """
+    Get the peak resident memory of the process.
+
+    Uses the resource module where available, and psutil's peak working set
+    on Windows.
+
+    Returns:
+        Peak memory in bytes, or None if it cannot be determined
+    """
+    try:
+        import resource
+    except ImportError:
+        psutil = _import_optional("psutil")
+        if psutil is None:
+            return None
+        return getattr(psutil.Process(os.getpid()).memory_info(), "peak_wset", None)
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes elsewhere
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def format_prometheus_metrics(summary: dict[str, Any]) -> str:
+    """
+    Format a run summary in the Prometheus text exposition format.
+
+    Args:
+        summary: Run summary from RunMetrics.summary()
+
+    Returns:
+        Text of the metrics, one gauge per line
+    """
+    lines: list[str] = []
+
+    def gauge(name: str, help_text: str, samples: list[tuple[str, Any]]) -> None:
+        samples = [(labels, value) for labels, value in samples if value is not None]
+        if not samples:
+            return
+        metric = f"{METRICS_PREFIX}_{name}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        lines.extend(f"{metric}{labels} {value}" for labels, value in samples)
+
+    phases = summary["phases"]
+    gauge(
+        "last_run_timestamp_seconds",
+        "Time the last run finished.",
+        [("", round(datetime.fromisoformat(summary["finished"]).timestamp()))],
+    )
+    gauge(
+        "last_run_success",
+        "Whether the last run succeeded.",
+        [("", int(summary["success"]))],
+    )
+    gauge(
+        "run_wall_seconds", "Wall time of the last run.", [("", summary["wall_seconds"])]
+    )
+    gauge(
+        "run_cpu_seconds", "CPU time of the last run.", [("", summary["cpu_seconds"])]
+    )
+    gauge(
+        "peak_memory_bytes",
+        "Peak resident memory of the last run.",
+        [("", summary["peak_memory_bytes"])],
+    )
+    gauge(
+        "files_archived",
+        "Files archived by the last run, by copy backend.",
+        [
+            (f'{{backend="{backend}"}}', count)
+            for backend, count in sorted(summary["files_by_backend"].items())
+        ],
+    )
+    gauge(
+        "files_per_second",
+        "Files archived per second of the last run.",
+        [("", summary["files_per_second"])],
+    )
+    gauge(
+        "phase_wall_seconds",
+        "Wall time of each phase of the last run.",
+        [(f'{{phase="{phase}"}}', t["wall_seconds"]) for phase, t in phases.items()],
+    )
+    gauge(
+        "phase_cpu_seconds",
+        "CPU time of each phase of the last run.",
+        [(f'{{phase="{phase}"}}', t["cpu_seconds"]) for phase, t in phases.items()],
+    )
+    gauge(
+        "phase_items",
+        "Files or operations handled by each phase of the last run.",
+        [(f'{{phase="{phase}"}}', t["items"]) for phase, t in phases.items()],
+    )
+    for counter, value in sorted(summary["counters"].items()):
+        help_text = f"{counter.replace('_', ' ').capitalize()} in the last run."
+        gauge(counter, help_text, [("", value)])
+    return "\n".join(lines) + "\n"
+
+
+run_metrics = RunMetrics()
+
+
+def timed_phase(phase: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Decorator recording each call of a function as a run of a metrics phase.
+
+    The phase's items are the operations the function was given (a list as
+    its first argument) or, for a function that finds them, the list it
+    returned.
+
+    Args:
+        phase: Name of the phase
+    """
+
+    def decorator(function: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            result = function(*args, **kwargs)
+            if args and isinstance(args[0], list):
+                items: int | None = len(args[0])
+            else:
+                items = len(result) if isinstance(result, list) else None
+            run_metrics.record_phase(
+                phase,
+                time.perf_counter() - wall_start,
+                time.process_time() - cpu_start,
+                items,
+            )
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+@functools.lru_cache(maxsize=CATEGORY_CACHE_SIZE)
 def determine_memory_type(file_path: Path, detection_method: str = "smart") -> str:
     """
     Determine the memory type (core, episodic, semantic, procedural) for a file.
 
+    The result depends only on the path, so it is memoized.
+
     Args:
         file_path: Path to the file
         detection_method: Method for detection ('basic', 'smart', 'content-based')
@@ -375,6 +806,9 @@ def determine_file_category(
     """
     Determine the appropriate category folder for a file.
 
+    Results are served from the categorization cache when possible, so
+    content-based detection only reads files that are new or have changed.
+
     Args:
         file_path: Path to the file
         detection_method: Method for detecting categories ('basic', 'smart', 'content-based')
@@ -383,6 +817,250 @@ def determine_file_category(
     Returns:
         Category name for folder organization
     """
+    key = _category_cache_key(file_path, detection_method, content_sample_lines)
+    if key is None:
+        return _determine_file_category_uncached(
+            file_path, detection_method, content_sample_lines
+        )
+
+    # Name-based detection never reads the file, so it is not persisted
+    persistent = detection_method == "content-based"
+    category = category_cache.get(key, persistent)
+    if category is None:
+        category = _determine_file_category_uncached(
+            file_path, detection_method, content_sample_lines
+        )
+        category_cache.put(key, category, persistent)
+    return category
+
+
+def _category_cache_key(
+    file_path: Path, detection_method: str, content_sample_lines: int
+) -> tuple | None:
+    """Internal function building the categorization cache key of a file, if it exists."""
+    method_key = f"{detection_method}:{content_sample_lines}"
+
+    if detection_method != "content-based":
+        # Name-based detection never reads the file, so the path is the key
+        return (str(file_path), 0, 0, method_key, get_categorization_rules_version())
+
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return None
+
+    return (
+        str(file_path),
+        file_stat.st_size,
+        file_stat.st_mtime_ns,
+        method_key,
+        get_categorization_rules_version(),
+    )
+
+
+CLASSIFY_MODES = ["auto", "serial", "thread", "process"]
+CLASSIFY_CHUNK_SIZE = 256  # File paths sent to a worker per task
+CLASSIFY_CALIBRATION_FILES = 64  # Files classified serially to estimate the cost
+CLASSIFY_MIN_PARALLEL_SECONDS = 0.25  # Estimated serial time worth a pool for
+
+# How categorize_files classifies uncached files: one of CLASSIFY_MODES
+classification_mode = "auto"
+_process_pool_startup: float | None = None
+
+
+def categorize_files(
+    file_paths: list[Path],
+    detection_method: str = "smart",
+    content_sample_lines: int = 20,
+) -> list[str]:
+    """
+    Determine the categories of many files at once.
+
+    Like determine_file_category for each file, but the files missing from
+    the categorization cache are classified together by classify_files, so
+    content-based detection of a large archive can use a worker pool.
+
+    Args:
+        file_paths: Paths of the files
+        detection_method: Method for detecting categories ('basic', 'smart', 'content-based')
+        content_sample_lines: Number of lines to sample for content-based detection
+
+    Returns:
+        Category of each file, in the order given
+    """
+    if detection_method != "content-based":
+        return [
+            determine_file_category(file_path, detection_method, content_sample_lines)
+            for file_path in file_paths
+        ]
+
+    categories: list[str | None] = []
+    keys: list[tuple | None] = []
+    misses: list[int] = []
+    for index, file_path in enumerate(file_paths):
+        key = _category_cache_key(file_path, detection_method, content_sample_lines)
+        category = category_cache.get(key) if key is not None else None
+        keys.append(key)
+        categories.append(category)
+        if category is None:
+            misses.append(index)
+
+    if misses:
+        classified = classify_files(
+            [file_paths[index] for index in misses],
+            detection_method,
+            content_sample_lines,
+            classification_mode,
+        )
+        for index, category in zip(misses, classified):
+            categories[index] = category
+            if keys[index] is not None:
+                category_cache.put(keys[index], category)
+
+    return categories
+
+
+def classify_files(
+    file_paths: list[Path],
+    detection_method: str,
+    content_sample_lines: int = 20,
+    mode: str = "auto",
+) -> list[str]:
+    """
+    Classify files without the cache, serially or on a thread or process pool.
+
+    In auto mode, a first sample of files is classified serially and timed.
+    The estimated cost of the rest then picks the mode: serial if it is
+    small, a thread pool if the sample spent most of its time waiting on
+    reads, and a process pool if it was CPU-bound and the estimate outweighs
+    the pool's measured startup cost. Process workers receive the
+    categorization rules once, when the pool starts.
+
+    Args:
+        file_paths: Paths of the files
+        detection_method: Method for detecting categories
+        content_sample_lines: Number of lines to sample for content-based detection
+        mode: One of CLASSIFY_MODES
+
+    Returns:
+        Category of each file, in the order given
+    """
+    categories: list[str] = []
+    if mode == "auto":
+        sample = file_paths[:CLASSIFY_CALIBRATION_FILES]
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        categories = _classify_file_chunk(
+            [str(file_path) for file_path in sample],
+            detection_method,
+            content_sample_lines,
+        )
+        wall = max(time.perf_counter() - wall_start, 1e-9)
+        cpu = time.process_time() - cpu_start
+
+        file_paths = file_paths[len(sample):]
+        mode = _choose_classification_mode(
+            len(file_paths) * wall / max(len(sample), 1), cpu / wall
+        )
+        logger.info(
+            f"Classifying {len(file_paths)} more files in {mode} mode "
+            f"({wall / max(len(sample), 1) * 1000:.2f} ms per file, "
+            f"{min(cpu / wall, 1.0):.0%} CPU)"
+        )
+
+    chunks = [
+        [str(file_path) for file_path in file_paths[start : start + CLASSIFY_CHUNK_SIZE]]
+        for start in range(0, len(file_paths), CLASSIFY_CHUNK_SIZE)
+    ]
+    classify_chunk = functools.partial(
+        _classify_file_chunk,
+        detection_method=detection_method,
+        content_sample_lines=content_sample_lines,
+    )
+
+    if mode == "serial" or len(chunks) <= 1:
+        for chunk in chunks:
+            categories.extend(classify_chunk(chunk))
+    elif mode == "thread":
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor() as executor:
+            for chunk_categories in executor.map(classify_chunk, chunks):
+                categories.extend(chunk_categories)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            initializer=_init_classification_worker, initargs=(CONTENT_KEYWORDS,)
+        ) as executor:
+            for chunk_categories in executor.map(classify_chunk, chunks):
+                categories.extend(chunk_categories)
+
+    return categories
+
+
+def _choose_classification_mode(estimated_seconds: float, cpu_fraction: float) -> str:
+    """
+    Pick the classification mode for files expected to take estimated_seconds serially.
+
+    Args:
+        estimated_seconds: Estimated serial classification time
+        cpu_fraction: Share of the calibration sample's wall time spent on CPU
+
+    Returns:
+        "serial", "thread" or "process"
+    """
+    if estimated_seconds < CLASSIFY_MIN_PARALLEL_SECONDS:
+        return "serial"
+
+    # Mostly waiting on reads (e.g. a network drive): threads overlap the waits
+    if cpu_fraction < 0.5:
+        return "thread"
+
+    workers = os.cpu_count() or 1
+    if workers > 1:
+        saved = estimated_seconds * (1 - 1 / workers)
+        if saved > 2 * _process_pool_startup_cost():
+            return "process"
+    return "serial"
+
+
+def _process_pool_startup_cost() -> float:
+    """Measure (once) how long a process pool takes to start and answer a task."""
+    global _process_pool_startup
+    from concurrent.futures import ProcessPoolExecutor
+
+    if _process_pool_startup is None:
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            executor.submit(os.getpid).result()
+        _process_pool_startup = time.perf_counter() - start
+        logger.info(f"Process pool startup: {_process_pool_startup * 1000:.1f} ms")
+    return _process_pool_startup
+
+
+def _init_classification_worker(
+    content_keywords: dict[str, dict[str, list[str]]],
+) -> None:
+    """Initialize a classification worker process with the parent's rules."""
+    set_content_keywords(content_keywords)
+
+
+def _classify_file_chunk(
+    file_paths: list[str], detection_method: str, content_sample_lines: int
+) -> list[str]:
+    """Classify a chunk of files (runs in classification workers)."""
+    return [
+        _determine_file_category_uncached(
+            Path(file_path), detection_method, content_sample_lines
+        )
+        for file_path in file_paths
+    ]
+
+
+def _determine_file_category_uncached(
+    file_path: Path, detection_method: str, content_sample_lines: int
+) -> str:
+    """Internal function implementing category detection without caching."""
     # Get filename without extension
     base_name = file_path.stem
 
@@ -398,8 +1076,7 @@ def determine_file_category(
     memory_type = determine_memory_type(file_path)
 
     # Extract base name without version
-    if "_v" in base_name:
-        base_name = base_name.split("_v")[0]
+    base_name, _ = parse_version(base_name)
 
     # Core memory files - use exact names
     if memory_type == "core":
@@ -416,16 +1093,9 @@ def determine_file_category(
             if file.lower() in base_name.lower():
                 return file
 
-    # For other memory types, use categories from the config
-    # These would be populated from memory_config.json
-    categories = {
-        "episodic": ["sessions", "decisions", "implementation", "history"],
-        "semantic": ["domain", "features", "concepts", "patterns"],
-        "procedural": ["workflows", "guides", "processes", "setup"],
-    }
-
-    if memory_type in categories:
-        for category in categories[memory_type]:
+    # For other memory types, use the standard category names
+    if memory_type in MEMORY_TYPE_CATEGORIES:
+        for category in MEMORY_TYPE_CATEGORIES[memory_type]:
             if category.lower() in base_name.lower():
                 return category
 
@@ -440,74 +1110,11 @@ def determine_file_category(
                         break
                     content_sample += line
 
-            # Look for category indicators in the content
-            content_lower = content_sample.lower()
-
-            # Define content-based keywords for each memory type
-            content_keywords = {
-                "core": {
-                    "projectbrief": [
-                        "project brief",
-                        "project overview",
-                        "project goals",
-                    ],
-                    "productContext": [
-                        "product context",
-                        "user experience",
-                        "business logic",
-                    ],
-                    "activeContext": [
-                        "active context",
-                        "current focus",
-                        "current work",
-                    ],
-                    "systemPatterns": ["system patterns", "architecture", "components"],
-                    "techContext": [
-                        "tech context",
-                        "technology stack",
-                        "development environment",
-                    ],
-                    "progress": ["progress", "milestone", "completion", "status"],
-                    "projectRules": [
-                        "project rules",
-                        "patterns",
-                        "conventions",
-                        "preferences",
-                    ],
-                },
-                "episodic": {
-                    "sessions": [
-                        "session summary",
-                        "session log",
-                        "during the session",
-                    ],
-                    "decisions": ["decision record", "chose to", "decided to"],
-                    "implementation": ["implementation", "was built", "was developed"],
-                    "history": ["history", "timeline", "chronology", "evolution"],
-                },
-                "semantic": {
-                    "domain": ["domain", "business concept", "entity", "model"],
-                    "features": [
-                        "feature",
-                        "functionality",
-                        "capability",
-                        "user story",
-                    ],
-                    "concepts": ["concept", "idea", "principle", "theory"],
-                    "patterns": ["pattern", "approach", "solution", "design pattern"],
-                },
-                "procedural": {
-                    "workflows": ["workflow", "process flow", "sequence", "stages"],
-                    "guides": ["guide", "how to", "instruction", "step by step"],
-                    "processes": ["process", "procedure", "operation", "method"],
-                    "setup": ["setup", "installation", "configuration", "environment"],
-                },
-            }
-
-            if memory_type in content_keywords:
-                for category, keywords in content_keywords[memory_type].items():
-                    if any(keyword in content_lower for keyword in keywords):
-                        return category
+            # Count keyword hits for every category in a single pass and pick
+            # the category with the most hits
+            hits = classify_content(content_sample, memory_type)
+            if hits:
+                return max(hits, key=lambda category: hits[category])
         except Exception as e:
             logger.warning(f"Error reading file for content-based categorization: {e}")
 
@@ -515,6 +1122,275 @@ def determine_file_category(
     return base_name.lower()
 
 
+# Standard category names for non-core memory types
+MEMORY_TYPE_CATEGORIES = {
+    "episodic": ["sessions", "decisions", "implementation", "history"],
+    "semantic": ["domain", "features", "concepts", "patterns"],
+    "procedural": ["workflows", "guides", "processes", "setup"],
+}
+
+# Content-based keywords for each memory type and category, used by
+# content-based category detection. Can be overridden with the
+# "content_keywords" config option.
+CONTENT_KEYWORDS: dict[str, dict[str, list[str]]] = {
+    "core": {
+        "projectbrief": ["project brief", "project overview", "project goals"],
+        "productContext": ["product context", "user experience", "business logic"],
+        "activeContext": ["active context", "current focus", "current work"],
+        "systemPatterns": ["system patterns", "architecture", "components"],
+        "techContext": [
+            "tech context",
+            "technology stack",
+            "development environment",
+        ],
+        "progress": ["progress", "milestone", "completion", "status"],
+        "projectRules": ["project rules", "patterns", "conventions", "preferences"],
+    },
+    "episodic": {
+        "sessions": ["session summary", "session log", "during the session"],
+        "decisions": ["decision record", "chose to", "decided to"],
+        "implementation": ["implementation", "was built", "was developed"],
+        "history": ["history", "timeline", "chronology", "evolution"],
+    },
+    "semantic": {
+        "domain": ["domain", "business concept", "entity", "model"],
+        "features": ["feature", "functionality", "capability", "user story"],
+        "concepts": ["concept", "idea", "principle", "theory"],
+        "patterns": ["pattern", "approach", "solution", "design pattern"],
+    },
+    "procedural": {
+        "workflows": ["workflow", "process flow", "sequence", "stages"],
+        "guides": ["guide", "how to", "instruction", "step by step"],
+        "processes": ["process", "procedure", "operation", "method"],
+        "setup": ["setup", "installation", "configuration", "environment"],
+    },
+}
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton that finds every keyword of every category in a
+    single pass over a text, independent of the number of keywords.
+    """
+
+    def __init__(self, keywords: dict[str, list[str]]) -> None:
+        """
+        Build the automaton.
+
+        Args:
+            keywords: Mapping of category name to its keywords
+        """
+        self.categories = list(keywords)
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[str]] = [[]]
+
+        for category, words in keywords.items():
+            for word in words:
+                self._add_keyword(word.lower(), category)
+        self._build_failure_links()
+
+    def _add_keyword(self, word: str, category: str) -> None:
+        """Add a keyword to the trie."""
+        state = 0
+        for char in word:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(category)
+
+    def _build_failure_links(self) -> None:
+        """Compute failure links breadth-first and merge outputs along them."""
+        pending = list(self._goto[0].values())
+        while pending:
+            next_pending = []
+            for state in pending:
+                for char, child in self._goto[state].items():
+                    fallback = self._fail[state]
+                    while fallback and char not in self._goto[fallback]:
+                        fallback = self._fail[fallback]
+                    self._fail[child] = self._goto[fallback].get(char, 0)
+                    self._output[child] = (
+                        self._output[child] + self._output[self._fail[child]]
+                    )
+                    next_pending.append(child)
+            pending = next_pending
+
+    def count_matches(self, text: str) -> dict[str, int]:
+        """
+        Count keyword hits per category in a text.
+
+        Args:
+            text: Text to scan (expected to be lowercase)
+
+        Returns:
+            Hit count for each matched category, in category declaration order
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        counts: dict[str, int] = {}
+        state = 0
+
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for category in output[state]:
+                counts[category] = counts.get(category, 0) + 1
+
+        return {
+            category: counts[category]
+            for category in self.categories
+            if category in counts
+        }
+
+
+_content_matchers: dict[str, KeywordMatcher] = {}
+
+
+def set_content_keywords(keywords: dict[str, dict[str, list[str]]]) -> None:
+    """
+    Replace the content-based detection keywords (e.g. from memory_config.json).
+
+    Args:
+        keywords: Mapping of memory type to category keywords
+    """
+    global CONTENT_KEYWORDS, _categorization_rules_version
+
+    CONTENT_KEYWORDS = keywords
+    _content_matchers.clear()
+    _categorization_rules_version = None
+
+
+_categorization_rules_version: str | None = None
+
+
+def get_categorization_rules_version() -> str:
+    """
+    Fingerprint the rules that categorization depends on.
+
+    Cached categories carry this fingerprint, so changing the keywords in
+    memory_config.json (or the categorization code revision) invalidates them.
+    """
+    global _categorization_rules_version
+
+    if _categorization_rules_version is None:
+        rules = json.dumps(
+            [
+                CATEGORIZATION_RULES_REVISION,
+                MEMORY_TYPE_CATEGORIES,
+                CONTENT_KEYWORDS,
+            ],
+            sort_keys=True,
+        )
+        _categorization_rules_version = hashlib.blake2b(
+            rules.encode("utf-8"), digest_size=8
+        ).hexdigest()
+    return _categorization_rules_version
+
+
+class CategorizationCache:
+    """
+    LRU cache of file categories, backed by the catalog for persistence.
+
+    Keys are (path, size, mtime_ns, detection method, rules version) tuples,
+    so a cached category is only reused while the file and the rules are
+    unchanged.
+    """
+
+    def __init__(self, max_entries: int = CATEGORY_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, persistent: bool = True) -> str | None:
+        """
+        Look up a category.
+
+        Args:
+            key: Cache key
+            persistent: If True, fall back to the on-disk store on a miss
+
+        Returns:
+            The cached category or None
+        """
+        with self._lock:
+            category = self._entries.get(key)
+            if category is not None:
+                self._entries.move_to_end(key)
+                return category
+
+        if not persistent:
+            return None
+
+        catalog = get_catalog()
+        category = catalog.cached_category(key) if catalog is not None else None
+        if category is not None:
+            self._remember(key, category)
+        return category
+
+    def put(self, key: tuple, category: str, persistent: bool = True) -> None:
+        """
+        Store a category.
+
+        Args:
+            key: Cache key
+            category: Category to store
+            persistent: If True, also write it to the on-disk store
+        """
+        self._remember(key, category)
+        if persistent:
+            catalog = get_catalog()
+            if catalog is not None:
+                catalog.store_category(key, category)
+
+    def _remember(self, key: tuple, category: str) -> None:
+        """Add an entry to the in-memory LRU, evicting the oldest if full."""
+        with self._lock:
+            self._entries[key] = category
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all in-memory entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+category_cache = CategorizationCache()
+
+
+def classify_content(text: str, memory_type: str) -> dict[str, int]:
+    """
+    Match a text against the content keywords of a memory type.
+
+    The keyword automaton for each memory type is built once and reused.
+
+    Args:
+        text: Text to classify
+        memory_type: Memory type whose categories should be considered
+
+    Returns:
+        Hit count for each matched category, in category declaration order
+    """
+    if memory_type not in CONTENT_KEYWORDS:
+        return {}
+
+    matcher = _content_matchers.get(memory_type)
+    if matcher is None:
+        matcher = KeywordMatcher(CONTENT_KEYWORDS[memory_type])
+        _content_matchers[memory_type] = matcher
+
+    return matcher.count_matches(text.lower())
+
+
 def create_category_folder_structure(
     base_dir: Path, category: str, create_metadata: bool = True
 ) -> Path:
@@ -529,11 +1405,21 @@ def create_category_folder_structure(
     Returns:
         Path to the category folder
     """
+    with _category_folder_lock:
+        return _create_category_folder_structure(base_dir, category, create_metadata)
+
+
+_category_folder_lock = threading.Lock()
+
+
+def _create_category_folder_structure(
+    base_dir: Path, category: str, create_metadata: bool
+) -> Path:
+    """Internal function to create a category folder - serialized by the caller."""
     category_folder = base_dir / category
 
     # Create the folder if it doesn't exist
     if not category_folder.exists():
-        logger.info(f"Creating category folder: {category_folder}")
         print_info(f"Creating category folder: {category_folder}")
         category_folder.mkdir(parents=True, exist_ok=True)
 
@@ -631,1289 +1517,6003 @@ def get_category_type(category: str) -> str:
         return "Extended"
 
 
-def analyze_long_term_memory(
-    ltm_dir: Path, category_detection: str = "smart"
-) -> dict[str, Any]:
+def compute_file_hash(file_path: Path) -> str:
     """
-    Analyze the current state of long-term memory storage.
+    Compute the BLAKE2b content hash of a file.
 
     Args:
-        ltm_dir: Path to the long-term memory directory
-        category_detection: Method for detecting categories
+        file_path: Path to the file
 
     Returns:
-        Dict containing analysis results
+        Hex digest of the file contents
     """
-    print_header("ANALYZING MEMORY ORGANIZATION")
+    digest = hashlib.blake2b(digest_size=32)
+    hashed = 0
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            hashed += len(chunk)
+    run_metrics.count("files_hashed")
+    run_metrics.count("bytes_hashed", hashed)
+    return digest.hexdigest()
+
+
+def hashing_copy(source: Path, destination: Path) -> str:
+    """
+    Copy a file while computing its BLAKE2b content hash in the same pass.
 
-    if not ltm_dir.exists():
-        print_error(f"Memory directory does not exist: {ltm_dir}")
-        return {
-            "status": "error",
-            "message": f"Directory does not exist: {ltm_dir}",
-            "loose_files": [],
-            "categories": {},
-            "recommended_actions": [],
-        }
+    This is the "buffered" copy backend: the source is read exactly once and
+    its mode and timestamps are carried over to the destination.
 
-    # For BIG BRAIN Memory Bank, analyze each memory type directory
-    memory_analysis = {}
+    Args:
+        source: Source file path
+        destination: Destination file path
 
-    for memory_type in MEMORY_TYPES:
-        memory_dir = ltm_dir / memory_type / "archive"
-        if not memory_dir.exists():
-            memory_analysis[memory_type] = {
-                "status": "missing",
-                "message": f"Directory does not exist: {memory_dir}",
-                "loose_files": [],
-                "categories": {},
-            }
-            continue
+    Returns:
+        Hex digest of the copied contents
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    with open(source, "rb") as src:
+        source_stat = os.fstat(src.fileno())
+        with _open_copy_destination(destination, source_stat) as dst:
+            for chunk in iter(lambda: src.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+                dst.write(chunk)
+    _copy_timestamps(destination, source_stat)
+    run_metrics.count("bytes_copied", source_stat.st_size)
+    return digest.hexdigest()
+
+
+def _open_copy_destination(destination: Path, source_stat: os.stat_result):
+    """Open a copy destination for writing, created with the source's permission bits."""
+    # A file with other hard links (a dedupe blob and its duplicates, or a
+    # fast-move source) is replaced rather than truncated, so that the other
+    # names keep their content
+    with contextlib.suppress(FileNotFoundError):
+        if os.stat(destination).st_nlink > 1:
+            os.unlink(destination)
+    fd = os.open(
+        destination,
+        os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0),
+        source_stat.st_mode & 0o777,
+    )
+    return os.fdopen(fd, "wb")
 
-        # Find all markdown files directly in the archive directory
-        loose_files = [f for f in memory_dir.glob("*.md") if f.is_file()]
-        loose_file_paths = [str(f.relative_to(memory_dir)) for f in loose_files]
 
-        # Find existing category folders
-        existing_categories = {}
-        for item in memory_dir.iterdir():
-            if item.is_dir():
-                category_name = item.name
-                files_in_category = list(item.glob("*.md"))
-                existing_categories[category_name] = {
-                    "path": str(item.relative_to(memory_dir)),
-                    "file_count": len(files_in_category),
-                    "files": [str(f.relative_to(item)) for f in files_in_category],
-                    "has_metadata": (item / ".category_info.md").exists(),
-                }
+def _copy_timestamps(destination: Path, source_stat: os.stat_result) -> None:
+    """Carry the source's access and modification times over to a copy."""
+    os.utime(destination, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
 
-        # Categorize loose files
-        file_categories = {}
-        for file_path in loose_files:
-            category = determine_file_category(file_path, category_detection)
-            if category not in file_categories:
-                file_categories[category] = []
-            file_categories[category].append(str(file_path.relative_to(memory_dir)))
 
-        # Prepare summary
-        total_files = len(loose_files) + sum(
-            cat["file_count"] for cat in existing_categories.values()
-        )
+# Copy backends, fastest first. Selecting a backend starts the fallback chain
+# at that backend; "buffered" always works.
+COPY_BACKENDS = ["reflink", "copy_file_range", "sendfile", "buffered"]
+FICLONE = 0x40049409  # Linux ioctl: share the source's extents (btrfs, XFS)
 
-        memory_analysis[memory_type] = {
-            "status": "success",
-            "loose_files": loose_file_paths,
-            "loose_file_count": len(loose_files),
-            "categories": existing_categories,
-            "category_count": len(existing_categories),
-            "total_files": total_files,
-            "organization_percentage": 100 - (len(loose_files) / total_files * 100)
-            if total_files > 0
-            else 0,
-            "file_categories": file_categories,
-        }
+copy_backend = "auto"
+copy_backend_counts: dict[str, int] = {}
+_copy_backend_lock = threading.Lock()
 
-    # Generate recommendations
-    recommendations = []
 
-    for memory_type, analysis in memory_analysis.items():
-        if analysis["status"] == "missing":
-            recommendations.append(
-                {
-                    "type": "create_directory",
-                    "description": f"Create archive directory for {memory_type} memory",
-                    "memory_type": memory_type,
-                }
-            )
-            continue
+def set_copy_backend(backend: str) -> None:
+    """
+    Select the preferred copy backend.
 
-        if analysis["loose_files"]:
-            recommendations.append(
-                {
-                    "type": "organize_loose_files",
-                    "description": f"Organize {len(analysis['loose_files'])} loose files in {memory_type} memory",
-                    "memory_type": memory_type,
-                    "details": analysis["file_categories"],
-                }
-            )
+    Args:
+        backend: "auto" or one of COPY_BACKENDS
+    """
+    global copy_backend
 
-        for category_name, category_info in analysis["categories"].items():
-            if not category_info["has_metadata"]:
-                recommendations.append(
-                    {
-                        "type": "add_category_metadata",
-                        "description": f"Add metadata to category folder: {memory_type}/{category_name}",
-                        "memory_type": memory_type,
-                        "category": category_name,
-                    }
-                )
+    if backend != "auto" and backend not in COPY_BACKENDS:
+        raise ValueError(f"Unknown copy backend: {backend}")
+    copy_backend = backend
 
-    # Combine all analyses into one result
-    combined_result = {
-        "status": "success",
-        "timestamp": datetime.now().isoformat(),
-        "memory_types": memory_analysis,
-        "recommended_actions": recommendations,
-    }
 
-    # Print summary
-    for memory_type, analysis in memory_analysis.items():
-        if analysis["status"] == "missing":
-            print_warning(
-                f"{memory_type.capitalize()} memory archive directory does not exist"
-            )
-            continue
+def _reflink_copy(src_fd: int, dst_fd: int, size: int) -> None:
+    """Clone the source's extents into the destination (copy-on-write)."""
+    import fcntl
 
-        print_info(f"\n{memory_type.capitalize()} Memory:")
-        print_info(
-            f"  Found {analysis['loose_file_count']} loose files needing organization"
-        )
-        print_info(f"  Found {analysis['category_count']} existing category folders")
-        print_info(f"  Total files: {analysis['total_files']}")
+    fcntl.ioctl(dst_fd, FICLONE, src_fd)
 
-        if analysis["loose_files"]:
-            print_info(f"\n  Proposed categorization for {memory_type}:")
-            for category, files in analysis["file_categories"].items():
-                print_info(f"    {category}: {len(files)} files")
 
-    if recommendations:
-        print_info("\nRecommended actions:")
-        for rec in recommendations:
-            print_info(f"  - {rec['description']}")
+def _copy_file_range_copy(src_fd: int, dst_fd: int, size: int) -> None:
+    """Copy in the kernel with copy_file_range (may use server-side copy or reflink)."""
+    remaining = size
+    while remaining > 0:
+        copied = os.copy_file_range(src_fd, dst_fd, remaining)
+        if copied == 0:
+            break
+        remaining -= copied
 
-    return combined_result
 
+def _sendfile_copy(src_fd: int, dst_fd: int, size: int) -> None:
+    """Copy in the kernel with sendfile, avoiding userspace buffers."""
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+        if sent == 0:
+            break
+        offset += sent
 
-def reorganize_existing_files(
-    ltm_dir: Path,
-    analysis: dict[str, Any] | None = None,
-    dry_run: bool = True,
-    options: dict[str, Any] | None = None,
-    batch_size: int = 10,
-) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+
+def _zero_copy_backends() -> dict[str, Callable[[int, int, int], None]]:
+    """Return the zero-copy backends supported on this platform."""
+    backends: dict[str, Callable[[int, int, int], None]] = {}
+    if sys.platform.startswith("linux"):
+        backends["reflink"] = _reflink_copy
+        if hasattr(os, "copy_file_range"):
+            backends["copy_file_range"] = _copy_file_range_copy
+        if hasattr(os, "sendfile"):
+            backends["sendfile"] = _sendfile_copy
+    return backends
+
+
+def copy_file_data(
+    source: Path, destination: Path, backend: str | None = None
+) -> tuple[str, str | None]:
     """
-    Reorganize existing files based on analysis results.
+    Copy a file with the fastest available backend.
+
+    Backends are tried in COPY_BACKENDS order starting at the selected one;
+    a backend that is unsupported for this pair of files falls through to
+    the next. Only the buffered backend reads the data in userspace, so it is
+    the only one that yields a content hash.
 
     Args:
-        ltm_dir: Path to the long-term memory directory
-        analysis: Analysis results from analyze_long_term_memory (if None, will perform analysis)
-        dry_run: If True, only simulate operations
-        options: Dictionary of options for reorganization
-        batch_size: Number of files to process in each batch for memory efficiency
+        source: Source file path
+        destination: Destination file path
+        backend: Backend to start with (default: the configured copy_backend)
 
     Returns:
-        Tuple of (successful_operations, failed_operations)
+        Tuple of (backend used, content hash or None)
     """
-    if options is None:
-        options = {
-            "force_overwrite": False,
-            "create_metadata": True,
-            "category_detection": "smart",
-        }
+    backend = backend or copy_backend
+    chain = COPY_BACKENDS if backend == "auto" else COPY_BACKENDS[COPY_BACKENDS.index(backend) :]
+    zero_copy = _zero_copy_backends()
+
+    used_backend = "buffered"
+    content_hash = None
+    candidates = [name for name in chain if name in zero_copy]
+
+    if candidates:
+        with open(source, "rb") as src:
+            source_stat = os.fstat(src.fileno())
+            with _open_copy_destination(destination, source_stat) as dst:
+                for name in candidates:
+                    try:
+                        zero_copy[name](src.fileno(), dst.fileno(), source_stat.st_size)
+                        used_backend = name
+                        break
+                    except OSError:
+                        # Unsupported here (e.g. EXDEV, EOPNOTSUPP): reset and try the next
+                        os.lseek(src.fileno(), 0, os.SEEK_SET)
+                        os.ftruncate(dst.fileno(), 0)
+                        os.lseek(dst.fileno(), 0, os.SEEK_SET)
 
-    if analysis is None:
-        analysis = analyze_long_term_memory(
-            ltm_dir, options.get("category_detection", "smart")
-        )
+        if used_backend != "buffered":
+            _copy_timestamps(destination, source_stat)
+            run_metrics.count("bytes_copied", source_stat.st_size)
 
-    if analysis["status"] != "success" or not analysis["loose_files"]:
-        if dry_run:
-            print_info("No loose files to organize")
-        return ([], [])
+    if used_backend == "buffered":
+        content_hash = hashing_copy(source, destination)
 
-    print_header(
-        f"{'DRY RUN: ' if dry_run else ''}REORGANIZING FILES IN LONG-TERM MEMORY"
-    )
+    with _copy_backend_lock:
+        copy_backend_counts[used_backend] = copy_backend_counts.get(used_backend, 0) + 1
 
-    successful_operations = []
-    failed_operations = []
+    return used_backend, content_hash
 
-    # Process files by category for better organization and memory efficiency
-    file_categories = analysis["file_categories"]
 
-    for category, files in file_categories.items():
-        # Create category folder structure
-        category_folder = create_category_folder_structure(
-            ltm_dir,
-            category,
-            create_metadata=options.get("create_metadata", True) and not dry_run,
+def format_copy_backend_counts() -> str:
+    """Summarize which copy backends were used, e.g. "reflink: 12, buffered: 1"."""
+    with _copy_backend_lock:
+        return ", ".join(
+            f"{name}: {count}" for name, count in sorted(copy_backend_counts.items())
         )
 
-        print_info(f"Processing category: {category} ({len(files)} files)")
-
-        # Process files in batches to optimize memory usage
-        for i in range(0, len(files), batch_size):
-            batch = files[i : i + batch_size]
-            log_memory_usage()
-
-            for file_path_str in batch:
-                file_path = ltm_dir / file_path_str
-                destination_path = category_folder / file_path.name
-
-                operation_details = {
-                    "source": str(file_path),
-                    "destination": str(destination_path),
-                    "category": category,
-                    "timestamp": datetime.now().isoformat(),
-                }
 
-                if dry_run:
-                    print_info(
-                        f"[DRY RUN] Would move: {file_path.name} → {category}/{file_path.name}"
-                    )
-                    successful_operations.append(operation_details)
-                    continue
+VERSION_PATTERN = re.compile(
+    r"(?P<base>.+)_v(?P<version>(?P<major>\d+)(?:\.(?P<minor>\d+))?)"
+)
 
-                try:
-                    # Check if destination exists
-                    if destination_path.exists() and not options.get(
-                        "force_overwrite", False
-                    ):
-                        print_warning(
-                            f"Destination file already exists, skipping: {destination_path}"
-                        )
-                        operation_details["status"] = "skipped"
-                        operation_details["reason"] = "destination_exists"
-                        failed_operations.append(operation_details)
-                        continue
 
-                    # Copy first, then delete to ensure no data loss
-                    shutil.copy2(file_path, destination_path)
+def parse_version(stem: str) -> tuple[str, tuple[int, int] | None]:
+    """
+    Split a file stem into its base name and `_vMAJOR.MINOR` version.
 
-                    # Verify the copy succeeded
-                    if (
-                        not destination_path.exists()
-                        or file_path.stat().st_size != destination_path.stat().st_size
-                    ):
-                        print_error(f"Verification failed for: {file_path.name}")
-                        operation_details["status"] = "failed"
-                        operation_details["reason"] = "verification_failed"
-                        failed_operations.append(operation_details)
-                        continue
+    Only a trailing version suffix counts, so `dev_vision_v1.2` is version
+    (1, 2) of `dev_vision`, and `dev_vision` is unversioned.
 
-                    # Remove original file
-                    file_path.unlink()
+    Args:
+        stem: File name without extension
 
-                    print_success(
-                        f"Moved: {file_path.name} → {category}/{file_path.name}"
-                    )
-                    operation_details["status"] = "success"
-                    successful_operations.append(operation_details)
+    Returns:
+        (base name, (major, minor)), or (stem, None) if unversioned
+    """
+    match = VERSION_PATTERN.fullmatch(stem)
+    if match is None:
+        return stem, None
+    return match["base"], (int(match["major"]), int(match["minor"] or 0))
 
-                except Exception as e:
-                    print_error(f"Error moving file {file_path.name}: {e}")
-                    operation_details["status"] = "failed"
-                    operation_details["reason"] = str(e)
-                    failed_operations.append(operation_details)
 
-            # Free memory after each batch
-            trigger_garbage_collection()
+def _parse_version_suffix(stem: str) -> str | None:
+    """Return the version string of a `name_vX.Y` stem, or None if unversioned."""
+    match = VERSION_PATTERN.fullmatch(stem)
+    return match["version"] if match else None
 
-    # Print summary
-    print_header(f"{'DRY RUN: ' if dry_run else ''}REORGANIZATION SUMMARY")
-    print_success(f"Successfully organized: {len(successful_operations)}")
-    if failed_operations:
-        print_error(f"Failed to organize: {len(failed_operations)}")
 
-    return (successful_operations, failed_operations)
+class VersionRegistry:
+    """
+    Versions of the markdown files in a directory, grouped by base name.
 
+    Each name is parsed once, and every base name's files are kept sorted by
+    semantic version, oldest first. The unversioned `base.md` counts as older
+    than any `base_vX.Y.md`, since versioning it starts at v1.0. Looking up
+    the latest version, the superseded versions or the next version is a
+    dictionary lookup.
+    """
 
-def update_storage_log_with_organization(
-    ltm_dir: Path,
-    operations: list[dict[str, Any]],
-    organization_type: str = "reorganization",
-) -> bool:
+    def __init__(self, file_paths: Iterable[Path] = ()) -> None:
+        self._series: dict[str, list[tuple[tuple, str, Path]]] = {}
+        self._names: set[str] = set()
+        self._lock = threading.Lock()
+        for file_path in file_paths:
+            self.add(file_path)
+
+    def add(self, file_path: Path) -> None:
+        """
+        Register a file, keeping its base name's versions sorted.
+
+        Args:
+            file_path: Markdown file to register (ignored if already registered)
+        """
+        import bisect
+
+        base, version = parse_version(file_path.stem)
+        key = (version is not None, version or (0, 0))
+        with self._lock:
+            if file_path.name in self._names:
+                return
+            self._names.add(file_path.name)
+            series = self._series.setdefault(base, [])
+            bisect.insort(series, (key, file_path.name, file_path))
+
+    def bases(self) -> list[str]:
+        """Return the registered base names."""
+        return list(self._series)
+
+    def versions(self, base: str) -> list[Path]:
+        """Return every file of a base name, oldest version first."""
+        return [file_path for _, _, file_path in self._series.get(base, [])]
+
+    def latest(self, base: str) -> Path | None:
+        """Return the newest version of a base name, or None if it has none."""
+        series = self._series.get(base)
+        return series[-1][2] if series else None
+
+    def superseded(self, base: str) -> list[Path]:
+        """Return every version of a base name except the newest, oldest first."""
+        return [file_path for _, _, file_path in self._series.get(base, [])[:-1]]
+
+    def next_version(self, base: str) -> tuple[int, int]:
+        """
+        Return the version that follows the newest one of a base name.
+
+        Returns:
+            The next minor version, or (1, 0) if the base name is unversioned
+        """
+        series = self._series.get(base)
+        if not series or not series[-1][0][0]:
+            return (1, 0)
+        major, minor = series[-1][0][1]
+        return (major, minor + 1)
+
+
+_version_registries: dict[Path, tuple[int, VersionRegistry]] = {}
+_version_registry_lock = threading.Lock()
+
+
+def get_version_registry(directory: Path) -> VersionRegistry:
     """
-    Update storage log with details of organizational changes.
+    Get the version registry of a directory, shared between lookups.
+
+    The registry is built from the catalog (or a scan of the directory) and
+    reused until the directory's mtime changes, so each lookup costs a single
+    stat of the directory.
 
     Args:
-        ltm_dir: Path to the long-term memory directory
-        operations: List of successful operations
-        organization_type: Type of organization performed
+        directory: Directory whose markdown files to register
 
     Returns:
-        True if log was updated successfully, False otherwise
+        The registry (empty if the directory does not exist)
     """
-    if not operations:
-        return False
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+    except (FileNotFoundError, NotADirectoryError):
+        return VersionRegistry()
+
+    with _version_registry_lock:
+        cached = _version_registries.get(directory)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+    catalog = get_catalog()
+    if catalog is not None:
+        file_paths = [Path(row["path"]) for row in catalog.list_files(directory)]
+    else:
+        listing = scan_directory(directory)
+        file_paths = [scanned.path for scanned in listing.files] if listing else []
 
-    log_file = ltm_dir / "storage_log.md"
-    if not log_file.exists():
-        print_warning(f"Storage log not found: {log_file}")
-        return False
+    registry = VersionRegistry(file_paths)
+    with _version_registry_lock:
+        _version_registries[directory] = (mtime_ns, registry)
+    return registry
 
-    return (
-        safe_file_operation(
-            _update_storage_log_content,
-            log_file,
-            "Error updating storage log",
-            log_file,
-            operations,
-            organization_type,
-        )
-        is not None
-    )
 
+class ScannedFile:
+    """A markdown file found by scan_directory, whose stat is read at most once."""
 
-def _update_storage_log_content(
-    log_file: Path, operations: list[dict[str, Any]], organization_type: str
-) -> bool:
-    """
-    Internal function to update storage log content - separated to use with safe_file_operation.
-    """
-    with open(log_file, encoding="utf-8") as f:
-        content = f.read()
+    __slots__ = ("path", "name", "_entry", "_stat")
 
-    # Create new log entry
-    timestamp = datetime.now().strftime("%Y-%m-%d")
-    operation_count = len(operations)
+    def __init__(self, entry: os.DirEntry) -> None:
+        self.path = Path(entry.path)
+        self.name = entry.name
+        self._entry = entry
+        self._stat: os.stat_result | None = None
 
-    categorized_files = {}
-    for op in operations:
-        category = op.get("category", "unknown")
-        if category not in categorized_files:
-            categorized_files[category] = []
-        categorized_files[category].append(Path(op["source"]).name)
+    def stat(self) -> os.stat_result | None:
+        """
+        Stat the file, reusing the result of the first call.
 
-    entry_title = (
-        f"### {timestamp}: Memory Organization - {organization_type.capitalize()}"
-    )
+        Returns:
+            The stat result, or None if the file has disappeared
+        """
+        if self._stat is None:
+            run_metrics.count("file_stats")
+            try:
+                self._stat = self._entry.stat()
+            except FileNotFoundError:
+                return None
+        return self._stat
 
-    log_entry = f"""
-{entry_title}
 
-**Operation Type:** Memory Organization **Performed By:** BIG BRAIN
-**Timestamp:** {datetime.now().isoformat()}
+class DirectoryListing(NamedTuple):
+    """Markdown files and subdirectories found directly inside a directory."""
 
-**Organization Details:**
+    files: list[ScannedFile]
+    subdirectories: list[Path]
 
-- Reorganized {operation_count} files into category folders
-- Implemented hierarchical organization structure in long-term memory
-- Created organized categories for improved file management
-"""
 
-    # Add categories and files
-    for category, files in categorized_files.items():
-        if len(files) > 5:
-            file_list = files[:5]
-            file_str = ", ".join(file_list) + f" and {len(files) - 5} more"
-        else:
-            file_str = ", ".join(files)
+def scan_directory(directory: Path) -> DirectoryListing | None:
+    """
+    List a directory's markdown files and subdirectories in one os.scandir pass.
 
-        log_entry += f"- **{category}**: {file_str}\n"
+    File types come from the directory entries, so no file is stat()ed until
+    its ScannedFile.stat() is called.
 
-    log_entry += "\n**Purpose:** Improved organization and accessibility of memory files through categorized structure.\n"
+    Args:
+        directory: Directory to scan
 
-    # Insert the new entry after the "## Latest Operations" line
-    if "## Latest Operations" in content:
-        updated_content = content.replace(
-            "## Latest Operations", "## Latest Operations\n" + log_entry
-        )
-    else:
-        # Fallback if the expected header isn't found
-        updated_content = content + "\n\n" + log_entry
+    Returns:
+        The listing, or None if the directory does not exist
+    """
+    files = []
+    subdirectories = []
+    run_metrics.count("directory_scans")
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        subdirectories.append(Path(entry.path))
+                    elif entry.name.endswith(".md") and entry.is_file():
+                        files.append(ScannedFile(entry))
+                except FileNotFoundError:
+                    # Removed while the directory was being scanned
+                    continue
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return DirectoryListing(files, subdirectories)
 
-    # Write the updated content back to the file
-    with open(log_file, "w", encoding="utf-8") as f:
-        f.write(updated_content)
 
-    print_success("Updated storage log with organization details")
-    return True
+class DirectoryScanner:
+    """
+    Snapshot of directory listings shared by one pass over the memory bank.
 
+    Each directory is scanned once, when first asked for, and its listing is
+    reused for the rest of the pass. Use a new scanner for each pass, since
+    listings are not refreshed.
+    """
 
-def safe_copy_file(
-    source: Path,
-    destination: Path,
-    dry_run: bool = False,
-    force_overwrite: bool = False,
-) -> bool:
-    """
-    Safely copy a file without overwriting existing files unless force_overwrite is True.
+    def __init__(self) -> None:
+        self._listings: dict[Path, DirectoryListing | None] = {}
+        self._lock = threading.Lock()
+
+    def scan(self, directory: Path) -> DirectoryListing | None:
+        """
+        List a directory, scanning it on first use.
+
+        Args:
+            directory: Directory to list
+
+        Returns:
+            The listing, or None if the directory does not exist
+        """
+        with self._lock:
+            if directory not in self._listings:
+                self._listings[directory] = scan_directory(directory)
+            return self._listings[directory]
+
+    def walk(
+        self, directory: Path, max_depth: int | None = None
+    ) -> Iterator[tuple[Path, DirectoryListing]]:
+        """
+        Walk a directory tree top-down, scanning every directory once.
+
+        Args:
+            directory: Root of the walk
+            max_depth: Depth of subdirectories to descend into (None for all)
+
+        Yields:
+            (directory, listing) for each existing directory
+        """
+        pending = deque([(directory, 0)])
+        while pending:
+            current, depth = pending.popleft()
+            listing = self.scan(current)
+            if listing is None:
+                continue
+            yield current, listing
+            if max_depth is None or depth < max_depth:
+                pending.extend((child, depth + 1) for child in listing.subdirectories)
 
-    Args:
-        source: Source file path
-        destination: Destination file path
-        dry_run: If True, only simulate operations
-        force_overwrite: If True, allow overwriting of existing destination files
 
-    Returns:
-        True if copy successful or simulated, False otherwise
+class MemoryCatalog:
+    """
+    Persistent SQLite catalog of the markdown files in the memory bank.
+
+    Each directory is rescanned only when its mtime changes, so repeated runs
+    over an unchanged bank cost a single stat per directory instead of a stat
+    per file. Content hashes are computed lazily and cached until the file's
+    size or mtime changes.
+
+    A directory's mtime changes when entries are added, removed or renamed,
+    not when a file is rewritten in place, so refresh() keeps the catalog's
+    membership (which files exist where) current but not the size and mtime
+    of each row. Those are the file's state when it was last catalogued:
+    anything that depends on a file's current state must stat the file, as
+    known_hash() does, rather than trust the row.
     """
-    # Check if source exists
-    if not source.exists():
-        error_msg = f"Source file does not exist: {source}"
-        logger.error(error_msg)
-        print_error(error_msg)
-        return False
-
-    # Check if destination already exists (never overwrite unless force_overwrite is True)
-    if destination.exists():
-        if not force_overwrite:
-            error_msg = (
-                f"Destination file already exists, will not overwrite: {destination}"
-            )
-            logger.error(error_msg)
-            print_error(error_msg)
-            return False
-        else:
-            warning_msg = f"Destination file exists, will overwrite: {destination}"
-            logger.warning(warning_msg)
-            print_warning(warning_msg)
 
-    # Ensure parent directory exists
-    ensure_directory_exists(destination.parent)
+    def __init__(self, db_path: Path) -> None:
+        import sqlite3
 
-    # Perform the copy or simulate it
-    if dry_run:
-        action = "overwrite" if destination.exists() and force_overwrite else "copy"
-        logger.info(f"[DRY RUN] Would {action}: {source} -> {destination}")
-        print_info(f"[DRY RUN] Would {action}: {source} → {destination}")
-        return True
-    else:
-        return (
-            safe_operation(
-                _perform_copy,
-                f"Error copying file from {source} to {destination}",
-                source,
-                destination,
-            )
-            is not None
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                directory TEXT NOT NULL,
+                name TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT,
+                memory_type TEXT,
+                category TEXT,
+                version TEXT
+            );
+            CREATE INDEX IF NOT EXISTS files_directory ON files (directory);
+            CREATE TABLE IF NOT EXISTS directories (
+                path TEXT PRIMARY KEY,
+                parent TEXT,
+                mtime_ns INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS directories_parent ON directories (parent);
+            CREATE TABLE IF NOT EXISTS category_cache (
+                path TEXT NOT NULL,
+                detection_method TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                rules_version TEXT NOT NULL,
+                category TEXT NOT NULL,
+                PRIMARY KEY (path, detection_method)
+            );
+            """
         )
+        self._conn.commit()
+        self._pending_writes = 0
+
+    def close(self) -> None:
+        """Commit pending writes and close the underlying database connection."""
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def refresh(self, directory: Path, recursive: bool = True) -> None:
+        """
+        Bring the catalog up to date for a directory.
+
+        Args:
+            directory: Directory to refresh
+            recursive: If True, also refresh all subdirectories
+        """
+        with self._lock:
+            pending = [directory]
+            while pending:
+                children = self._refresh_directory(pending.pop())
+                if recursive:
+                    pending.extend(children)
+            self._conn.commit()
+
+    def update_files(self, file_paths: Iterable[Path]) -> None:
+        """
+        Bring the catalog rows of individual files up to date.
+
+        A file rewritten in place leaves its directory's mtime unchanged, so
+        refresh() does not notice it; this updates such files directly.
+
+        Args:
+            file_paths: Markdown files that were written, created or removed
+        """
+        with self._lock:
+            for file_path in file_paths:
+                key = str(file_path)
+                try:
+                    file_stat = os.stat(file_path)
+                except FileNotFoundError:
+                    self._conn.execute("DELETE FROM files WHERE path = ?", (key,))
+                    continue
+                row = self._conn.execute(
+                    "SELECT size, mtime_ns FROM files WHERE path = ?", (key,)
+                ).fetchone()
+                if row is None or (row["size"], row["mtime_ns"]) != (
+                    file_stat.st_size,
+                    file_stat.st_mtime_ns,
+                ):
+                    self._upsert_file(file_path, file_stat)
+            self._conn.commit()
+
+    def _refresh_directory(self, directory: Path) -> list[Path]:
+        """Rescan a single directory if its mtime changed; return its subdirectories."""
+        key = str(directory)
+        run_metrics.count("directory_stats")
+        try:
+            dir_stat = os.stat(directory)
+        except FileNotFoundError:
+            self._forget_directory(key)
+            return []
+
+        row = self._conn.execute(
+            "SELECT mtime_ns FROM directories WHERE path = ?", (key,)
+        ).fetchone()
+        if row is not None and row["mtime_ns"] == dir_stat.st_mtime_ns:
+            return [
+                Path(r["path"])
+                for r in self._conn.execute(
+                    "SELECT path FROM directories WHERE parent = ?", (key,)
+                )
+            ]
 
+        known_files = {
+            r["name"]: (r["size"], r["mtime_ns"])
+            for r in self._conn.execute(
+                "SELECT name, size, mtime_ns FROM files WHERE directory = ?", (key,)
+            )
+        }
+        seen_files = set()
+        listing = scan_directory(directory)
+        if listing is None:
+            self._forget_directory(key)
+            return []
+        child_dirs = listing.subdirectories
+
+        for scanned in listing.files:
+            file_stat = scanned.stat()
+            if file_stat is None:
+                continue
+            known = known_files.get(scanned.name)
+            if known != (file_stat.st_size, file_stat.st_mtime_ns):
+                try:
+                    self._upsert_file(scanned.path, file_stat)
+                except FileNotFoundError:
+                    # Removed while the directory was being scanned
+                    continue
+            seen_files.add(scanned.name)
 
-def _perform_copy(source: Path, destination: Path) -> bool:
-    """Internal function to perform file copy operation."""
-    shutil.copy2(source, destination)
-    success_msg = f"Successfully copied: {source} → {destination}"
-    logger.info(success_msg)
-    print_success(success_msg)
-    return True
-
+        for name in known_files.keys() - seen_files:
+            self._conn.execute(
+                "DELETE FROM files WHERE path = ?", (str(directory / name),)
+            )
 
-def send_to_recycle_bin(file_path: Path, dry_run: bool = False) -> bool:
-    """
-    Move a file to the Windows recycle bin instead of permanently deleting it.
+        child_keys = {str(child) for child in child_dirs}
+        for r in self._conn.execute(
+            "SELECT path FROM directories WHERE parent = ?", (key,)
+        ).fetchall():
+            if r["path"] not in child_keys:
+                self._forget_directory(r["path"])
 
-    Args:
-        file_path: Path to the file to be moved to recycle bin
-        dry_run: If True, only simulate operations
+        self._conn.execute(
+            "INSERT OR REPLACE INTO directories (path, parent, mtime_ns) VALUES (?, ?, ?)",
+            (key, str(directory.parent), dir_stat.st_mtime_ns),
+        )
+        return child_dirs
 
-    Returns:
-        True if successful or simulated, False otherwise
-    """
-    if not file_path.exists():
-        error_msg = f"File does not exist, cannot move to recycle bin: {file_path}"
-        logger.error(error_msg)
-        print_error(error_msg)
-        return False
+    def _upsert_file(
+        self, file_path: Path, file_stat: os.stat_result, content_hash: str | None = None
+    ) -> None:
+        """Insert or update the catalog row for a file."""
+        self._conn.execute(
+            """
+            INSERT OR REPLACE INTO files
+                (path, directory, name, size, mtime_ns, content_hash,
+                 memory_type, category, version)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                str(file_path),
+                str(file_path.parent),
+                file_path.name,
+                file_stat.st_size,
+                file_stat.st_mtime_ns,
+                content_hash,
+                determine_memory_type(file_path),
+                determine_file_category(file_path),
+                _parse_version_suffix(file_path.stem),
+            ),
+        )
 
-    if dry_run:
-        logger.info(f"[DRY RUN] Would move to recycle bin: {file_path}")
-        print_info(f"[DRY RUN] Would move to recycle bin: {file_path}")
-        return True
+    def _forget_directory(self, key: str) -> None:
+        """Drop a directory and everything below it from the catalog."""
+        prefix = key + os.sep
+        self._conn.execute(
+            "DELETE FROM files WHERE directory = ? OR substr(directory, 1, ?) = ?",
+            (key, len(prefix), prefix),
+        )
+        self._conn.execute(
+            "DELETE FROM directories WHERE path = ? OR substr(path, 1, ?) = ?",
+            (key, len(prefix), prefix),
+        )
 
-    # Use Windows API to send to recycle bin
-    if sys.platform == "win32":
-        return (
-            safe_operation(
-                _send_to_windows_recycle_bin,
-                f"Error moving file to recycle bin: {file_path}",
-                file_path,
+    def cached_category(self, key: tuple) -> str | None:
+        """
+        Look up a stored category.
+
+        Args:
+            key: (path, size, mtime_ns, detection method, rules version)
+
+        Returns:
+            The stored category, or None if missing or stale
+        """
+        path, size, mtime_ns, detection_method, rules_version = key
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, rules_version, category FROM category_cache "
+                "WHERE path = ? AND detection_method = ?",
+                (path, detection_method),
+            ).fetchone()
+        if row is None or (row["size"], row["mtime_ns"], row["rules_version"]) != (
+            size,
+            mtime_ns,
+            rules_version,
+        ):
+            return None
+        return row["category"]
+
+    def store_category(self, key: tuple, category: str) -> None:
+        """Store a category, replacing any stale entry for the same file and method."""
+        path, size, mtime_ns, detection_method, rules_version = key
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO category_cache "
+                "(path, detection_method, size, mtime_ns, rules_version, category) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (path, detection_method, size, mtime_ns, rules_version, category),
             )
-            is not None
-        )
-    else:
-        # For non-Windows platforms (fallback to just reporting)
-        warning_msg = f"Recycle bin operation not supported on this platform. Would delete: {file_path}"
-        logger.warning(warning_msg)
-        print_warning(warning_msg)
-        return True
+            self._pending_writes += 1
+            if self._pending_writes >= 500:
+                self._conn.commit()
+                self._pending_writes = 0
+
+    def list_files(self, directory: Path, refresh: bool = True) -> list[sqlite3.Row]:
+        """
+        List the catalogued markdown files directly inside a directory.
+
+        The rows' size and mtime may be stale for files rewritten in place;
+        see the class docstring.
+
+        Args:
+            directory: Directory to list
+            refresh: If True, refresh the directory (not its children) first
+
+        Returns:
+            Catalog rows ordered by file name
+        """
+        with self._lock:
+            if refresh:
+                self.refresh(directory, recursive=False)
+            return self._conn.execute(
+                "SELECT * FROM files WHERE directory = ? ORDER BY name",
+                (str(directory),),
+            ).fetchall()
+
+    def list_subdirectories(self, directory: Path) -> list[Path]:
+        """List the catalogued subdirectories of a directory."""
+        with self._lock:
+            return [
+                Path(r["path"])
+                for r in self._conn.execute(
+                    "SELECT path FROM directories WHERE parent = ? ORDER BY path",
+                    (str(directory),),
+                )
+            ]
 
+    def record_hash(self, file_path: Path, content_hash: str) -> None:
+        """Record a content hash computed elsewhere (e.g. while copying the file)."""
+        file_stat = os.stat(file_path)
+        with self._lock:
+            self._upsert_file(file_path, file_stat, content_hash)
+            self._conn.commit()
+
+    def known_hash(self, file_path: Path) -> str | None:
+        """
+        Return the catalogued content hash of a file without reading it.
+
+        Returns:
+            The recorded hash, or None if none is recorded or the file changed
+        """
+        file_stat = os.stat(file_path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, content_hash FROM files WHERE path = ?",
+                (str(file_path),),
+            ).fetchone()
+        if (
+            row is not None
+            and row["size"] == file_stat.st_size
+            and row["mtime_ns"] == file_stat.st_mtime_ns
+        ):
+            return row["content_hash"]
+        return None
 
-def _send_to_windows_recycle_bin(file_path: Path) -> bool:
-    """Internal function to send a file to the Windows recycle bin."""
-    # Windows API constants
-    fof_silent = 0x0004
-    fof_noconfirmation = 0x0010
-    fof_allowundo = 0x0040
-    fof_noerrorui = 0x0400
-
-    flags = fof_allowundo | fof_noconfirmation | fof_noerrorui | fof_silent
-
-    # Fix: Convert the path to the correct format for SHFileOperation
-    # The path needs to be double-null terminated
-    file_path_str = str(file_path.absolute()) + "\0\0"
-
-    # Create a SHFILEOPSTRUCT structure
-    class SHFILEOPSTRUCT(ctypes.Structure):
-        _fields_ = [
-            ("hwnd", ctypes.c_void_p),
-            ("wFunc", ctypes.c_uint),
-            ("pFrom", ctypes.c_wchar_p),  # This expects c_wchar_p
-            ("pTo", ctypes.c_wchar_p),
-            ("fFlags", ctypes.c_int),
-            ("fAnyOperationsAborted", ctypes.c_bool),
-            ("hNameMappings", ctypes.c_void_p),
-            ("lpszProgressTitle", ctypes.c_wchar_p),
-        ]
+    def file_hash(self, file_path: Path) -> str:
+        """
+        Return the content hash of a file, reusing the catalogued hash if the
+        file's size and mtime are unchanged.
+        """
+        content_hash = self.known_hash(file_path)
+        if content_hash:
+            return content_hash
 
-    # FO_DELETE = 3
-    file_op = SHFILEOPSTRUCT()
-    file_op.wFunc = 3  # FO_DELETE
-    file_op.pFrom = file_path_str  # Use the string directly instead of buffer
-    file_op.fFlags = flags
+        content_hash = compute_file_hash(file_path)
+        self.record_hash(file_path, content_hash)
+        return content_hash
 
-    # Perform the operation
-    shell32 = ctypes.windll.shell32
-    result = shell32.SHFileOperationW(ctypes.byref(file_op))
 
-    if result == 0:
-        success_msg = f"Successfully moved to recycle bin: {file_path}"
-        logger.info(success_msg)
-        print_success(success_msg)
-        return True
-    else:
-        error_msg = f"Error moving to recycle bin, error code: {result}"
-        logger.error(error_msg)
-        print_error(error_msg)
-        return False
+_catalog: MemoryCatalog | None = None
+catalog_enabled = True
 
 
-def load_config(config_path: Path) -> dict[str, Any]:
+def get_catalog() -> MemoryCatalog | None:
     """
-    Load and validate the configuration file.
-
-    Args:
-        config_path: Path to the JSON configuration file
+    Get the shared memory bank catalog, opening it on first use.
 
     Returns:
-        Parsed configuration dictionary
+        The catalog, or None if it is disabled or cannot be opened
     """
-    print_info(f"Loading configuration from: {config_path}")
-
-    if not config_path.exists():
-        error_msg = f"Configuration file does not exist: {config_path}"
-        logger.error(error_msg)
-        print_error(error_msg)
-        sys.exit(1)
-
-    config = safe_file_operation(
-        _load_and_validate_config,
-        config_path,
-        "Error loading configuration",
-        config_path,
-    )
+    global _catalog, catalog_enabled
 
-    if config is None:
-        sys.exit(1)
+    if not catalog_enabled:
+        return None
 
-    return config
+    if _catalog is None:
+        import sqlite3
 
+        try:
+            _catalog = MemoryCatalog(script_dir / CATALOG_FILENAME)
+            atexit.register(_catalog.close)
+        except sqlite3.Error as e:
+            logger.warning(f"File catalog unavailable, scanning directly: {e}")
+            catalog_enabled = False
+            return None
 
-def _load_and_validate_config(config_path: Path) -> dict[str, Any]:
-    """Internal function to load and validate config file."""
-    with open(config_path, encoding="utf-8") as f:
-        config = json.load(f)
+    return _catalog
 
-    # Basic validation
-    if "operations" not in config:
-        error_msg = "Configuration must contain 'operations' key"
-        logger.error(error_msg)
-        print_error(error_msg)
-        sys.exit(1)
 
-    print_success(
-        f"Successfully loaded configuration with {len(config['operations'])} operations"
-    )
-    return config
+SEARCH_INDEX_FILENAME = "memory_search.db"
+SEARCH_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+SEARCH_HEADING_PATTERN = re.compile(r"^#{1,6}\s+(.+?)\s*#*\s*$")
+SEARCH_DEFAULT_LIMIT = 10
+BM25_K1 = 1.2
+BM25_B = 0.75
 
 
-def process_operation(
-    operation: dict[str, str],
-    dry_run: bool,
-    root_dir: Path,
-    force_overwrite: bool = False,
-    organize_by_category: bool = False,
-) -> bool:
+def tokenize_markdown(text: str) -> list[str]:
     """
-    Process a single file operation.
+    Split markdown text into lowercase search terms.
+
+    Markup, punctuation and single characters are dropped, and camelCase
+    and snake_case words are split, so `activeContext` and `active_context`
+    both yield "active" and "context".
 
     Args:
-        operation: Operation configuration dictionary
-        dry_run: If True, only simulate operations
-        root_dir: Root directory for resolving relative paths (memory-bank folder)
-        force_overwrite: If True, allow overwriting of existing destination files
-        organize_by_category: If True, organize files into category folders
+        text: Markdown text
 
     Returns:
-        True if operation successful or simulated, False otherwise
+        The terms, in order
     """
-    # Get paths and resolve them relative to the memory-bank root directory
-    source_path = root_dir / operation["source"]
-    dest_folder = root_dir / operation["destination_folder"]
+    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text).lower()
+    return [term for term in SEARCH_TOKEN_PATTERN.findall(text) if len(term) > 1]
 
-    # Get the filename from the source path
-    filename = source_path.name
 
-    # Get memory type from operation or determine it
-    memory_type = operation.get("memory_type", determine_memory_type(source_path))
+class SearchIndex:
+    """
+    Persistent BM25 full-text index over the memory bank's markdown files.
+
+    Each file is tokenized once, when it is added or changes, into postings
+    (term, document, term frequency) kept in a clustered SQLite table. A
+    document records its memory type, archive category and version, so
+    searches can be narrowed to either. Archive operations update the index
+    as they move files, and sync() reindexes only files whose size or mtime
+    changed, so the index is never rebuilt from scratch.
+    """
 
-    # Determine destination path based on organization preference
-    if organize_by_category and operation.get("operation_type") == "move":
-        # Determine appropriate category based on file content/name
-        category = operation.get("category", determine_file_category(source_path))
-        # Create category folder structure
-        category_folder = create_category_folder_structure(dest_folder, category)
-        destination_path = category_folder / filename
-    else:
-        destination_path = dest_folder / filename
+    def __init__(self, db_path: Path) -> None:
+        import sqlite3
 
-    # Log operation details
-    if dry_run:
-        print_header(f"DRY RUN: Processing operation for {filename}")
-    else:
-        print_header(f"Processing operation for {filename}")
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                path TEXT NOT NULL UNIQUE,
+                memory_type TEXT,
+                category TEXT,
+                version TEXT,
+                length INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS documents_type
+                ON documents (memory_type, category);
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                document INTEGER NOT NULL,
+                frequency INTEGER NOT NULL,
+                PRIMARY KEY (term, document)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_document ON postings (document);
+            """
+        )
+        self._conn.commit()
+        self._pending_writes = 0
+
+    def close(self) -> None:
+        """Commit pending writes and close the underlying database connection."""
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def update_files(self, file_paths: Iterable[Path]) -> None:
+        """
+        Bring the index up to date for individual files.
+
+        Files that changed are reindexed, and files that no longer exist,
+        loose, packed or delta-encoded, are dropped. Writes are committed in
+        batches; a batch lost in a crash is picked up by the next sync().
+
+        Args:
+            file_paths: Markdown files that were written, moved or removed
+        """
+        with self._lock:
+            for file_path in file_paths:
+                if file_path.name in ARCHIVE_METADATA_NAMES:
+                    continue
+                self._pending_writes += 1
+                try:
+                    file_stat = os.stat(file_path)
+                    state = (file_stat.st_size, file_stat.st_mtime_ns)
+                except FileNotFoundError:
+                    entry = stored_archive_entry(file_path)
+                    if entry is None:
+                        self._remove(str(file_path))
+                        continue
+                    state = (entry["size"], entry["mtime_ns"])
+                self._index_if_changed(file_path, state)
+            if self._pending_writes >= 500:
+                self._conn.commit()
+                self._pending_writes = 0
+
+    def sync(self, root_dir: Path) -> int:
+        """
+        Reindex the files of a memory bank that changed since they were indexed.
+
+        The files come from the catalog when it is enabled, or from a scan of
+        the memory type directories otherwise. Either way each file is
+        stat()ed, since the catalog's sizes and mtimes miss files edited in
+        place. Packed and delta-encoded files stay indexed while they exist in
+        their stores.
+
+        Args:
+            root_dir: Root directory of the memory bank
+
+        Returns:
+            Number of files indexed or dropped
+        """
+        current: dict[str, tuple[int, int]] = {}
+        catalog = get_catalog()
+        for memory_type in MEMORY_TYPES:
+            memory_dir = root_dir / memory_type
+            if catalog is not None:
+                catalog.refresh(memory_dir)
+                pending = [memory_dir]
+                while pending:
+                    directory = pending.pop()
+                    for row in catalog.list_files(directory, refresh=False):
+                        try:
+                            file_stat = os.stat(row["path"])
+                        except FileNotFoundError:
+                            continue
+                        current[row["path"]] = (
+                            file_stat.st_size,
+                            file_stat.st_mtime_ns,
+                        )
+                    pending.extend(catalog.list_subdirectories(directory))
+            else:
+                for _, listing in DirectoryScanner().walk(memory_dir):
+                    for scanned in listing.files:
+                        file_stat = scanned.stat()
+                        if file_stat is not None:
+                            current[str(scanned.path)] = (
+                                file_stat.st_size,
+                                file_stat.st_mtime_ns,
+                            )
+
+        changes = 0
+        with self._lock:
+            indexed = {
+                row["path"]: (row["size"], row["mtime_ns"])
+                for row in self._conn.execute(
+                    "SELECT path, size, mtime_ns FROM documents"
+                )
+            }
+            for path, state in current.items():
+                if indexed.get(path) != state and Path(path).name not in (
+                    ARCHIVE_METADATA_NAMES
+                ):
+                    changes += self._index_if_changed(Path(path), state)
+            for path in indexed.keys() - current.keys():
+                if stored_archive_entry(Path(path)) is None:
+                    self._remove(path)
+                    changes += 1
+            self._conn.commit()
+            self._pending_writes = 0
+        return changes
+
+    def _index_if_changed(self, file_path: Path, state: tuple[int, int]) -> bool:
+        """Internal function to (re)index one file unless its size and mtime match."""
+        key = str(file_path)
+        row = self._conn.execute(
+            "SELECT size, mtime_ns FROM documents WHERE path = ?", (key,)
+        ).fetchone()
+        if row is not None and (row["size"], row["mtime_ns"]) == state:
+            return False
 
-    print_info(f"Source: {source_path}")
-    print_info(f"Destination: {destination_path}")
-    logger.info("Processing operation:")
-    logger.info(f"  Source: {source_path}")
-    logger.info(f"  Destination: {destination_path}")
+        try:
+            text = read_archived_file(file_path).decode("utf-8", "replace")
+        except (FileNotFoundError, KeyError):
+            self._remove(key)
+            return True
 
-    # Extract base name for version checking (strip extension)
-    base_name = filename.split(".")[0] if "." in filename else filename
+        terms = tokenize_markdown(file_path.stem + "\n" + text)
+        frequencies: dict[str, int] = {}
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+
+        self._remove(key)
+        memory_type, category = _memory_location(file_path)
+        document = self._conn.execute(
+            "INSERT INTO documents "
+            "(path, memory_type, category, version, length, size, mtime_ns) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                memory_type,
+                category,
+                _parse_version_suffix(file_path.stem),
+                len(terms),
+                state[0],
+                state[1],
+            ),
+        ).lastrowid
+        self._conn.executemany(
+            "INSERT INTO postings (term, document, frequency) VALUES (?, ?, ?)",
+            [(term, document, count) for term, count in frequencies.items()],
+        )
+        return True
 
-    # Remove version suffix if present for better matching
-    if "_v" in base_name:
-        search_base = base_name.split("_v")[0]
-    else:
-        search_base = base_name
+    def _remove(self, key: str) -> None:
+        """Internal function to drop one document and its postings."""
+        row = self._conn.execute(
+            "SELECT id FROM documents WHERE path = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM postings WHERE document = ?", (row["id"],))
+            self._conn.execute("DELETE FROM documents WHERE id = ?", (row["id"],))
+
+    def search(
+        self,
+        query: str,
+        limit: int = SEARCH_DEFAULT_LIMIT,
+        memory_type: str | None = None,
+        category: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Rank indexed files against a query with BM25.
+
+        Only the postings of the query's terms are read. The best-matching
+        heading of each result is found by reading the result files alone.
+
+        Args:
+            query: Search terms
+            limit: Maximum number of results
+            memory_type: If given, only search files of this memory type
+            category: If given, only search files in this archive category
+
+        Returns:
+            Results, best first, each with its "path", "score", "memory_type",
+            "category", "version" and "heading"
+        """
+        import heapq
+        import math
+
+        terms = list(dict.fromkeys(tokenize_markdown(query)))
+        if not terms:
+            return []
+
+        filters = ""
+        parameters: list[Any] = []
+        if memory_type is not None:
+            filters += " AND d.memory_type = ?"
+            parameters.append(memory_type)
+        if category is not None:
+            filters += " AND d.category = ?"
+            parameters.append(category)
+
+        with self._lock:
+            totals = self._conn.execute(
+                f"SELECT COUNT(*) AS n, AVG(length) AS average FROM documents d "
+                f"WHERE 1 = 1{filters}",
+                parameters,
+            ).fetchone()
+            if not totals["n"]:
+                return []
+            rows = self._conn.execute(
+                f"SELECT p.term, p.document, p.frequency, d.length FROM postings p "
+                f"JOIN documents d ON d.id = p.document "
+                f"WHERE p.term IN ({', '.join('?' * len(terms))}){filters}",
+                terms + parameters,
+            ).fetchall()
+
+            document_frequency: dict[str, int] = {}
+            for row in rows:
+                document_frequency[row["term"]] = (
+                    document_frequency.get(row["term"], 0) + 1
+                )
 
-    # For BIG BRAIN Memory Bank, check for newer versions in active directories
-    # Depending on memory type, look in the appropriate active directory
-    search_paths = []
-    if memory_type == "core":
-        search_paths.append(root_dir / "core" / "active")
-    elif memory_type == "episodic":
-        search_paths.append(root_dir / "episodic" / "active")
-    elif memory_type == "semantic":
-        search_paths.append(root_dir / "semantic" / "active")
-    elif memory_type == "procedural":
-        search_paths.append(root_dir / "procedural" / "active")
-    else:
-        # Fallback: search all active directories
-        search_paths = [
-            root_dir / "core" / "active",
-            root_dir / "episodic" / "active",
-            root_dir / "semantic" / "active",
-            root_dir / "procedural" / "active",
-        ]
+            count, average_length = totals["n"], totals["average"] or 1
+            scores: dict[int, float] = {}
+            for row in rows:
+                df = document_frequency[row["term"]]
+                idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+                frequency = row["frequency"]
+                norm = BM25_K1 * (
+                    1 - BM25_B + BM25_B * row["length"] / average_length
+                )
+                scores[row["document"]] = scores.get(row["document"], 0.0) + idf * (
+                    frequency * (BM25_K1 + 1) / (frequency + norm)
+                )
 
-    # Check each search path for versioned files
-    versioned_files = []
-    for search_path in search_paths:
-        if search_path.exists():
-            # Pattern matches: base_name_v1.1.md, base_name_v2.0.md, etc.
-            versioned_files.extend(list(search_path.glob(f"{search_base}_v*.md")))
-            # Also look for exact filename matches
-            exact_match = search_path / f"{search_base}.md"
-            if exact_match.exists():
-                versioned_files.append(exact_match)
+            best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            results = []
+            for document, score in best:
+                row = self._conn.execute(
+                    "SELECT * FROM documents WHERE id = ?", (document,)
+                ).fetchone()
+                results.append(
+                    {
+                        "path": row["path"],
+                        "score": score,
+                        "memory_type": row["memory_type"],
+                        "category": row["category"],
+                        "version": row["version"],
+                    }
+                )
 
-    if not versioned_files:
-        print_warning(
-            f"No versioned file found for {filename}. Make sure to create a new version before moving the original."
-        )
-    else:
-        print_info(
-            f"Found versioned file(s): {', '.join(f.name for f in versioned_files)}"
-        )
+        for result in results:
+            result["heading"] = _best_heading(Path(result["path"]), set(terms))
+        return results
 
-    # Execute file copy
-    return safe_copy_file(source_path, destination_path, dry_run, force_overwrite)
 
+def _memory_location(file_path: Path) -> tuple[str | None, str | None]:
+    """
+    Find a file's memory type and archive category from its path.
 
-def verify_operation(operation: dict[str, str], root_dir: Path) -> bool:
+    Returns:
+        (memory type, category folder), either None if the path has none
     """
-    Verify that a file operation was completed successfully.
+    parts = file_path.parts
+    for i in range(len(parts) - 2, -1, -1):
+        if parts[i] in MEMORY_TYPES and parts[i + 1] in ("active", "archive"):
+            in_category = parts[i + 1] == "archive" and len(parts) > i + 3
+            return parts[i], parts[i + 2] if in_category else None
+    return None, None
 
-    Args:
-        operation: Operation configuration dictionary
-        root_dir: Root directory for resolving relative paths
+
+def _best_heading(file_path: Path, terms: set[str]) -> str | None:
+    """
+    Find the heading of the section of a file that matches the most terms.
 
     Returns:
-        True if verification passed, False otherwise
+        The heading text, or None if the file has no headings or is gone
     """
-    source_path = root_dir / operation["source"]
-    dest_folder = root_dir / operation["destination_folder"]
-    filename = source_path.name
+    try:
+        text = read_archived_file(file_path).decode("utf-8", "replace")
+    except (FileNotFoundError, KeyError):
+        return None
 
-    # Check if this is an organized operation with a category
-    if operation.get("category"):
-        category_folder = dest_folder / operation["category"]
-        destination_path = category_folder / filename
-    else:
-        destination_path = dest_folder / filename
+    best_heading, best_hits = None, -1
+    heading, hits = None, 0
+    for line in text.splitlines():
+        match = SEARCH_HEADING_PATTERN.match(line)
+        if match:
+            if heading is not None and hits > best_hits:
+                best_heading, best_hits = heading, hits
+            heading, hits = match.group(1), 0
+        hits += sum(1 for term in tokenize_markdown(line) if term in terms)
+    if heading is not None and hits > best_hits:
+        best_heading = heading
+    return best_heading
 
-    if not destination_path.exists():
-        print_error(f"Verification failed: {destination_path} does not exist")
-        return False
 
-    # Compare file sizes as a basic check
-    source_size = source_path.stat().st_size
-    dest_size = destination_path.stat().st_size
+_search_index: SearchIndex | None = None
+_search_index_lock = threading.Lock()
+search_index_enabled = True
 
-    if source_size != dest_size:
-        print_error(f"Verification failed: File sizes don't match for {filename}")
-        print_info(
-            f"Source size: {source_size} bytes, Destination size: {dest_size} bytes"
-        )
-        return False
 
-    print_success(f"Verification passed for {destination_path}")
-    return True
+def get_search_index() -> SearchIndex | None:
+    """
+    Get the shared full-text search index, opening it on first use.
 
+    Returns:
+        The index, or None if it is disabled or cannot be opened
+    """
+    global _search_index, search_index_enabled
 
-def main() -> None:
-    """Main entry point for the script."""
-    # Set up argument parser
-    parser = argparse.ArgumentParser(
-        description=textwrap.dedent(
-            """
-            Memory Manager - A tool for managing memory files.
+    if not search_index_enabled:
+        return None
 
-            This tool helps organize and manage memory files by performing operations
-            like copying and moving files to appropriate locations, and moving original
-            files to the Windows recycle bin. It follows a structured workflow:
+    # Worker threads may ask for the index at the same time; only one of them
+    # may open it, or the connections would lock each other out
+    with _search_index_lock:
+        if _search_index is None and search_index_enabled:
+            import sqlite3
 
-            1. VALIDATION/DRY RUN: Validates all operations without making changes
-            2. FILE COPYING: Copies files to appropriate archival locations
-            3. RECYCLE BIN: Moves original files to Windows recycle bin (with confirmation)
+            try:
+                _search_index = SearchIndex(script_dir / SEARCH_INDEX_FILENAME)
+                atexit.register(_search_index.close)
+            except sqlite3.Error as e:
+                logger.warning(f"Search index unavailable: {e}")
+                search_index_enabled = False
 
-            The tool also supports organizing files into category folders, detecting
-            categories based on file content and name, and reorganizing existing files.
+    return _search_index
 
-            AI ASSISTANT SUPPORT: Use --non-interactive mode with --report-file for AI assistants.
-            """
-        ),
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-    )
 
-    parser.add_argument(
-        "config_file",
-        nargs="?",
-        default="memory_config.json",
-        help="Path to the memory configuration JSON file (default: memory_config.json)",
-    )
-    parser.add_argument(
-        "--force-overwrite",
-        action="store_true",
-        help="Force overwriting of existing files (USE WITH CAUTION)",
-    )
-    parser.add_argument(
-        "--recycle-confirmed",
-        action="store_true",
-        help="Skip confirmations and only perform recycle bin operations (USE WITH CAUTION)",
+def update_search_index(file_paths: Iterable[Path]) -> None:
+    """
+    Update the search index for files that were archived, moved or removed.
+
+    Indexing is best effort: an error is logged and left for the next
+    sync() to repair, and never fails the operation that moved the files.
+
+    Args:
+        file_paths: Paths of the files, as they were before and after the move
+    """
+    index = get_search_index()
+    if index is None:
+        return
+    import sqlite3
+
+    try:
+        index.update_files(file_paths)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        logger.warning(f"Could not update the search index: {e}")
+
+
+def search_memory_bank(
+    root_dir: Path,
+    query: str,
+    limit: int = SEARCH_DEFAULT_LIMIT,
+    memory_type: str | None = None,
+    category: str | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Search the memory bank and print the ranked results.
+
+    The index is first synced with the files that changed since they were
+    indexed (the whole bank, the first time).
+
+    Args:
+        root_dir: Root directory of the memory bank
+        query: Search terms
+        limit: Maximum number of results
+        memory_type: If given, only search files of this memory type
+        category: If given, only search files in this archive category
+
+    Returns:
+        The results, best first (see SearchIndex.search)
+    """
+    index = get_search_index()
+    if index is None:
+        print_error("The search index is not available.")
+        return []
+
+    start = time.perf_counter()
+    changes = index.sync(root_dir)
+    if changes:
+        print_info(f"Search index updated: {changes} files")
+    results = index.search(query, limit, memory_type, category)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print_header(f"SEARCH RESULTS FOR {query}")
+    if not results:
+        print_result(f"No matching files ({elapsed_ms:.0f} ms).")
+        return results
+
+    for rank, result in enumerate(results, 1):
+        file_path = Path(result["path"])
+        try:
+            file_path = file_path.relative_to(root_dir)
+        except ValueError:
+            pass
+        location = "/".join(
+            part for part in (result["memory_type"], result["category"]) if part
+        )
+        version = f", v{result['version']}" if result["version"] else ""
+        print_result(
+            f"{rank}. {file_path} ({location}{version}) score {result['score']:.2f}"
+        )
+        if result["heading"]:
+            print_result(f"    {result['heading']}")
+    print_success(f"{len(results)} results in {elapsed_ms:.0f} ms")
+    return results
+
+
+JOURNAL_STATES = ["planned", "copied", "verified", "recycled"]
+
+
+class OperationJournal:
+    """
+    Append-only write-ahead journal of operation states.
+
+    The journal is a JSON-lines file. Its first record holds the run's
+    operations and options; each later record moves one operation to a new
+    state (planned, copied, verified, recycled). Records are flushed as they
+    are written and fsynced in batches of JOURNAL_SYNC_INTERVAL, and at every
+    phase boundary. If the process dies, --resume replays the journal to find
+    the work that is left. A run that completes deletes its journal.
+    """
+
+    def __init__(self, journal_path: Path) -> None:
+        self.journal_path = journal_path
+        self._lock = threading.Lock()
+        self._file = open(journal_path, "a", encoding="utf-8")
+        self._unsynced = 0
+        self._next_id = 0
+
+    @classmethod
+    def start(
+        cls,
+        journal_path: Path,
+        operations: list[dict[str, Any]],
+        options: dict[str, Any],
+    ) -> OperationJournal:
+        """
+        Start a new journal for a run, replacing any previous one.
+
+        Every operation is given a "journal_id" and recorded as planned.
+
+        Args:
+            journal_path: Path of the journal file
+            operations: Operations the run will perform
+            options: Options the run uses (restored on resume)
+
+        Returns:
+            The open journal
+        """
+        for journal_id, operation in enumerate(operations):
+            operation["journal_id"] = journal_id
+
+        if journal_path.exists():
+            journal_path.unlink()
+        journal = cls(journal_path)
+        journal._next_id = len(operations)
+        journal._write(
+            {
+                "event": "start",
+                "time": datetime.now().isoformat(),
+                "root_dir": str(memory_bank_root),
+                "options": options,
+                "operations": operations,
+            }
+        )
+        journal.sync()
+        return journal
+
+    def add(self, operation: dict[str, Any]) -> None:
+        """
+        Add an operation to a running journal and record it as planned.
+
+        Used when operations are discovered while the run is already going.
+
+        Args:
+            operation: Operation to add; it is given the next "journal_id"
+        """
+        with self._lock:
+            operation["journal_id"] = self._next_id
+            self._next_id += 1
+        self._write({"event": "plan", "operation": operation})
+
+    def record(self, operation: dict[str, Any], state: str) -> None:
+        """
+        Record that an operation reached a state.
+
+        Args:
+            operation: Operation with a "journal_id"
+            state: One of JOURNAL_STATES
+        """
+        entry = {"event": "state", "id": operation["journal_id"], "state": state}
+        for key in ("destination", "content_hash", "linked", "copy_backend"):
+            if key in operation:
+                entry[key] = operation[key]
+        self._write(entry)
+
+    def _write(self, entry: dict[str, Any]) -> None:
+        """Append one record, fsyncing once a batch has accumulated."""
+        with self._lock:
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            self._unsynced += 1
+            if self._unsynced >= JOURNAL_SYNC_INTERVAL:
+                os.fsync(self._file.fileno())
+                self._unsynced = 0
+
+    def sync(self) -> None:
+        """Force every record written so far to disk."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._unsynced = 0
+
+    def close(self) -> None:
+        """Sync and close the journal."""
+        self.sync()
+        with self._lock:
+            self._file.close()
+
+    def finish(self) -> None:
+        """Close and delete the journal after a run completed."""
+        self.close()
+        self.journal_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def replay(journal_path: Path) -> dict[str, Any] | None:
+        """
+        Replay a journal left behind by an interrupted run.
+
+        A truncated final record (from a crash mid-write) is ignored.
+
+        Args:
+            journal_path: Path of the journal file
+
+        Returns:
+            Dict with the run's "options", "root_dir" and "operations", each
+            operation carrying its last recorded "journal_state", or None if
+            there is no usable journal
+        """
+        if not journal_path.exists():
+            return None
+
+        run = None
+        with open(journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+
+                if entry.get("event") == "start":
+                    run = entry
+                    for operation in run["operations"]:
+                        operation["journal_state"] = "planned"
+                elif entry.get("event") == "plan" and run is not None:
+                    entry["operation"]["journal_state"] = "planned"
+                    run["operations"].append(entry["operation"])
+                elif entry.get("event") == "state" and run is not None:
+                    journal_id = entry.get("id")
+                    if not (
+                        isinstance(journal_id, int)
+                        and 0 <= journal_id < len(run["operations"])
+                    ):
+                        logger.warning(
+                            f"Ignoring journal record for unknown operation: {journal_id}"
+                        )
+                        continue
+                    operation = run["operations"][journal_id]
+                    operation["journal_state"] = entry["state"]
+                    for key in ("destination", "content_hash", "linked", "copy_backend"):
+                        if key in entry:
+                            operation[key] = entry[key]
+
+        return run
+
+
+# Journal of the current run, if one is being written
+journal: OperationJournal | None = None
+
+
+def journal_record(operation: dict[str, Any], state: str) -> None:
+    """Record an operation's new state in the current run's journal, if any."""
+    if journal is not None and "journal_id" in operation:
+        journal.record(operation, state)
+
+
+@timed_phase("analyze")
+def analyze_long_term_memory(
+    ltm_dir: Path, category_detection: str = "smart"
+) -> dict[str, Any]:
+    """
+    Analyze the current state of long-term memory storage.
+
+    Args:
+        ltm_dir: Path to the long-term memory directory
+        category_detection: Method for detecting categories
+
+    Returns:
+        Dict containing analysis results
+    """
+    print_header("ANALYZING MEMORY ORGANIZATION")
+
+    if not ltm_dir.exists():
+        print_error(f"Memory directory does not exist: {ltm_dir}")
+        return {
+            "status": "error",
+            "message": f"Directory does not exist: {ltm_dir}",
+            "loose_files": [],
+            "categories": {},
+            "recommended_actions": [],
+        }
+
+    # For BIG BRAIN Memory Bank, analyze each memory type directory
+    memory_analysis = {}
+    loose_by_type: dict[str, tuple[Path, list[tuple[Path, str | None]]]] = {}
+    catalog = get_catalog()
+    scanner = DirectoryScanner()
+
+    for memory_type in MEMORY_TYPES:
+        memory_dir = ltm_dir / memory_type / "archive"
+        if catalog is None:
+            # Scan the archive and its category folders in one walk
+            archive_tree = list(scanner.walk(memory_dir, max_depth=1))
+            archive_exists = bool(archive_tree)
+        else:
+            archive_exists = memory_dir.exists()
+        if not archive_exists:
+            memory_analysis[memory_type] = {
+                "status": "missing",
+                "message": f"Directory does not exist: {memory_dir}",
+                "loose_files": [],
+                "categories": {},
+            }
+            continue
+
+        # Find loose markdown files and category folders, preferring the catalog
+        # (with its pre-computed categories) over walking the directory
+        if catalog is not None:
+            catalog.refresh(memory_dir)
+            loose_entries = [
+                (Path(row["path"]), row["category"])
+                for row in catalog.list_files(memory_dir, refresh=False)
+            ]
+            category_dirs = [
+                (item, [Path(row["path"]) for row in catalog.list_files(item, False)])
+                for item in catalog.list_subdirectories(memory_dir)
+            ]
+        else:
+            loose_entries = [(f.path, None) for f in archive_tree[0][1].files]
+            category_dirs = [
+                (item, [f.path for f in listing.files])
+                for item, listing in archive_tree[1:]
+            ]
+
+        # Metadata files such as the storage log stay at the top of the archive
+        loose_entries = [
+            (file_path, category)
+            for file_path, category in loose_entries
+            if file_path.name not in ARCHIVE_METADATA_NAMES
+        ]
+        loose_files = [file_path for file_path, _ in loose_entries]
+        loose_file_paths = [str(f.relative_to(memory_dir)) for f in loose_files]
+
+        # Find existing category folders, counting packed and delta-encoded
+        # files as if loose
+        existing_categories = {}
+        for item, files_in_category in category_dirs:
+            category_name = item.name
+            file_names = [str(f.relative_to(item)) for f in files_in_category]
+            pack = get_archive_pack(item)
+            delta_store = get_delta_store(item)
+            loose_names = set(file_names)
+            packed_names = [
+                name for name in (pack.names() if pack else []) if name not in loose_names
+            ]
+            delta_names = [
+                name
+                for name in (delta_store.names() if delta_store else [])
+                if name not in loose_names
+            ]
+            existing_categories[category_name] = {
+                "path": str(item.relative_to(memory_dir)),
+                "file_count": len(file_names) + len(packed_names) + len(delta_names),
+                "files": file_names + packed_names + delta_names,
+                "packed_count": len(packed_names),
+                "delta_count": len(delta_names),
+                "has_metadata": any(
+                    f.name == ".category_info.md" for f in files_in_category
+                ),
+            }
+
+        # Loose files are categorized below, for all memory types at once
+        loose_by_type[memory_type] = (memory_dir, loose_entries)
+
+        # Prepare summary
+        total_files = len(loose_files) + sum(
+            cat["file_count"] for cat in existing_categories.values()
+        )
+
+        memory_analysis[memory_type] = {
+            "status": "success",
+            "loose_files": loose_file_paths,
+            "loose_file_count": len(loose_files),
+            "categories": existing_categories,
+            "category_count": len(existing_categories),
+            "total_files": total_files,
+            "organization_percentage": 100 - (len(loose_files) / total_files * 100)
+            if total_files > 0
+            else 0,
+            "file_categories": {},
+        }
+
+    # Categorize loose files (catalogued categories are only valid for
+    # name-based detection; content-based detection reads the file). Files
+    # without one are categorized in a single batch across memory types.
+    use_catalogued = category_detection != "content-based"
+    detected = iter(
+        categorize_files(
+            [
+                file_path
+                for _, loose_entries in loose_by_type.values()
+                for file_path, catalogued_category in loose_entries
+                if not (catalogued_category and use_catalogued)
+            ],
+            category_detection,
+        )
     )
+    for memory_type, (memory_dir, loose_entries) in loose_by_type.items():
+        file_categories = memory_analysis[memory_type]["file_categories"]
+        for file_path, catalogued_category in loose_entries:
+            if catalogued_category and use_catalogued:
+                category = catalogued_category
+            else:
+                category = next(detected)
+            file_categories.setdefault(category, []).append(
+                str(file_path.relative_to(memory_dir))
+            )
 
-    # Add new organization arguments
-    organization_group = parser.add_argument_group("Organization options")
-    organization_group.add_argument(
-        "--organize-by-category",
-        action="store_true",
-        help="Organize files into category folders in archive directories",
+    # Generate recommendations
+    recommendations = []
+
+    for memory_type, analysis in memory_analysis.items():
+        if analysis["status"] == "missing":
+            recommendations.append(
+                {
+                    "type": "create_directory",
+                    "description": f"Create archive directory for {memory_type} memory",
+                    "memory_type": memory_type,
+                }
+            )
+            continue
+
+        if analysis["loose_files"]:
+            recommendations.append(
+                {
+                    "type": "organize_loose_files",
+                    "description": f"Organize {len(analysis['loose_files'])} loose files in {memory_type} memory",
+                    "memory_type": memory_type,
+                    "details": analysis["file_categories"],
+                }
+            )
+
+        for category_name, category_info in analysis["categories"].items():
+            if not category_info["has_metadata"]:
+                recommendations.append(
+                    {
+                        "type": "add_category_metadata",
+                        "description": f"Add metadata to category folder: {memory_type}/{category_name}",
+                        "memory_type": memory_type,
+                        "category": category_name,
+                    }
+                )
+
+    # Combine all analyses into one result
+    combined_result = {
+        "status": "success",
+        "timestamp": datetime.now().isoformat(),
+        "memory_types": memory_analysis,
+        "recommended_actions": recommendations,
+    }
+
+    # Print summary
+    for memory_type, analysis in memory_analysis.items():
+        if analysis["status"] == "missing":
+            print_warning(
+                f"{memory_type.capitalize()} memory archive directory does not exist"
+            )
+            continue
+
+        print_info(f"\n{memory_type.capitalize()} Memory:")
+        print_info(
+            f"  Found {analysis['loose_file_count']} loose files needing organization"
+        )
+        print_info(f"  Found {analysis['category_count']} existing category folders")
+        print_info(f"  Total files: {analysis['total_files']}")
+
+        if analysis["loose_files"]:
+            print_info(f"\n  Proposed categorization for {memory_type}:")
+            for category, files in analysis["file_categories"].items():
+                print_info(f"    {category}: {len(files)} files")
+
+    if recommendations:
+        print_info("\nRecommended actions:")
+        for rec in recommendations:
+            print_info(f"  - {rec['description']}")
+
+    return combined_result
+
+
+@timed_phase("reorganize")
+def reorganize_existing_files(
+    ltm_dir: Path,
+    analysis: dict[str, Any] | None = None,
+    dry_run: bool = True,
+    options: dict[str, Any] | None = None,
+    batch_size: int = 10,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Reorganize existing files based on analysis results.
+
+    Files are renamed into their category folders, so hard links to dedupe
+    blobs survive; only a folder on another filesystem gets a verified copy.
+
+    Args:
+        ltm_dir: Path to the long-term memory directory
+        analysis: Analysis results from analyze_long_term_memory (if None, will perform analysis)
+        dry_run: If True, only simulate operations
+        options: Dictionary of options for reorganization
+        batch_size: Number of files to process in each batch for memory efficiency
+
+    Returns:
+        Tuple of (successful_operations, failed_operations)
+    """
+    import errno
+
+    if options is None:
+        options = {
+            "force_overwrite": False,
+            "create_metadata": True,
+            "category_detection": "smart",
+        }
+
+    if analysis is None:
+        analysis = analyze_long_term_memory(
+            ltm_dir, options.get("category_detection", "smart")
+        )
+
+    if analysis["status"] != "success" or not analysis["loose_files"]:
+        if dry_run:
+            print_info("No loose files to organize")
+        return ([], [])
+
+    print_header(
+        f"{'DRY RUN: ' if dry_run else ''}REORGANIZING FILES IN LONG-TERM MEMORY"
     )
-    organization_group.add_argument(
-        "--reorganize-existing",
-        action="store_true",
-        help="Organize existing files in archive directories into category folders",
+
+    successful_operations = []
+    failed_operations = []
+
+    # Process files by category for better organization and memory efficiency
+    file_categories = analysis["file_categories"]
+
+    for category, files in file_categories.items():
+        # Create category folder structure
+        category_folder = create_category_folder_structure(
+            ltm_dir,
+            category,
+            create_metadata=options.get("create_metadata", True) and not dry_run,
+        )
+
+        print_info(f"Processing category: {category} ({len(files)} files)")
+
+        # Process files in batches to optimize memory usage
+        for i in range(0, len(files), batch_size):
+            batch = files[i : i + batch_size]
+            log_memory_usage()
+
+            for file_path_str in batch:
+                file_path = ltm_dir / file_path_str
+                destination_path = category_folder / file_path.name
+
+                operation_details = {
+                    "source": str(file_path),
+                    "destination": str(destination_path),
+                    "category": category,
+                    "timestamp": datetime.now().isoformat(),
+                }
+
+                if dry_run:
+                    print_info(
+                        f"[DRY RUN] Would move: {file_path.name} → {category}/{file_path.name}",
+                        detail=True,
+                    )
+                    successful_operations.append(operation_details)
+                    continue
+
+                try:
+                    # Check if destination exists
+                    if archive_file_exists(destination_path) and not options.get(
+                        "force_overwrite", False
+                    ):
+                        print_warning(
+                            f"Destination file already exists, skipping: {destination_path}"
+                        )
+                        operation_details["status"] = "skipped"
+                        operation_details["reason"] = "destination_exists"
+                        failed_operations.append(operation_details)
+                        continue
+
+                    # The category folder is inside the archive directory, so
+                    # a rename moves the file without copying it and keeps its
+                    # inode, and with it any hard link to a dedupe blob
+                    content_hash = None
+                    try:
+                        os.replace(file_path, destination_path)
+                    except OSError as e:
+                        if e.errno != errno.EXDEV:
+                            raise
+
+                        # Copy first, then delete to ensure no data loss
+                        _, content_hash = copy_file_data(file_path, destination_path)
+                        if content_hash is None:
+                            content_hash = compute_file_hash(file_path)
+
+                        # Verify the copy succeeded against the source hash
+                        if (
+                            not destination_path.exists()
+                            or compute_file_hash(destination_path) != content_hash
+                        ):
+                            print_error(f"Verification failed for: {file_path.name}")
+                            operation_details["status"] = "failed"
+                            operation_details["reason"] = "verification_failed"
+                            failed_operations.append(operation_details)
+                            continue
+
+                        # Remove original file
+                        file_path.unlink()
+                    update_search_index([file_path, destination_path])
+
+                    print_success(
+                        f"Moved: {file_path.name} → {category}/{file_path.name}",
+                        detail=True,
+                    )
+                    if content_hash is not None:
+                        operation_details["content_hash"] = content_hash
+                    operation_details["status"] = "success"
+                    successful_operations.append(operation_details)
+
+                except Exception as e:
+                    print_error(f"Error moving file {file_path.name}: {e}")
+                    operation_details["status"] = "failed"
+                    operation_details["reason"] = str(e)
+                    failed_operations.append(operation_details)
+
+            # Free memory after each batch
+            trigger_garbage_collection()
+
+    # Print summary
+    print_header(f"{'DRY RUN: ' if dry_run else ''}REORGANIZATION SUMMARY")
+    print_success(f"Successfully organized: {len(successful_operations)}")
+    if failed_operations:
+        print_error(f"Failed to organize: {len(failed_operations)}")
+
+    return (successful_operations, failed_operations)
+
+
+# Metadata files rewritten in place in archive folders, which are never
+# linked, packed or delta-encoded
+ARCHIVE_METADATA_NAMES = {".category_info.md", "storage_log.md"}
+
+
+def _parse_index_line(line: bytes) -> dict[str, Any] | None:
+    """
+    Parse one line of an append-only JSON-lines index.
+
+    A line that does not parse is either the torn tail of an interrupted
+    append or, in files written before torn tails were cut off, a torn
+    record with a complete one appended to it; the complete record is
+    recovered from the end of such a line.
+
+    Args:
+        line: Raw line, with or without its newline
+
+    Returns:
+        The record, or None if the line holds no complete record
+    """
+    try:
+        return json.loads(line)
+    except ValueError:
+        pass
+    start = line.find(b'{"', 1)
+    while start != -1:
+        try:
+            record = json.loads(line[start:])
+        except ValueError:
+            start = line.find(b'{"', start + 1)
+            continue
+        return record if isinstance(record, dict) else None
+    return None
+
+
+PACK_FILENAME = "archive.pack"
+PACK_INDEX_FILENAME = "archive.pack.idx"
+PACK_CODECS = ["zlib", "lzma", "zstd"]
+PACK_DEFAULT_AGE_DAYS = 30  # Archive files untouched for longer are packed
+
+
+def _pack_codec(
+    codec: str,
+) -> tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    """
+    Get the compress and decompress functions of a pack codec.
+
+    Args:
+        codec: One of PACK_CODECS
+
+    Returns:
+        (compress, decompress)
+
+    Raises:
+        ValueError: If the codec is unknown or its module is not installed
+    """
+    if codec == "zlib":
+        import zlib
+
+        return functools.partial(zlib.compress, level=9), zlib.decompress
+    if codec == "lzma":
+        import lzma
+
+        return lzma.compress, lzma.decompress
+    if codec == "zstd":
+        zstandard = _import_optional("zstandard")
+        if zstandard is None:
+            raise ValueError("The zstd pack codec needs the zstandard package")
+        return (
+            zstandard.ZstdCompressor(level=19).compress,
+            zstandard.ZstdDecompressor().decompress,
+        )
+    raise ValueError(f"Unknown pack codec: {codec}")
+
+
+class ArchivePack:
+    """
+    Compressed pack of cold archive files in one category folder.
+
+    Members are compressed one by one and appended to archive.pack. The
+    sidecar index, archive.pack.idx, holds one JSON line per member with its
+    offset and length in the pack, its original size, mtime and content hash,
+    and its codec, so a single member is read back with one seek and one
+    decompression. A member packed again later replaces the earlier entry.
+
+    A torn final index line left by an interrupted append is cut off before
+    the next append, so entries are never glued onto it.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.pack_file = directory / PACK_FILENAME
+        self.index_file = directory / PACK_INDEX_FILENAME
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """Load the index, noting where its last complete entry ends."""
+        self.entries: dict[str, dict[str, Any]] = {}
+        # Size of the index up to the end of its last complete entry, and the
+        # (size, mtime) it was loaded at
+        self._valid_size = 0
+        self._state: tuple[int, int] | None = None
+
+        try:
+            with open(self.index_file, "rb") as f:
+                offset = 0
+                for line in f:
+                    offset += len(line)
+                    entry = _parse_index_line(line)
+                    if entry is None:
+                        continue
+                    self.entries[entry["name"]] = entry
+                    if line.endswith(b"\n"):
+                        self._valid_size = offset
+                index_stat = os.fstat(f.fileno())
+                self._state = (index_stat.st_size, index_stat.st_mtime_ns)
+        except FileNotFoundError:
+            pass
+
+    def refresh(self) -> None:
+        """Reload the index if it was changed by another process."""
+        try:
+            index_stat = os.stat(self.index_file)
+        except FileNotFoundError:
+            return
+        with self._lock:
+            if (index_stat.st_size, index_stat.st_mtime_ns) != self._state:
+                self._load()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def names(self) -> list[str]:
+        """Return the names of the packed files, sorted."""
+        return sorted(self.entries)
+
+    def read(self, name: str) -> bytes:
+        """
+        Read one packed file without unpacking the others.
+
+        Args:
+            name: File name of the member
+
+        Returns:
+            The file's contents
+
+        Raises:
+            KeyError: If no such file is packed
+        """
+        entry = self.entries[name]
+        _, decompress = _pack_codec(entry["codec"])
+        with open(self.pack_file, "rb") as f:
+            f.seek(entry["offset"])
+            return decompress(f.read(entry["length"]))
+
+    def add(self, file_path: Path, codec: str = "zlib") -> dict[str, Any]:
+        """
+        Compress a file into the pack and record it in the index.
+
+        The pack data is synced before its index entry is written, so an
+        interrupted append leaves at most unreferenced bytes in the pack. The
+        original file is left in place.
+
+        Args:
+            file_path: File to pack
+            codec: One of PACK_CODECS
+
+        Returns:
+            The member's index entry
+        """
+        compress, _ = _pack_codec(codec)
+        data = file_path.read_bytes()
+        file_stat = file_path.stat()
+        blob = compress(data)
+
+        with self._lock:
+            with open(self.pack_file, "ab") as f:
+                offset = f.tell()
+                f.write(blob)
+                f.flush()
+                os.fsync(f.fileno())
+
+            entry = {
+                "name": file_path.name,
+                "offset": offset,
+                "length": len(blob),
+                "size": len(data),
+                "mtime_ns": file_stat.st_mtime_ns,
+                "content_hash": hashlib.blake2b(data, digest_size=32).hexdigest(),
+                "codec": codec,
+            }
+            with open(self.index_file, "ab") as f:
+                # Cut off a torn line left by an interrupted append
+                f.truncate(self._valid_size)
+                f.write((json.dumps(entry) + "\n").encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+                index_stat = os.fstat(f.fileno())
+            self._valid_size = index_stat.st_size
+            self._state = (index_stat.st_size, index_stat.st_mtime_ns)
+            self.entries[entry["name"]] = entry
+        return entry
+
+
+_archive_packs: dict[Path, ArchivePack] = {}
+_archive_pack_lock = threading.Lock()
+
+
+def get_archive_pack(directory: Path, create: bool = False) -> ArchivePack | None:
+    """
+    Get the pack of a category folder, reloading its index only when it changes.
+
+    There is one pack per folder, so concurrent writers to a folder share its
+    lock.
+
+    Args:
+        directory: Category folder
+        create: If True, return an empty pack for a folder without one
+
+    Returns:
+        The pack, or None if the folder has no packed files and create is
+        False
+    """
+    if not create and not (directory / PACK_INDEX_FILENAME).is_file():
+        return None
+
+    with _archive_pack_lock:
+        pack = _archive_packs.get(directory)
+        if pack is None:
+            pack = _archive_packs[directory] = ArchivePack(directory)
+            return pack
+    pack.refresh()
+    return pack
+
+
+def is_packed(file_path: Path) -> bool:
+    """Check whether a file is stored in its folder's archive pack."""
+    pack = get_archive_pack(file_path.parent)
+    return pack is not None and file_path.name in pack
+
+
+def archive_file_exists(file_path: Path) -> bool:
+    """Check whether an archive file exists, loose, packed or delta-encoded."""
+    return (
+        os.path.lexists(file_path)
+        or is_packed(file_path)
+        or is_delta_encoded(file_path)
+    )
+
+
+def stored_archive_entry(file_path: Path) -> dict[str, Any] | None:
+    """
+    Get the pack or delta chain entry of an archive file that is not loose.
+
+    Args:
+        file_path: Path of the file as if it were loose
+
+    Returns:
+        The entry (with at least "size" and "content_hash"), or None if the
+        file is neither packed nor delta-encoded
+    """
+    for store in (
+        get_archive_pack(file_path.parent),
+        get_delta_store(file_path.parent),
+    ):
+        if store is not None and file_path.name in store:
+            return store.entries[file_path.name]
+    return None
+
+
+def read_archived_file(file_path: Path) -> bytes:
+    """
+    Read an archive file, whether it is loose, packed or delta-encoded.
+
+    Args:
+        file_path: Path of the file as if it were loose
+
+    Returns:
+        The file's contents
+
+    Raises:
+        FileNotFoundError: If the file is neither loose, packed nor
+            delta-encoded
+    """
+    try:
+        return file_path.read_bytes()
+    except FileNotFoundError:
+        pack = get_archive_pack(file_path.parent)
+        if pack is not None and file_path.name in pack:
+            return pack.read(file_path.name)
+        delta_store = get_delta_store(file_path.parent)
+        if delta_store is not None and file_path.name in delta_store:
+            return delta_store.read(file_path.name)
+        raise
+
+
+def archived_file_hash(file_path: Path) -> str:
+    """
+    Hash an archive file's contents, whether it is loose, packed or delta-encoded.
+
+    A packed or delta-encoded file is read back from its store, so the hash
+    checks the stored data rather than the hash recorded when it was stored.
+    """
+    if os.path.exists(file_path):
+        return compute_file_hash(file_path)
+    return hashlib.blake2b(read_archived_file(file_path), digest_size=32).hexdigest()
+
+
+def pack_cold_archive_files(
+    root_dir: Path,
+    max_age_days: float = PACK_DEFAULT_AGE_DAYS,
+    codec: str = "zlib",
+    dry_run: bool = True,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Roll cold files in the archive category folders into compressed packs.
+
+    A file is cold when it has not been modified for `max_age_days`. Each
+    category folder of each memory type gets its own pack (see ArchivePack).
+    A packed file is read back and checked against the original's content
+    hash before the original is removed. Category metadata files stay loose.
+
+    Args:
+        root_dir: Root directory of the memory bank
+        max_age_days: Age in days beyond which files are packed
+        codec: Compression codec, one of PACK_CODECS
+        dry_run: If True, only list the files that would be packed
+
+    Returns:
+        Tuple of (successful_operations, failed_operations)
+    """
+    print_header(f"{'DRY RUN: ' if dry_run else ''}PACKING COLD ARCHIVE FILES")
+
+    cutoff_ns = int((datetime.now().timestamp() - max_age_days * 86400) * 1e9)
+    successful_operations = []
+    failed_operations = []
+    scanner = DirectoryScanner()
+
+    for memory_type in MEMORY_TYPES:
+        archive_dir = root_dir / memory_type / "archive"
+        for category_dir, listing in list(scanner.walk(archive_dir, max_depth=1))[1:]:
+            cold_files = [
+                scanned.path
+                for scanned in listing.files
+                if scanned.name != ".category_info.md"
+                and (file_stat := scanned.stat()) is not None
+                and file_stat.st_mtime_ns < cutoff_ns
+            ]
+            if not cold_files:
+                continue
+
+            print_info(
+                f"{memory_type}/{category_dir.name}: {len(cold_files)} cold files"
+            )
+            pack = get_archive_pack(category_dir, create=True)
+            for file_path in cold_files:
+                operation_details = {
+                    "source": str(file_path),
+                    "destination": str(pack.pack_file),
+                    "memory_type": memory_type,
+                    "category": category_dir.name,
+                    "timestamp": datetime.now().isoformat(),
+                }
+
+                if dry_run:
+                    print_info(f"[DRY RUN] Would pack: {file_path.name}", detail=True)
+                    successful_operations.append(operation_details)
+                    continue
+
+                try:
+                    entry = pack.add(file_path, codec)
+                    packed = pack.read(file_path.name)
+                    if (
+                        hashlib.blake2b(packed, digest_size=32).hexdigest()
+                        != compute_file_hash(file_path)
+                    ):
+                        print_error(f"Verification failed for: {file_path.name}")
+                        operation_details["status"] = "failed"
+                        operation_details["reason"] = "verification_failed"
+                        failed_operations.append(operation_details)
+                        continue
+
+                    file_path.unlink()
+                    operation_details["content_hash"] = entry["content_hash"]
+                    operation_details["status"] = "success"
+                    successful_operations.append(operation_details)
+                except Exception as e:
+                    print_error(f"Error packing file {file_path.name}: {e}")
+                    operation_details["status"] = "failed"
+                    operation_details["reason"] = str(e)
+                    failed_operations.append(operation_details)
+
+            if not dry_run:
+                packed_size = pack.pack_file.stat().st_size if pack.entries else 0
+                print_success(
+                    f"Packed {memory_type}/{category_dir.name}: "
+                    f"{len(pack.entries)} files in {packed_size} bytes"
+                )
+
+    print_header(f"{'DRY RUN: ' if dry_run else ''}PACKING SUMMARY")
+    print_success(f"Successfully packed: {len(successful_operations)}")
+    if failed_operations:
+        print_error(f"Failed to pack: {len(failed_operations)}")
+
+    return (successful_operations, failed_operations)
+
+
+DELTA_FILENAME = "archive.delta"
+DELTA_DEFAULT_KEYFRAME_INTERVAL = 10  # Versions per chain between full keyframes
+
+
+def _version_key(stem: str) -> tuple[str, tuple]:
+    """Return a stem's base name and its VersionRegistry sort key."""
+    base, version = parse_version(stem)
+    return base, (version is not None, version or (0, 0))
+
+
+def _line_delta(old_lines: list[str], new_lines: list[str]) -> list[Any]:
+    """
+    Encode new lines as a delta against old lines.
+
+    Returns:
+        List of ops: [start, end] copies old_lines[start:end], and a string
+        inserts its text
+    """
+    import difflib
+
+    ops: list[Any] = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(new_lines[j1:j2]))
+    return ops
+
+
+def _apply_line_delta(old_lines: list[str], ops: list[Any]) -> list[str]:
+    """Rebuild lines from a delta made by _line_delta."""
+    new_lines: list[str] = []
+    for op in ops:
+        if isinstance(op, str):
+            new_lines.extend(op.splitlines(keepends=True))
+        else:
+            new_lines.extend(old_lines[op[0] : op[1]])
+    return new_lines
+
+
+class DeltaChainStore:
+    """
+    Delta-encoded `_vX.Y` version chains of the archive files in one folder.
+
+    archive.delta holds one JSON line per stored version. A version is stored
+    as a line diff against its predecessor (the newest stored version of the
+    same base name that is older than it), and every chain restarts with a
+    full keyframe after `keyframe_interval` versions, so reading a version
+    applies at most that many deltas. A version stored again later replaces
+    the earlier entry; deltas refer to their parent by entry id, so chains
+    through the replaced entry stay readable.
+
+    A torn final line left by an interrupted append is cut off before the
+    next append, so records are never glued onto it.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.delta_file = directory / DELTA_FILENAME
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """Load the records, noting where the last complete one ends."""
+        self.records: dict[int, dict[str, Any]] = {}
+        self.entries: dict[str, dict[str, Any]] = {}
+        # Size of the file up to the end of its last complete record, and the
+        # (size, mtime) it was loaded at
+        self._valid_size = 0
+        self._state: tuple[int, int] | None = None
+
+        try:
+            with open(self.delta_file, "rb") as f:
+                offset = 0
+                for line in f:
+                    offset += len(line)
+                    record = _parse_index_line(line)
+                    if record is None:
+                        continue
+                    self.records[record["id"]] = record
+                    self.entries[record["name"]] = record
+                    if line.endswith(b"\n"):
+                        self._valid_size = offset
+                delta_stat = os.fstat(f.fileno())
+                self._state = (delta_stat.st_size, delta_stat.st_mtime_ns)
+        except FileNotFoundError:
+            pass
+
+    def refresh(self) -> None:
+        """Reload the records if the file was changed by another process."""
+        try:
+            delta_stat = os.stat(self.delta_file)
+        except FileNotFoundError:
+            return
+        with self._lock:
+            if (delta_stat.st_size, delta_stat.st_mtime_ns) != self._state:
+                self._load()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def names(self) -> list[str]:
+        """Return the names of the stored versions, sorted."""
+        return sorted(self.entries)
+
+    def has_chain(self, base: str) -> bool:
+        """Check whether any version of a base name is stored."""
+        return any(entry["base"] == base for entry in self.entries.values())
+
+    def _lines(self, record: dict[str, Any]) -> list[str]:
+        """Rebuild a record's lines from its keyframe and the deltas after it."""
+        chain = [record]
+        while "ops" in chain[-1]:
+            chain.append(self.records[chain[-1]["parent"]])
+
+        lines = chain.pop()["text"].splitlines(keepends=True)
+        while chain:
+            lines = _apply_line_delta(lines, chain.pop()["ops"])
+        return lines
+
+    def read(self, name: str) -> bytes:
+        """
+        Reconstruct one stored version.
+
+        Args:
+            name: File name of the version
+
+        Returns:
+            The file's contents
+
+        Raises:
+            KeyError: If no such version is stored
+        """
+        text = "".join(self._lines(self.entries[name]))
+        return text.encode("utf-8", "surrogateescape")
+
+    def add(
+        self,
+        file_path: Path,
+        name: str | None = None,
+        keyframe_interval: int = DELTA_DEFAULT_KEYFRAME_INTERVAL,
+    ) -> dict[str, Any]:
+        """
+        Store a version as a delta against its predecessor, or as a keyframe.
+
+        A keyframe is stored for the first version of a chain, once the chain
+        has `keyframe_interval` versions since its last keyframe, and when the
+        delta would not be smaller than the text. The original file is left
+        in place.
+
+        Args:
+            file_path: File to store
+            name: Name to store it under (default: the file's name)
+            keyframe_interval: Maximum deltas between keyframes
+
+        Returns:
+            The version's record
+        """
+        name = name or file_path.name
+        data = file_path.read_bytes()
+        text = data.decode("utf-8", "surrogateescape")
+        base, key = _version_key(Path(name).stem)
+
+        with self._lock:
+            predecessors = [
+                (_version_key(Path(entry["name"]).stem)[1], entry)
+                for entry in self.entries.values()
+                if entry["base"] == base and entry["name"] != name
+            ]
+            predecessors = [item for item in predecessors if item[0] < key]
+            record = {
+                "id": max(self.records, default=-1) + 1,
+                "name": name,
+                "base": base,
+                "size": len(data),
+                "mtime_ns": file_path.stat().st_mtime_ns,
+                "content_hash": hashlib.blake2b(data, digest_size=32).hexdigest(),
+            }
+            if predecessors:
+                parent = max(predecessors, key=lambda item: item[0])[1]
+                if parent["depth"] + 1 < keyframe_interval:
+                    ops = _line_delta(
+                        self._lines(parent), text.splitlines(keepends=True)
+                    )
+                    if len(json.dumps(ops)) < len(json.dumps(text)):
+                        record.update(
+                            parent=parent["id"], depth=parent["depth"] + 1, ops=ops
+                        )
+            if "ops" not in record:
+                record.update(depth=0, text=text)
+
+            with open(self.delta_file, "ab") as f:
+                # Cut off a torn line left by an interrupted append
+                f.truncate(self._valid_size)
+                f.write((json.dumps(record) + "\n").encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+                delta_stat = os.fstat(f.fileno())
+            self._valid_size = delta_stat.st_size
+            self._state = (delta_stat.st_size, delta_stat.st_mtime_ns)
+            self.records[record["id"]] = record
+            self.entries[name] = record
+        return record
+
+    def add_verified(
+        self,
+        file_path: Path,
+        name: str | None = None,
+        keyframe_interval: int = DELTA_DEFAULT_KEYFRAME_INTERVAL,
+    ) -> dict[str, Any]:
+        """
+        Store a version like add(), then check that it reconstructs exactly.
+
+        Raises:
+            ValueError: If the reconstructed version does not match the file
+        """
+        record = self.add(file_path, name, keyframe_interval)
+        stored = self.read(record["name"])
+        if hashlib.blake2b(stored, digest_size=32).hexdigest() != record["content_hash"]:
+            raise ValueError(f"Delta reconstruction does not match: {record['name']}")
+        return record
+
+
+_delta_stores: dict[Path, DeltaChainStore] = {}
+_delta_store_lock = threading.Lock()
+
+
+def get_delta_store(directory: Path, create: bool = False) -> DeltaChainStore | None:
+    """
+    Get the version chains of a folder, reloading them only when they change.
+
+    There is one store per folder, so concurrent writers to a folder share
+    its lock and its record ids.
+
+    Args:
+        directory: Archive folder
+        create: If True, return an empty store for a folder without chains
+
+    Returns:
+        The store, or None if the folder has no delta-encoded versions and
+        create is False
+    """
+    if not create and not (directory / DELTA_FILENAME).is_file():
+        return None
+
+    with _delta_store_lock:
+        store = _delta_stores.get(directory)
+        if store is None:
+            store = _delta_stores[directory] = DeltaChainStore(directory)
+            return store
+    store.refresh()
+    return store
+
+
+def is_delta_encoded(file_path: Path) -> bool:
+    """Check whether a file is stored in its folder's version chains."""
+    store = get_delta_store(file_path.parent)
+    return store is not None and file_path.name in store
+
+
+def store_version_delta(
+    source: Path,
+    destination: Path,
+    keyframe_interval: int = DELTA_DEFAULT_KEYFRAME_INTERVAL,
+) -> str:
+    """
+    Store a version in the destination folder's chains instead of copying it.
+
+    The stored version is reconstructed and checked against the source's
+    content hash. A loose file at the destination (only reached with
+    force_overwrite) is removed afterwards, so reads see the stored version.
+
+    Args:
+        source: File to store
+        destination: Archive path the version is stored under
+        keyframe_interval: Maximum deltas between keyframes
+
+    Returns:
+        The content hash of the stored version
+
+    Raises:
+        ValueError: If the reconstructed version does not match the source
+    """
+    store = get_delta_store(destination.parent, create=True)
+    record = store.add_verified(source, destination.name, keyframe_interval)
+    if destination.exists():
+        destination.unlink()
+    return record["content_hash"]
+
+
+def delta_encode_archive_versions(
+    root_dir: Path,
+    keyframe_interval: int = DELTA_DEFAULT_KEYFRAME_INTERVAL,
+    dry_run: bool = True,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Convert the loose version series in the archives to delta chains.
+
+    Every archive folder (the archive directory and its category folders) is
+    searched for base names with at least one `_vX.Y` version and at least
+    two files. Their files are stored oldest first, each reconstructed and
+    checked against the original's content hash before the original is
+    removed.
+
+    Args:
+        root_dir: Root directory of the memory bank
+        keyframe_interval: Maximum deltas between keyframes
+        dry_run: If True, only list the files that would be encoded
+
+    Returns:
+        Tuple of (successful_operations, failed_operations)
+    """
+    print_header(f"{'DRY RUN: ' if dry_run else ''}DELTA-ENCODING ARCHIVED VERSIONS")
+
+    successful_operations = []
+    failed_operations = []
+    scanner = DirectoryScanner()
+
+    for memory_type in MEMORY_TYPES:
+        archive_dir = root_dir / memory_type / "archive"
+        for folder, listing in scanner.walk(archive_dir, max_depth=1):
+            registry = VersionRegistry(
+                scanned.path
+                for scanned in listing.files
+                if scanned.name not in ARCHIVE_METADATA_NAMES
+            )
+            store = get_delta_store(folder)
+            series = [
+                registry.versions(base)
+                for base in registry.bases()
+                if len(registry.versions(base)) > 1
+                or (store is not None and store.has_chain(base))
+            ]
+            series = [
+                versions
+                for versions in series
+                if any(parse_version(path.stem)[1] for path in versions)
+            ]
+            if not series:
+                continue
+
+            print_info(
+                f"{folder.relative_to(root_dir)}: "
+                f"{sum(len(versions) for versions in series)} versions"
+            )
+            store = store or get_delta_store(folder, create=True)
+            size_before = store.delta_file.stat().st_size if store.records else 0
+            loose_size = 0
+            for file_path in (path for versions in series for path in versions):
+                operation_details = {
+                    "source": str(file_path),
+                    "destination": str(store.delta_file),
+                    "memory_type": memory_type,
+                    "category": folder.name,
+                    "timestamp": datetime.now().isoformat(),
+                }
+
+                if dry_run:
+                    print_info(
+                        f"[DRY RUN] Would delta-encode: {file_path.name}", detail=True
+                    )
+                    successful_operations.append(operation_details)
+                    continue
+
+                try:
+                    record = store.add_verified(
+                        file_path, keyframe_interval=keyframe_interval
+                    )
+                    file_path.unlink()
+                    loose_size += record["size"]
+                    operation_details["content_hash"] = record["content_hash"]
+                    operation_details["status"] = "success"
+                    successful_operations.append(operation_details)
+                except Exception as e:
+                    print_error(f"Error delta-encoding file {file_path.name}: {e}")
+                    operation_details["status"] = "failed"
+                    operation_details["reason"] = str(e)
+                    failed_operations.append(operation_details)
+
+            if not dry_run and store.records:
+                added_size = store.delta_file.stat().st_size - size_before
+                print_success(
+                    f"Delta-encoded {folder.relative_to(root_dir)}: "
+                    f"{loose_size} bytes of versions stored in {added_size} bytes"
+                )
+
+    print_header(f"{'DRY RUN: ' if dry_run else ''}DELTA ENCODING SUMMARY")
+    print_success(f"Successfully delta-encoded: {len(successful_operations)}")
+    if failed_operations:
+        print_error(f"Failed to delta-encode: {len(failed_operations)}")
+
+    return (successful_operations, failed_operations)
+
+
+# storage_log.md ends with a generated table, one row per storage log entry,
+# that grows by appending rows. A begin marker of another format (or the end
+# marker of the first format's block) means the table is rendered again.
+STORAGE_LOG_BEGIN = "<!-- storage-log:begin v2 (one row per log entry) -->"
+STORAGE_LOG_MARKER = "<!-- storage-log:begin"
+STORAGE_LOG_END = "<!-- storage-log:end -->"
+STORAGE_LOG_TABLE_SEPARATOR = "|---|---|---|---|"
+
+
+class StorageLog:
+    """
+    Append-only structured storage log for an archive directory.
+
+    Entries are stored as JSON lines in storage_log.jsonl. A companion index,
+    storage_log.idx, holds one tab-separated line per entry (date, byte offset,
+    length, file count), so appends are O(1) and date queries read only the
+    matching entries. storage_log.md ends with a table of the entries, which
+    grows by one appended row per entry.
+    """
+
+    def __init__(self, log_dir: Path) -> None:
+        self.log_dir = log_dir
+        self.data_file = log_dir / "storage_log.jsonl"
+        self.index_file = log_dir / "storage_log.idx"
+        self.markdown_file = log_dir / "storage_log.md"
+
+    def append(self, entry: dict[str, Any]) -> None:
+        """
+        Append an entry to the log and its index.
+
+        Args:
+            entry: Entry with at least a "date" (YYYY-MM-DD) and "file_count"
+        """
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        with open(self.data_file, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+
+            # An index that does not end where the log does (e.g. after a
+            # crash between the two writes) is rebuilt before appending to it
+            if self._indexed_size() != offset:
+                self._rebuild_index()
+
+            f.write(line)
+        with open(self.index_file, "a", encoding="utf-8") as f:
+            f.write(f"{entry['date']}\t{offset}\t{len(line)}\t{entry['file_count']}\n")
+
+    def _indexed_size(self) -> int:
+        """Return the log size covered by the index, reading only its last line."""
+        tail = self._index_tail(1)
+        return tail[0][1] + tail[0][2] if tail else 0
+
+    def _index_tail(self, count: int) -> list[tuple[str, int, int, int]]:
+        """
+        Read the last lines of the index, reading only the end of the file.
+
+        Args:
+            count: Number of lines
+
+        Returns:
+            Up to count (date, offset, length, file_count) tuples in log order
+        """
+        if not self.index_file.exists():
+            return []
+        with open(self.index_file, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            start = max(0, size - 128 * count)
+            f.seek(start)
+            lines = f.read().splitlines()
+        if start:
+            # The first line read may start partway through an index line
+            lines = lines[1:]
+
+        tail = []
+        for line in lines[-count:]:
+            date, offset, length, file_count = line.decode("utf-8").split("\t")
+            tail.append((date, int(offset), int(length), int(file_count)))
+        return tail
+
+    def _read_index(self) -> list[tuple[str, int, int, int]]:
+        """
+        Read the index, rebuilding it if it is missing or out of date.
+
+        Returns:
+            List of (date, offset, length, file_count) tuples in log order
+        """
+        data_size = self.data_file.stat().st_size if self.data_file.exists() else 0
+        index = []
+        if self.index_file.exists():
+            with open(self.index_file, encoding="utf-8") as f:
+                for line in f:
+                    date, offset, length, file_count = line.rstrip("\n").split("\t")
+                    index.append((date, int(offset), int(length), int(file_count)))
+
+        indexed_size = index[-1][1] + index[-1][2] if index else 0
+        if indexed_size != data_size:
+            index = self._rebuild_index()
+        return index
+
+    def _rebuild_index(self) -> list[tuple[str, int, int, int]]:
+        """Rebuild the index by scanning the log once."""
+        index = []
+        if self.data_file.exists():
+            offset = 0
+            with open(self.data_file, "rb") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    index.append(
+                        (entry["date"], offset, len(line), entry.get("file_count", 0))
+                    )
+                    offset += len(line)
+
+        with open(self.index_file, "w", encoding="utf-8") as f:
+            for date, offset, length, file_count in index:
+                f.write(f"{date}\t{offset}\t{length}\t{file_count}\n")
+        return index
+
+    def _read_entries(
+        self, index_entries: list[tuple[str, int, int, int]]
+    ) -> list[dict[str, Any]]:
+        """Read the log entries at the given index positions."""
+        entries = []
+        with open(self.data_file, "rb") as f:
+            for _, offset, length, _ in index_entries:
+                f.seek(offset)
+                entries.append(json.loads(f.read(length)))
+        return entries
+
+    def query(self, date_prefix: str) -> list[dict[str, Any]]:
+        """
+        Find the entries for a day (YYYY-MM-DD), month (YYYY-MM) or year.
+
+        Args:
+            date_prefix: Date or date prefix to match
+
+        Returns:
+            Matching entries in log order
+        """
+        if not self.data_file.exists():
+            return []
+        return self._read_entries(
+            [item for item in self._read_index() if item[0].startswith(date_prefix)]
+        )
+
+    def latest(self, count: int) -> list[dict[str, Any]]:
+        """
+        Read the most recent entries.
+
+        Args:
+            count: Maximum number of entries
+
+        Returns:
+            Entries, newest first
+        """
+        if not self.data_file.exists():
+            return []
+        return self._read_entries(self._read_index()[-count:])[::-1]
+
+    def render_markdown(self) -> str:
+        """
+        Render the generated table of storage_log.md from the whole log.
+
+        Returns:
+            Markdown with the begin marker and one table row per entry
+        """
+        entries = (
+            self._read_entries(self._read_index()) if self.data_file.exists() else []
+        )
+        parts = [
+            STORAGE_LOG_BEGIN + "\n",
+            "## Organization Runs\n\n",
+            "Full details are in `storage_log.jsonl` "
+            "(query with `--query-storage-log YYYY-MM-DD`).\n\n",
+            "| Timestamp | Organization | Files | Categories |\n",
+            STORAGE_LOG_TABLE_SEPARATOR + "\n",
+        ]
+        parts.extend(format_storage_log_row(entry) for entry in entries)
+        return "".join(parts)
+
+    def update_markdown(self) -> None:
+        """
+        Add the row of the newest entry to storage_log.md.
+
+        Only the end of the file and of the log are read. The row is appended
+        if the file ends with the row of the entry before it; otherwise (the
+        file is missing, has another format, was edited below the table or
+        missed an entry in a crash) the table is rendered again.
+        """
+        tail = self._index_tail(2)
+        if not tail:
+            return
+        *previous, newest = self._read_entries(tail)
+        expected = (
+            format_storage_log_row(previous[0])
+            if previous
+            else STORAGE_LOG_TABLE_SEPARATOR + "\n"
+        )
+
+        if self.markdown_file.exists():
+            with open(self.markdown_file, "rb") as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(0, size - len(expected.encode("utf-8")) - 1))
+                ending = f.read().decode("utf-8", errors="replace")
+            if ending.endswith("\n" + expected):
+                with open(self.markdown_file, "a", encoding="utf-8") as f:
+                    f.write(format_storage_log_row(newest))
+                return
+        self.rewrite_markdown()
+
+    def rewrite_markdown(self) -> None:
+        """
+        Replace the generated table of storage_log.md with a fresh rendering.
+
+        Text before the table is kept, as is hand-written text after a block
+        in the first format; the table is placed at the end of the file.
+        """
+        if self.markdown_file.exists():
+            with open(self.markdown_file, encoding="utf-8") as f:
+                content = f.read()
+        else:
+            content = "# Storage Log\n"
+
+        begin = content.find(STORAGE_LOG_MARKER)
+        if begin != -1:
+            end = content.find(STORAGE_LOG_END, begin)
+            after = content[end + len(STORAGE_LOG_END) :] if end != -1 else ""
+            content = content[:begin] + after.lstrip("\n")
+
+        with open(self.markdown_file, "w", encoding="utf-8") as f:
+            f.write(content.rstrip("\n") + "\n\n" + self.render_markdown())
+
+
+def format_storage_log_row(entry: dict[str, Any]) -> str:
+    """
+    Render one storage log entry as a row of the storage_log.md table.
+
+    Args:
+        entry: Storage log entry
+
+    Returns:
+        Markdown table row, ending with a newline
+    """
+    categories = ", ".join(
+        f"{category} ({len(files)})" for category, files in entry["categories"].items()
+    )
+    cells = [
+        entry["timestamp"][:19].replace("T", " "),
+        entry["organization_type"],
+        str(entry["file_count"]),
+        categories,
+    ]
+    return "| " + " | ".join(cell.replace("|", "\\|") for cell in cells) + " |\n"
+
+
+def update_storage_log_with_organization(
+    ltm_dir: Path,
+    operations: list[dict[str, Any]],
+    organization_type: str = "reorganization",
+) -> bool:
+    """
+    Update storage log with details of organizational changes.
+
+    The entry is appended to storage_log.jsonl, and its row to the table at
+    the end of storage_log.md.
+
+    Args:
+        ltm_dir: Path to the long-term memory directory
+        operations: List of successful operations
+        organization_type: Type of organization performed
+
+    Returns:
+        True if log was updated successfully, False otherwise
+    """
+    if not operations:
+        return False
+
+    storage_log = StorageLog(ltm_dir)
+    return (
+        safe_file_operation(
+            _update_storage_log_content,
+            storage_log.data_file,
+            "Error updating storage log",
+            storage_log,
+            operations,
+            organization_type,
+        )
+        is not None
+    )
+
+
+def _update_storage_log_content(
+    storage_log: StorageLog, operations: list[dict[str, Any]], organization_type: str
+) -> bool:
+    """
+    Internal function to update storage log content - separated to use with safe_file_operation.
+    """
+    now = datetime.now()
+
+    categorized_files: dict[str, list[str]] = {}
+    for op in operations:
+        category = op.get("category", "unknown")
+        categorized_files.setdefault(category, []).append(Path(op["source"]).name)
+
+    storage_log.append(
+        {
+            "date": now.strftime("%Y-%m-%d"),
+            "timestamp": now.isoformat(),
+            "organization_type": organization_type,
+            "file_count": len(operations),
+            "categories": categorized_files,
+        }
+    )
+
+    storage_log.update_markdown()
+    print_success("Updated storage log with organization details")
+    return True
+
+
+def safe_copy_file(
+    source: Path,
+    destination: Path,
+    dry_run: bool = False,
+    force_overwrite: bool = False,
+    copy_info: dict[str, Any] | None = None,
+) -> bool:
+    """
+    Safely copy a file without overwriting existing files unless force_overwrite is True.
+
+    Args:
+        source: Source file path
+        destination: Destination file path
+        dry_run: If True, only simulate operations
+        force_overwrite: If True, allow overwriting of existing destination files
+        copy_info: If given, receives the "copy_backend" used and, when known
+            without re-reading the source, the "content_hash" of the copied data
+
+    Returns:
+        True if copy successful or simulated, False otherwise
+    """
+    # Check if source exists
+    if not source.exists():
+        error_msg = f"Source file does not exist: {source}"
+        print_error(error_msg)
+        return False
+
+    # Check if destination already exists, loose or packed (never overwrite
+    # unless force_overwrite is True)
+    if archive_file_exists(destination):
+        if not force_overwrite:
+            error_msg = (
+                f"Destination file already exists, will not overwrite: {destination}"
+            )
+            print_error(error_msg)
+            return False
+        else:
+            warning_msg = f"Destination file exists, will overwrite: {destination}"
+            print_warning(warning_msg)
+
+    # Ensure parent directory exists
+    ensure_directory_exists(destination.parent)
+
+    # Hardlink instead of copying when fast moves are enabled and possible
+    link = fast_move_enabled and _is_same_device(source, destination.parent)
+
+    # Store versions in the destination folder's delta chains in delta mode
+    delta = delta_versions_enabled and _joins_version_chain(source, destination)
+
+    # Perform the copy or simulate it
+    if dry_run:
+        action = "overwrite" if destination.exists() and force_overwrite else "copy"
+        if link:
+            action = "link" if action == "copy" else "overwrite (hardlink)"
+        elif delta:
+            action = "delta-encode" if action == "copy" else "overwrite (delta)"
+        print_info(
+            f"[DRY RUN] Would {action}: {source} → {destination}", detail=True
+        )
+        return True
+    else:
+        copy_result = _try_link(source, destination) if link else None
+        if copy_result is None and delta:
+            copy_result = safe_operation(
+                _perform_delta_store,
+                f"Error delta-encoding file from {source} to {destination}",
+                source,
+                destination,
+            )
+            if copy_result is None:
+                return False
+        if copy_result is None and dedupe_enabled:
+            copy_result = _link_from_blob_store(source, destination)
+        if copy_result is None:
+            copy_result = safe_operation(
+                _perform_copy,
+                f"Error copying file from {source} to {destination}",
+                source,
+                destination,
+            )
+            if copy_result is not None and dedupe_enabled:
+                _add_to_blob_store(destination, copy_result.get("content_hash"))
+        if copy_result is None:
+            return False
+
+        if copy_info is not None:
+            copy_info.update(copy_result)
+        return True
+
+
+# When enabled, archive moves within one filesystem hardlink the source into
+# the archive instead of copying it, and the original is unlinked afterwards
+fast_move_enabled = False
+
+# When enabled, archive copies are stored once in the blob store, and copies
+# of content that is already stored become links to its blob
+dedupe_enabled = False
+
+# When enabled, archived `_vX.Y` versions are stored as line diffs against
+# their predecessor in the destination folder's delta chains
+delta_versions_enabled = False
+delta_keyframe_interval = DELTA_DEFAULT_KEYFRAME_INTERVAL
+
+
+def _joins_version_chain(source: Path, destination: Path) -> bool:
+    """
+    Check whether an archive move should be stored in a delta chain.
+
+    Versioned files always are; an unversioned file is when its folder
+    already has a chain for its base name.
+    """
+    base, version = parse_version(destination.stem)
+    if destination.suffix != ".md" or destination.name in ARCHIVE_METADATA_NAMES:
+        return False
+    if version is not None:
+        return True
+    store = get_delta_store(destination.parent)
+    return store is not None and store.has_chain(base)
+
+
+def _perform_delta_store(source: Path, destination: Path) -> dict[str, Any]:
+    """Internal function to store an archive move in a delta chain."""
+    content_hash = store_version_delta(source, destination, delta_keyframe_interval)
+
+    catalog = get_catalog()
+    if catalog is not None:
+        catalog.record_hash(source, content_hash)
+    with _copy_backend_lock:
+        copy_backend_counts["delta"] = copy_backend_counts.get("delta", 0) + 1
+
+    success_msg = f"Successfully delta-encoded: {source} → {destination}"
+    print_success(success_msg, detail=True)
+    return {"copy_backend": "delta", "content_hash": content_hash}
+
+
+def _is_same_device(source: Path, destination_dir: Path) -> bool:
+    """Check whether a file and a directory live on the same filesystem."""
+    try:
+        return os.stat(source).st_dev == os.stat(destination_dir).st_dev
+    except OSError:
+        return False
+
+
+def _is_same_file(first: Path, second: Path) -> bool:
+    """Check whether two paths are links to the same inode."""
+    try:
+        first_stat = os.stat(first)
+        second_stat = os.stat(second)
+    except OSError:
+        return False
+    return (first_stat.st_dev, first_stat.st_ino) == (
+        second_stat.st_dev,
+        second_stat.st_ino,
+    )
+
+
+def _try_link(source: Path, destination: Path) -> dict[str, Any] | None:
+    """
+    Internal function to hardlink a file into its archive location.
+
+    An existing destination (only reached with force_overwrite) is replaced
+    atomically. Returns None if the filesystem refuses the link, so the
+    caller can fall back to a copy.
+    """
+    temp_link = destination.with_name(f".{destination.name}.link")
+    try:
+        os.link(source, temp_link)
+        os.replace(temp_link, destination)
+    except OSError as e:
+        logger.info(f"Hardlink not possible, copying instead: {source} ({e})")
+        try:
+            temp_link.unlink()
+        except OSError:
+            pass
+        return None
+
+    if not _is_same_file(source, destination):
+        logger.warning(f"Hardlink verification failed, copying instead: {destination}")
+        return None
+
+    success_msg = f"Successfully linked: {source} → {destination}"
+    print_success(success_msg, detail=True)
+    return {"copy_backend": "hardlink", "linked": True}
+
+
+def _perform_copy(source: Path, destination: Path) -> dict[str, Any]:
+    """Internal function to perform file copy operation."""
+    backend, content_hash = copy_file_data(source, destination)
+
+    catalog = get_catalog()
+    if catalog is not None:
+        if content_hash is None:
+            # Zero-copy backends never see the data; reuse a recorded hash if any
+            content_hash = catalog.known_hash(source)
+        else:
+            catalog.record_hash(source, content_hash)
+        if content_hash is not None:
+            catalog.record_hash(destination, content_hash)
+
+    success_msg = f"Successfully copied ({backend}): {source} → {destination}"
+    print_success(success_msg, detail=True)
+
+    copy_result: dict[str, Any] = {"copy_backend": backend}
+    if content_hash is not None:
+        copy_result["content_hash"] = content_hash
+    return copy_result
+
+
+BLOB_STORE_DIRNAME = ".blobs"
+
+
+class BlobStore:
+    """
+    Content-addressed store of archived file contents under the bank root.
+
+    Each distinct content is kept once, as `.blobs/<hh>/<hash>` (the BLAKE2b
+    content hash, sharded by its first two hex digits), and archive entries
+    with that content are hardlinks to the blob. Blobs are made read-only,
+    since every entry linked to a blob shares its inode. A blob whose only
+    remaining link is the store itself is no longer referenced.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def blob_path(self, content_hash: str) -> Path:
+        """Return the path of the blob for a content hash."""
+        return self.root / content_hash[:2] / content_hash
+
+    def link(self, content_hash: str, destination: Path) -> bool:
+        """
+        Hardlink an existing blob to a destination, replacing it atomically.
+
+        Args:
+            content_hash: Content hash of the blob
+            destination: Path to link the blob to
+
+        Returns:
+            True if linked, False if there is no blob for the hash
+
+        Raises:
+            OSError: If the link cannot be created (e.g. across filesystems)
+        """
+        blob = self.blob_path(content_hash)
+        temp_link = destination.with_name(f".{destination.name}.blob")
+        try:
+            os.link(blob, temp_link)
+        except FileNotFoundError:
+            if blob.exists():
+                raise
+            return False
+        try:
+            os.replace(temp_link, destination)
+        except OSError:
+            temp_link.unlink(missing_ok=True)
+            raise
+        return True
+
+    def add(self, file_path: Path, content_hash: str) -> bool:
+        """
+        Store a file's content, sharing one inode with the blob.
+
+        A file whose content is not stored yet becomes the blob. A file whose
+        content is already stored is replaced by a link to the blob, after
+        the blob's content has been checked against the hash.
+
+        Args:
+            file_path: File to store
+            content_hash: Content hash of the file
+
+        Returns:
+            True if the file was replaced by a link to an existing blob,
+            False if it became the blob or already was linked to it
+
+        Raises:
+            OSError: If the file cannot be linked (e.g. across filesystems)
+            ValueError: If the stored blob does not match its hash
+        """
+        import stat
+
+        blob = self.blob_path(content_hash)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(file_path, blob)
+        except FileExistsError:
+            pass
+        else:
+            os.chmod(blob, stat.S_IMODE(os.stat(blob).st_mode) & ~0o222)
+            return False
+
+        if _is_same_file(file_path, blob):
+            return False
+        if compute_file_hash(blob) != content_hash:
+            raise ValueError(f"Blob does not match its content hash: {blob}")
+        self.link(content_hash, file_path)
+        return True
+
+    def prune(self) -> int:
+        """
+        Remove blobs that no archive entry links to any more.
+
+        Returns:
+            Number of blobs removed
+        """
+        removed = 0
+        with os.scandir(self.root) as shards:
+            shard_paths = [shard.path for shard in shards if shard.is_dir()]
+        for shard_path in shard_paths:
+            with os.scandir(shard_path) as blobs:
+                for blob in blobs:
+                    if blob.is_file() and blob.stat().st_nlink == 1:
+                        os.unlink(blob.path)
+                        removed += 1
+        return removed
+
+
+def get_blob_store(root_dir: Path | None = None) -> BlobStore:
+    """Get the blob store of a memory bank (by default, the current one)."""
+    return BlobStore((root_dir or memory_bank_root) / BLOB_STORE_DIRNAME)
+
+
+def _link_from_blob_store(source: Path, destination: Path) -> dict[str, Any] | None:
+    """
+    Internal function to archive a file as a link to its stored content.
+
+    Returns None if the content is not stored yet or cannot be linked, so the
+    caller can fall back to a copy.
+    """
+    catalog = get_catalog()
+    content_hash = (
+        catalog.file_hash(source) if catalog is not None else compute_file_hash(source)
+    )
+    try:
+        if not get_blob_store().link(content_hash, destination):
+            return None
+    except OSError as e:
+        logger.info(f"Blob link not possible, copying instead: {source} ({e})")
+        return None
+
+    if catalog is not None:
+        catalog.record_hash(destination, content_hash)
+    with _copy_backend_lock:
+        copy_backend_counts["blob"] = copy_backend_counts.get("blob", 0) + 1
+    success_msg = f"Successfully linked stored content: {source} → {destination}"
+    print_success(success_msg, detail=True)
+    return {"copy_backend": "blob", "content_hash": content_hash}
+
+
+def _add_to_blob_store(destination: Path, content_hash: str | None) -> None:
+    """Internal function to store a freshly copied archive file's content."""
+    try:
+        if content_hash is None:
+            content_hash = compute_file_hash(destination)
+        get_blob_store().add(destination, content_hash)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not add {destination} to the blob store: {e}")
+
+
+def dedupe_archive(root_dir: Path, dry_run: bool = True) -> dict[str, int]:
+    """
+    Convert the archive directories to links into the blob store.
+
+    Every archived markdown file (except metadata files rewritten in place)
+    is hashed. The first file with a given content becomes its blob; later
+    files with the same content are replaced by links to it. Blobs left with
+    no archive entry are removed afterwards.
+
+    Args:
+        root_dir: Root directory of the memory bank
+        dry_run: If True, only count what would be linked and reclaimed
+
+    Returns:
+        Dict with the number of "files" examined, duplicates "linked",
+        "bytes_reclaimed", "failed" files and "blobs_pruned"
+    """
+    print_header(f"{'DRY RUN: ' if dry_run else ''}DEDUPLICATING ARCHIVED FILES")
+
+    store = get_blob_store(root_dir)
+    catalog = get_catalog()
+    stats = {
+        "files": 0,
+        "linked": 0,
+        "bytes_reclaimed": 0,
+        "failed": 0,
+        "blobs_pruned": 0,
+    }
+    # Inode holding each content seen so far, to tell duplicates apart from
+    # files that are already links to their blob
+    content_inodes: dict[str, tuple[int, int]] = {}
+    scanner = DirectoryScanner()
+
+    for memory_type in MEMORY_TYPES:
+        archive_dir = root_dir / memory_type / "archive"
+        for _, listing in scanner.walk(archive_dir):
+            for scanned in listing.files:
+                file_stat = scanned.stat()
+                if scanned.name in ARCHIVE_METADATA_NAMES or file_stat is None:
+                    continue
+                stats["files"] += 1
+                file_path = scanned.path
+                inode = (file_stat.st_dev, file_stat.st_ino)
+
+                try:
+                    content_hash = (
+                        catalog.file_hash(file_path)
+                        if catalog is not None
+                        else compute_file_hash(file_path)
+                    )
+                    stored = content_inodes.get(content_hash)
+                    if stored is None:
+                        blob = store.blob_path(content_hash)
+                        if blob.exists():
+                            blob_stat = blob.stat()
+                            stored = (blob_stat.st_dev, blob_stat.st_ino)
+                    if stored == inode:
+                        continue
+                    if stored is None:
+                        # First copy of this content: it becomes the blob
+                        content_inodes[content_hash] = inode
+                        if not dry_run:
+                            store.add(file_path, content_hash)
+                        continue
+
+                    if not dry_run:
+                        store.add(file_path, content_hash)
+                        if catalog is not None:
+                            catalog.record_hash(file_path, content_hash)
+                    stats["linked"] += 1
+                    if file_stat.st_nlink == 1:
+                        stats["bytes_reclaimed"] += file_stat.st_size
+                    if dry_run:
+                        print_info(
+                            f"[DRY RUN] Would link duplicate: {file_path}", detail=True
+                        )
+                except (OSError, ValueError) as e:
+                    print_error(f"Error deduplicating {file_path}: {e}")
+                    stats["failed"] += 1
+
+    if not dry_run and store.root.exists():
+        stats["blobs_pruned"] = store.prune()
+
+    print_header(f"{'DRY RUN: ' if dry_run else ''}DEDUPLICATION SUMMARY")
+    print_info(f"Archived files examined: {stats['files']}")
+    print_success(
+        f"{'Would link' if dry_run else 'Linked'} {stats['linked']} duplicates, "
+        f"reclaiming {stats['bytes_reclaimed']} bytes"
+    )
+    if stats["blobs_pruned"]:
+        print_info(f"Removed {stats['blobs_pruned']} unreferenced blobs")
+    if stats["failed"]:
+        print_error(f"Failed to deduplicate: {stats['failed']}")
+    return stats
+
+
+RECYCLE_BATCH_SIZE = 1000  # Files handed to the recycle backend per call
+
+
+class RecycleBackend(ABC):
+    """
+    Interface for moving batches of files to the platform's trash.
+
+    Backends move many files per call, so callers should collect the files
+    of a run and recycle them together rather than one at a time.
+    """
+
+    name = "none"
+
+    @abstractmethod
+    def recycle(self, paths: list[Path]) -> list[str | None]:
+        """
+        Move files to the trash.
+
+        Args:
+            paths: Existing files to recycle
+
+        Returns:
+            For each path, None if it was recycled, otherwise an error message
+        """
+
+
+class FreedesktopTrash(RecycleBackend):
+    """
+    Trash backend implementing the freedesktop.org Trash specification.
+
+    Files on the same filesystem as the home trash
+    ($XDG_DATA_HOME/Trash) go there. Files on other mounts go to the mount's
+    $topdir/.Trash/$uid (if an administrator set up a sticky $topdir/.Trash)
+    or $topdir/.Trash-$uid. Each file is moved with a single rename next to
+    an info/NAME.trashinfo record. The trash directories are fsynced once
+    per batch, not once per file.
+    """
+
+    name = "freedesktop"
+
+    def __init__(self) -> None:
+        self.uid = os.getuid()
+        data_home = os.environ.get("XDG_DATA_HOME") or str(
+            Path.home() / ".local" / "share"
+        )
+        self.home_trash = Path(data_home) / "Trash"
+        self._trash_by_device: dict[int, tuple[Path, Path | None]] = {}
+
+    def recycle(self, paths: list[Path]) -> list[str | None]:
+        """Move files to the trash of their filesystem."""
+        errors: list[str | None] = [None] * len(paths)
+
+        # Group files by the trash directory that serves their filesystem
+        groups: dict[Path, list[int]] = {}
+        topdirs: dict[Path, Path | None] = {}
+        for i, path in enumerate(paths):
+            try:
+                trash_dir, topdir = self._trash_for(path)
+            except OSError as e:
+                errors[i] = f"No usable trash directory for {path}: {e}"
+                continue
+            groups.setdefault(trash_dir, []).append(i)
+            topdirs[trash_dir] = topdir
+
+        for trash_dir, indices in groups.items():
+            self._recycle_into(trash_dir, topdirs[trash_dir], paths, indices, errors)
+
+        return errors
+
+    def _trash_for(self, path: Path) -> tuple[Path, Path | None]:
+        """
+        Find the trash directory for a file.
+
+        Returns:
+            Tuple of (trash directory, mount top directory or None for the home trash)
+        """
+        device = os.lstat(path).st_dev
+        if device in self._trash_by_device:
+            return self._trash_by_device[device]
+
+        self._ensure_trash_dir(self.home_trash)
+        if os.stat(self.home_trash).st_dev == device:
+            trash = (self.home_trash, None)
+        else:
+            topdir = self._mount_point(path)
+            admin_trash = topdir / ".Trash"
+            admin_stat = os.lstat(admin_trash) if admin_trash.exists() else None
+            if (
+                admin_stat is not None
+                and not os.path.islink(admin_trash)
+                and os.path.isdir(admin_trash)
+                and admin_stat.st_mode & 0o1000  # sticky bit
+            ):
+                trash_dir = admin_trash / str(self.uid)
+            else:
+                trash_dir = topdir / f".Trash-{self.uid}"
+            self._ensure_trash_dir(trash_dir)
+            trash = (trash_dir, topdir)
+
+        self._trash_by_device[device] = trash
+        return trash
+
+    @staticmethod
+    def _ensure_trash_dir(trash_dir: Path) -> None:
+        """Create a trash directory with its files/ and info/ subdirectories."""
+        for directory in (trash_dir, trash_dir / "files", trash_dir / "info"):
+            if not directory.is_dir():
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    @staticmethod
+    def _mount_point(path: Path) -> Path:
+        """Find the top directory of the filesystem a file lives on."""
+        current = Path(os.path.abspath(path)).parent
+        device = os.lstat(current).st_dev
+        while current.parent != current and os.lstat(current.parent).st_dev == device:
+            current = current.parent
+        return current
+
+    def _recycle_into(
+        self,
+        trash_dir: Path,
+        topdir: Path | None,
+        paths: list[Path],
+        indices: list[int],
+        errors: list[str | None],
+    ) -> None:
+        """Move a group of files into one trash directory."""
+        from urllib.parse import quote
+
+        files_dir = trash_dir / "files"
+        info_dir = trash_dir / "info"
+        taken = set(os.listdir(files_dir)) | {
+            name[: -len(".trashinfo")]
+            for name in os.listdir(info_dir)
+            if name.endswith(".trashinfo")
+        }
+        deletion_date = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+
+        for i in indices:
+            path = Path(os.path.abspath(paths[i]))
+            original = str(path.relative_to(topdir)) if topdir else str(path)
+            info = (
+                "[Trash Info]\n"
+                f"Path={quote(original)}\n"
+                f"DeletionDate={deletion_date}\n"
+            ).encode()
+
+            try:
+                name, info_path = self._create_info_file(info_dir, path, taken, info)
+            except OSError as e:
+                errors[i] = f"Error writing trash info for {path}: {e}"
+                continue
+
+            try:
+                os.rename(path, files_dir / name)
+            except OSError as e:
+                # A failed cleanup leaves an orphaned info record, which is
+                # harmless; the rename error is the one to report
+                with contextlib.suppress(OSError):
+                    os.unlink(info_path)
+                errors[i] = f"Error moving {path} to trash: {e}"
+
+        # One fsync per directory for the whole batch
+        for directory in (info_dir, files_dir):
+            fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    @staticmethod
+    def _create_info_file(
+        info_dir: Path, path: Path, taken: set[str], info: bytes
+    ) -> tuple[str, Path]:
+        """
+        Reserve a unique trash name for a file by creating its info record.
+
+        Returns:
+            Tuple of (trash name, info file path)
+        """
+        counter = 1
+        name = path.name
+        while True:
+            if name not in taken:
+                info_path = info_dir / f"{name}.trashinfo"
+                try:
+                    fd = os.open(info_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                except FileExistsError:
+                    pass
+                else:
+                    try:
+                        os.write(fd, info)
+                    finally:
+                        os.close(fd)
+                    taken.add(name)
+                    return name, info_path
+            counter += 1
+            name = f"{path.stem}.{counter}{path.suffix}"
+
+
+class WindowsRecycleBin(RecycleBackend):
+    """Recycle backend using a single SHFileOperationW call per batch."""
+
+    name = "windows"
+
+    def recycle(self, paths: list[Path]) -> list[str | None]:
+        """Move files to the Windows recycle bin."""
+        import ctypes
+
+        # Windows API constants
+        fof_silent = 0x0004
+        fof_noconfirmation = 0x0010
+        fof_allowundo = 0x0040
+        fof_noerrorui = 0x0400
+
+        flags = fof_allowundo | fof_noconfirmation | fof_noerrorui | fof_silent
+
+        # SHFileOperation takes a list of null-separated paths, terminated by
+        # a double null
+        path_list = "\0".join(str(path.absolute()) for path in paths) + "\0\0"
+        path_buffer = ctypes.create_unicode_buffer(path_list, len(path_list))
+
+        # Create a SHFILEOPSTRUCT structure
+        class SHFILEOPSTRUCT(ctypes.Structure):
+            _fields_ = [
+                ("hwnd", ctypes.c_void_p),
+                ("wFunc", ctypes.c_uint),
+                ("pFrom", ctypes.c_wchar_p),
+                ("pTo", ctypes.c_wchar_p),
+                ("fFlags", ctypes.c_int),
+                ("fAnyOperationsAborted", ctypes.c_bool),
+                ("hNameMappings", ctypes.c_void_p),
+                ("lpszProgressTitle", ctypes.c_wchar_p),
+            ]
+
+        # FO_DELETE = 3
+        file_op = SHFILEOPSTRUCT()
+        file_op.wFunc = 3  # FO_DELETE
+        file_op.pFrom = ctypes.cast(path_buffer, ctypes.c_wchar_p)
+        file_op.fFlags = flags
+
+        # Perform the operation
+        shell32 = ctypes.windll.shell32
+        result = shell32.SHFileOperationW(ctypes.byref(file_op))
+
+        # The call succeeds or fails as a whole; report files still in place
+        return [
+            f"Error moving to recycle bin, error code: {result}"
+            if path.exists()
+            else None
+            for path in paths
+        ]
+
+
+_recycle_backend: RecycleBackend | None = None
+
+
+def get_recycle_backend() -> RecycleBackend | None:
+    """
+    Get the recycle backend for this platform.
+
+    Returns:
+        The backend, or None if the platform has no supported trash
+    """
+    global _recycle_backend
+
+    if _recycle_backend is None:
+        if sys.platform == "win32":
+            _recycle_backend = WindowsRecycleBin()
+        elif sys.platform != "darwin" and hasattr(os, "getuid"):
+            _recycle_backend = FreedesktopTrash()
+    return _recycle_backend
+
+
+def send_to_recycle_bin(file_path: Path, dry_run: bool = False) -> bool:
+    """
+    Move a file to the recycle bin instead of permanently deleting it.
+
+    Args:
+        file_path: Path to the file to be moved to recycle bin
+        dry_run: If True, only simulate operations
+
+    Returns:
+        True if successful or simulated, False otherwise
+    """
+    return send_files_to_recycle_bin([file_path], dry_run)[0]
+
+
+def send_files_to_recycle_bin(
+    file_paths: list[Path], dry_run: bool = False
+) -> list[bool]:
+    """
+    Move files to the recycle bin in batches.
+
+    Uses the Windows recycle bin or the freedesktop.org trash, handing the
+    backend up to RECYCLE_BATCH_SIZE files per call.
+
+    Args:
+        file_paths: Paths of the files to be moved to recycle bin
+        dry_run: If True, only simulate operations
+
+    Returns:
+        Success flag for each file (True if recycled or simulated)
+    """
+    results = [True] * len(file_paths)
+    pending = []
+
+    for i, file_path in enumerate(file_paths):
+        if not file_path.exists():
+            error_msg = f"File does not exist, cannot move to recycle bin: {file_path}"
+            print_error(error_msg)
+            results[i] = False
+        elif dry_run:
+            print_info(f"[DRY RUN] Would move to recycle bin: {file_path}", detail=True)
+        else:
+            pending.append(i)
+
+    if not pending:
+        return results
+
+    backend = get_recycle_backend()
+    if backend is None:
+        # Platforms without a supported trash (fallback to just reporting)
+        for i in pending:
+            warning_msg = f"Recycle bin operation not supported on this platform. Would delete: {file_paths[i]}"
+            print_warning(warning_msg)
+        return results
+
+    for start in range(0, len(pending), RECYCLE_BATCH_SIZE):
+        batch = pending[start : start + RECYCLE_BATCH_SIZE]
+        errors = safe_operation(
+            backend.recycle,
+            "Error moving files to recycle bin",
+            [file_paths[i] for i in batch],
+        )
+        if errors is None:
+            errors = ["Recycle backend failed"] * len(batch)
+
+        for i, error in zip(batch, errors):
+            if error is None:
+                success_msg = f"Successfully moved to recycle bin: {file_paths[i]}"
+                print_success(success_msg, detail=True)
+            else:
+                print_error(error)
+                results[i] = False
+
+    update_search_index(file_paths[i] for i in pending if results[i])
+    return results
+
+
+def load_config(config_path: Path) -> dict[str, Any]:
+    """
+    Load and validate the configuration file.
+
+    Args:
+        config_path: Path to the JSON configuration file
+
+    Returns:
+        Parsed configuration dictionary
+    """
+    print_info(f"Loading configuration from: {config_path}")
+
+    if not config_path.exists():
+        error_msg = f"Configuration file does not exist: {config_path}"
+        print_error(error_msg)
+        sys.exit(1)
+
+    config = safe_file_operation(
+        _load_and_validate_config,
+        config_path,
+        "Error loading configuration",
+        config_path,
+    )
+
+    if config is None:
+        sys.exit(1)
+
+    return config
+
+
+def read_config_option(config_path: Path, option: str, default: Any = None) -> Any:
+    """
+    Read a single entry from the config file's "options" without validating it.
+
+    Args:
+        config_path: Path to the JSON configuration file
+        option: Option name
+        default: Value returned if the file or option is missing
+
+    Returns:
+        The option value or the default
+    """
+    try:
+        with open(config_path, encoding="utf-8") as f:
+            return json.load(f).get("options", {}).get(option, default)
+    except (OSError, ValueError, AttributeError):
+        return default
+
+
+def _load_and_validate_config(config_path: Path) -> dict[str, Any]:
+    """Internal function to load and validate config file."""
+    with open(config_path, encoding="utf-8") as f:
+        config = json.load(f)
+
+    # Basic validation
+    if "operations" not in config:
+        error_msg = "Configuration must contain 'operations' key"
+        print_error(error_msg)
+        sys.exit(1)
+
+    print_success(
+        f"Successfully loaded configuration with {len(config['operations'])} operations"
+    )
+    return config
+
+
+def _resolve_destination(
+    operation: dict[str, Any],
+    source_path: Path,
+    dest_folder: Path,
+    organize_by_category: bool,
+    category_detection: str = "smart",
+    create_folders: bool = True,
+) -> tuple[Path, str | None]:
+    """
+    Work out where an operation's source file should end up.
+
+    Args:
+        operation: Operation configuration dictionary
+        source_path: Resolved source path
+        dest_folder: Resolved destination folder
+        organize_by_category: If True, organize files into category folders
+        category_detection: Method for detecting file categories
+        create_folders: If True, create the category folder structure
+
+    Returns:
+        Tuple of (destination path, category or None)
+    """
+    if organize_by_category and operation.get("operation_type") == "move":
+        # Determine appropriate category based on file content/name
+        category = operation.get("category") or determine_file_category(
+            source_path, category_detection
+        )
+        if create_folders:
+            category_folder = create_category_folder_structure(dest_folder, category)
+        else:
+            category_folder = dest_folder / category
+        return category_folder / source_path.name, category
+
+    return dest_folder / source_path.name, None
+
+
+def _find_versioned_files(
+    source_path: Path,
+    memory_type: str,
+    root_dir: Path,
+) -> list[Path]:
+    """
+    Find the active versions of an operation's source file.
+
+    Lookups share the directories' version registries (see
+    get_version_registry), so an active directory is not rescanned for each
+    operation.
+
+    Args:
+        source_path: Resolved source path
+        memory_type: Memory type of the file
+        root_dir: Root directory of the memory bank
+
+    Returns:
+        List of versioned files (and the unversioned file) in active
+        directories, oldest version first
+    """
+    search_base, _ = parse_version(source_path.stem)
+
+    # For BIG BRAIN Memory Bank, check for newer versions in active directories
+    # Depending on memory type, look in the appropriate active directory
+    if memory_type in MEMORY_TYPES:
+        search_paths = [root_dir / memory_type / "active"]
+    else:
+        # Fallback: search all active directories
+        search_paths = [root_dir / t / "active" for t in MEMORY_TYPES]
+
+    # Check each search path for versioned files
+    versioned_files = []
+    for search_path in search_paths:
+        versioned_files.extend(get_version_registry(search_path).versions(search_base))
+
+    return versioned_files
+
+
+def process_operation(
+    operation: dict[str, str],
+    dry_run: bool,
+    root_dir: Path,
+    force_overwrite: bool = False,
+    organize_by_category: bool = False,
+) -> bool:
+    """
+    Process a single file operation.
+
+    Operations from a compiled plan (see compile_plan) carry their resolved
+    paths, category and versioned files, which are used as they are.
+
+    Args:
+        operation: Operation configuration dictionary
+        dry_run: If True, only simulate operations
+        root_dir: Root directory for resolving relative paths (memory-bank folder)
+        force_overwrite: If True, allow overwriting of existing destination files
+        organize_by_category: If True, organize files into category folders
+
+    Returns:
+        True if operation successful or simulated, False otherwise
+    """
+    if "destination_path" in operation:
+        source_path = Path(operation["source_path"])
+        destination_path = Path(operation["destination_path"])
+        if operation.get("category") and not dry_run:
+            create_category_folder_structure(
+                root_dir / operation["destination_folder"], operation["category"]
+            )
+        versioned_files = [Path(p) for p in operation.get("versioned_files", [])]
+    else:
+        # Get paths and resolve them relative to the memory-bank root directory
+        source_path = root_dir / operation["source"]
+        dest_folder = root_dir / operation["destination_folder"]
+
+        # Get memory type from operation or determine it
+        memory_type = operation.get("memory_type", determine_memory_type(source_path))
+
+        destination_path, _ = _resolve_destination(
+            operation, source_path, dest_folder, organize_by_category
+        )
+        versioned_files = _find_versioned_files(source_path, memory_type, root_dir)
+
+    filename = source_path.name
+
+    # Log operation details
+    if dry_run:
+        print_header(f"DRY RUN: Processing operation for {filename}", detail=True)
+    else:
+        print_header(f"Processing operation for {filename}", detail=True)
+
+    print_info(f"Source: {source_path}", detail=True)
+    print_info(f"Destination: {destination_path}", detail=True)
+
+    if not versioned_files:
+        print_warning(
+            f"No versioned file found for {filename}. Make sure to create a new version before moving the original."
+        )
+    else:
+        print_info(
+            f"Found versioned file(s): {', '.join(f.name for f in versioned_files)}",
+            detail=True,
+        )
+
+    # Execute file copy, recording the content hash for verification
+    copy_info: dict[str, Any] = {}
+    success = safe_copy_file(
+        source_path, destination_path, dry_run, force_overwrite, copy_info
+    )
+    operation.update(copy_info)
+    if copy_info:
+        operation["destination"] = str(destination_path)
+    return success
+
+
+def verify_operation(operation: dict[str, str], root_dir: Path) -> bool:
+    """
+    Verify that a file operation was completed successfully.
+
+    Args:
+        operation: Operation configuration dictionary
+        root_dir: Root directory for resolving relative paths
+
+    Returns:
+        True if verification passed, False otherwise
+    """
+    source_path = root_dir / operation["source"]
+    dest_folder = root_dir / operation["destination_folder"]
+    filename = source_path.name
+
+    # Compiled plan entries carry their resolved destination; otherwise check
+    # if this is an organized operation with a category
+    if "destination_path" in operation:
+        destination_path = Path(operation["destination_path"])
+    elif operation.get("category"):
+        category_folder = dest_folder / operation["category"]
+        destination_path = category_folder / filename
+    else:
+        destination_path = dest_folder / filename
+
+    # An archive entry may be stored in a delta chain, or have been packed
+    # since it was copied
+    stored_entry = (
+        stored_archive_entry(destination_path)
+        if not destination_path.exists()
+        else None
+    )
+    if stored_entry is None and not destination_path.exists():
+        print_error(f"Verification failed: {destination_path} does not exist")
+        return False
+
+    # A hardlinked archive entry is verified by inode identity
+    if operation.get("linked") and stored_entry is None:
+        if source_path.exists() and not _is_same_file(source_path, destination_path):
+            print_error(
+                f"Verification failed: {destination_path} is no longer a link to {source_path}"
+            )
+            return False
+
+        print_success(
+            f"Verification passed for {destination_path} (hardlink)", detail=True
+        )
+        return True
+
+    # Compare file sizes first as a cheap check
+    if stored_entry is not None:
+        dest_size = stored_entry["size"]
+    else:
+        dest_size = destination_path.stat().st_size
+    if source_path.exists():
+        source_size = source_path.stat().st_size
+
+        if source_size != dest_size:
+            print_error(f"Verification failed: File sizes don't match for {filename}")
+            print_info(
+                f"Source size: {source_size} bytes, Destination size: {dest_size} bytes"
+            )
+            return False
+
+    # Compare content hashes. The hash recorded while copying (or a catalogued
+    # source hash) avoids reading the source a second time.
+    expected_hash = operation.get("content_hash") or operation.get("expected_hash")
+    if expected_hash is None:
+        if not source_path.exists():
+            print_error(
+                f"Verification failed: no recorded hash and source is missing for {filename}"
+            )
+            return False
+        catalog = get_catalog()
+        expected_hash = (
+            catalog.file_hash(source_path)
+            if catalog is not None
+            else compute_file_hash(source_path)
+        )
+
+    dest_hash = archived_file_hash(destination_path)
+    if dest_hash != expected_hash:
+        print_error(f"Verification failed: Content hash mismatch for {filename}")
+        print_info(f"Expected hash: {expected_hash}, Destination hash: {dest_hash}")
+        return False
+
+    print_success(f"Verification passed for {destination_path}", detail=True)
+    return True
+
+
+PLAN_FORMAT_VERSION = 1
+# Fields added to an operation by compile_plan
+PLAN_FIELDS = (
+    "source_path",
+    "destination_path",
+    "expected_size",
+    "expected_mtime_ns",
+    "expected_hash",
+    "versioned_files",
+)
+
+
+@timed_phase("compile_plan")
+def compile_plan(
+    operations: list[dict[str, Any]],
+    root_dir: Path,
+    organize_by_category: bool = False,
+    category_detection: str = "smart",
+    force_overwrite: bool = False,
+    include_hashes: bool = True,
+) -> dict[str, Any]:
+    """
+    Resolve every operation once into a compiled execution plan.
+
+    Each compiled operation keeps its original fields and gains its resolved
+    source and destination paths, category, expected size, mtime and content
+    hash, and the versioned files found for it. The dry run, copy,
+    verification and recycling passes then use these instead of resolving
+    the operation again. Nothing on disk is changed.
+
+    Args:
+        operations: List of operations to compile
+        root_dir: Root directory for resolving relative paths
+        organize_by_category: If True, organize files into category folders
+        category_detection: Method for detecting file categories
+        force_overwrite: If True, allow overwriting of existing files
+        include_hashes: If True, record the content hash of every source
+
+    Returns:
+        Plan dictionary with the compiled operations and a filesystem fingerprint
+    """
+    catalog = get_catalog() if include_hashes else None
+    compiled_operations = []
+
+    for operation in operations:
+        compiled = {k: v for k, v in operation.items() if k not in PLAN_FIELDS}
+        source_path = root_dir / compiled["source"]
+        dest_folder = root_dir / compiled["destination_folder"]
+        memory_type = compiled.get("memory_type", determine_memory_type(source_path))
+
+        destination_path, category = _resolve_destination(
+            compiled,
+            source_path,
+            dest_folder,
+            organize_by_category,
+            category_detection,
+            create_folders=False,
+        )
+        if category is not None:
+            compiled["category"] = category
+
+        compiled["source_path"] = str(source_path)
+        compiled["destination_path"] = str(destination_path)
+        compiled["versioned_files"] = [
+            str(p)
+            for p in _find_versioned_files(source_path, memory_type, root_dir)
+        ]
+
+        try:
+            source_stat = source_path.stat()
+        except OSError:
+            source_stat = None
+
+        compiled["expected_size"] = source_stat.st_size if source_stat else None
+        compiled["expected_mtime_ns"] = source_stat.st_mtime_ns if source_stat else None
+        compiled["expected_hash"] = None
+        if include_hashes and source_stat is not None:
+            compiled["expected_hash"] = (
+                catalog.file_hash(source_path)
+                if catalog is not None
+                else compute_file_hash(source_path)
+            )
+
+        compiled_operations.append(compiled)
+
+    return {
+        "format": PLAN_FORMAT_VERSION,
+        "created": datetime.now().isoformat(),
+        "root_dir": str(root_dir),
+        "options": {
+            "organize_by_category": organize_by_category,
+            "category_detection": category_detection,
+            "force_overwrite": force_overwrite,
+        },
+        "fingerprint": compute_plan_fingerprint(compiled_operations),
+        "operations": compiled_operations,
+    }
+
+
+def compute_plan_fingerprint(operations: list[dict[str, Any]]) -> str:
+    """
+    Fingerprint the current filesystem state of a compiled plan's files.
+
+    The fingerprint covers the size and mtime of every source and destination
+    (or their absence), so it changes if anything the plan depends on is
+    modified, created or removed.
+
+    Args:
+        operations: Compiled operations
+
+    Returns:
+        Hex digest of the state
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    for operation in operations:
+        for key in ("source_path", "destination_path"):
+            try:
+                path_stat = os.stat(operation[key])
+                state = f"{path_stat.st_size}:{path_stat.st_mtime_ns}"
+            except OSError:
+                state = "-"
+            hasher.update(f"{operation[key]}\0{state}\n".encode())
+    return hasher.hexdigest()
+
+
+def check_plan(plan: dict[str, Any]) -> list[str]:
+    """
+    Check a compiled plan for operations that would fail, without touching disk.
+
+    This is the dry run of a compiled plan: it uses the recorded source and
+    destination state, so it is only meaningful while the fingerprint matches.
+
+    Args:
+        plan: Plan from compile_plan
+
+    Returns:
+        List of problems (empty if every operation would succeed)
+    """
+    force_overwrite = plan.get("options", {}).get("force_overwrite", False)
+    problems = []
+    for operation in plan["operations"]:
+        if operation["expected_size"] is None:
+            problems.append(f"Source file does not exist: {operation['source_path']}")
+        elif not force_overwrite and archive_file_exists(
+            Path(operation["destination_path"])
+        ):
+            problems.append(
+                f"Destination file already exists: {operation['destination_path']}"
+            )
+    return problems
+
+
+def write_plan(plan: dict[str, Any], plan_path: Path) -> bool:
+    """
+    Write a compiled plan to disk as JSON.
+
+    Args:
+        plan: Plan from compile_plan
+        plan_path: Path to write the plan to
+
+    Returns:
+        True if the plan was written, False otherwise
+    """
+    return (
+        safe_file_operation(
+            _write_plan_to_file, plan_path, "Error writing plan", plan, plan_path
+        )
+        is not None
+    )
+
+
+def _write_plan_to_file(plan: dict[str, Any], plan_path: Path) -> bool:
+    """Internal function to write a plan file."""
+    with open(plan_path, "w", encoding="utf-8") as f:
+        json.dump(plan, f, indent=2)
+    print_success(
+        f"Execution plan with {len(plan['operations'])} operations written to {plan_path}"
+    )
+    return True
+
+
+def load_plan(plan_path: Path) -> dict[str, Any] | None:
+    """
+    Load and validate a compiled plan.
+
+    Args:
+        plan_path: Path to the plan file
+
+    Returns:
+        Plan dictionary, or None if it is missing or invalid
+    """
+    if not plan_path.exists():
+        print_error(f"Plan file does not exist: {plan_path}")
+        return None
+
+    plan = safe_file_operation(
+        _load_plan_file, plan_path, "Error loading plan", plan_path
+    )
+    if plan is None:
+        return None
+
+    if plan.get("format") != PLAN_FORMAT_VERSION or not isinstance(
+        plan.get("operations"), list
+    ):
+        error_msg = f"Unsupported or invalid plan file: {plan_path}"
+        print_error(error_msg)
+        return None
+
+    print_success(
+        f"Loaded execution plan with {len(plan['operations'])} operations "
+        f"(compiled {plan.get('created', 'unknown')})"
+    )
+    return plan
+
+
+def _load_plan_file(plan_path: Path) -> dict[str, Any]:
+    """Internal function to read a plan file."""
+    with open(plan_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main() -> None:
+    """Main entry point for the script."""
+    import argparse
+    import textwrap
+
+    # Set up argument parser
+    parser = argparse.ArgumentParser(
+        description=textwrap.dedent(
+            """
+            Memory Manager - A tool for managing memory files.
+
+            This tool helps organize and manage memory files by performing operations
+            like copying and moving files to appropriate locations, and moving original
+            files to the Windows recycle bin. It follows a structured workflow:
+
+            1. VALIDATION/DRY RUN: Validates all operations without making changes
+            2. FILE COPYING: Copies files to appropriate archival locations
+            3. RECYCLE BIN: Moves original files to Windows recycle bin (with confirmation)
+
+            The tool also supports organizing files into category folders, detecting
+            categories based on file content and name, and reorganizing existing files.
+
+            AI ASSISTANT SUPPORT: Use --non-interactive mode with --report-file for AI assistants.
+            """
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    parser.add_argument(
+        "config_file",
+        nargs="?",
+        default="memory_config.json",
+        help="Path to the memory configuration JSON file (default: memory_config.json)",
+    )
+    parser.add_argument(
+        "--force-overwrite",
+        action="store_true",
+        help="Force overwriting of existing files (USE WITH CAUTION)",
+    )
+    parser.add_argument(
+        "--recycle-confirmed",
+        action="store_true",
+        help="Skip confirmations and only perform recycle bin operations (USE WITH CAUTION)",
+    )
+
+    # Add new organization arguments
+    organization_group = parser.add_argument_group("Organization options")
+    organization_group.add_argument(
+        "--organize-by-category",
+        action="store_true",
+        help="Organize files into category folders in archive directories",
+    )
+    organization_group.add_argument(
+        "--reorganize-existing",
+        action="store_true",
+        help="Organize existing files in archive directories into category folders",
+    )
+    organization_group.add_argument(
+        "--analyze-organization",
+        action="store_true",
+        help="Analyze current organization without making changes",
+    )
+    organization_group.add_argument(
+        "--pack-archive",
+        action="store_true",
+        help="Roll cold files in archive category folders into compressed pack files",
+    )
+    organization_group.add_argument(
+        "--pack-age",
+        type=float,
+        metavar="DAYS",
+        help="With --pack-archive, pack files not modified for DAYS days (default: "
+        f"options.pack_age_days from the config file, or {PACK_DEFAULT_AGE_DAYS})",
+    )
+    organization_group.add_argument(
+        "--pack-codec",
+        choices=PACK_CODECS,
+        help="With --pack-archive, compression codec for packed files (default: "
+        "options.pack_codec from the config file, or zlib; zstd needs zstandard)",
+    )
+    organization_group.add_argument(
+        "--dedupe-archive",
+        action="store_true",
+        help="Replace duplicate archive files with hardlinks to one copy in the blob "
+        "store and report the space reclaimed",
+    )
+    organization_group.add_argument(
+        "--delta-archive",
+        action="store_true",
+        help="Convert the _vX.Y version series in archive folders to delta chains",
+    )
+    organization_group.add_argument(
+        "--delta-versions",
+        action="store_true",
+        help="Store archived _vX.Y versions as line diffs against their predecessor "
+        "instead of full copies",
+    )
+    organization_group.add_argument(
+        "--delta-keyframe",
+        type=int,
+        metavar="N",
+        help="With --delta-versions or --delta-archive, store a full keyframe every "
+        "N versions of a chain (default: options.delta_keyframe_interval from the "
+        f"config file, or {DELTA_DEFAULT_KEYFRAME_INTERVAL})",
+    )
+    organization_group.add_argument(
+        "--category-detection",
+        choices=["basic", "smart", "content-based"],
+        default="smart",
+        help="Method for detecting file categories (default: smart)",
+    )
+
+    # Add new AI assistant friendly options
+    ai_assistant_group = parser.add_argument_group("AI assistant options")
+    ai_assistant_group.add_argument(
+        "--non-interactive",
+        action="store_true",
+        help="Run all operations without prompting for confirmation (for AI assistants)",
+    )
+    ai_assistant_group.add_argument(
+        "--report-file",
+        type=str,
+        help="Path to write operation report (useful with --non-interactive)",
+    )
+    ai_assistant_group.add_argument(
+        "--report-format",
+        choices=REPORT_FORMATS,
+        help="Operation report format: md, json or csv (default: from the report file extension, else md)",
+    )
+    ai_assistant_group.add_argument(
+        "--mode",
+        choices=["plan", "act", "auto"],
+        default="auto",
+        help="Operation mode: plan (analyze only), act (perform operations), auto (determine from activeContext.md)",
+    )
+    ai_assistant_group.add_argument(
+        "--auto-version",
+        action="store_true",
+        help="Automatically create versioned copies of files before archiving",
+    )
+    ai_assistant_group.add_argument(
+        "--auto-detect",
+        action="store_true",
+        help="Automatically detect files to archive (ignores config file operations)",
+    )
+    ai_assistant_group.add_argument(
+        "--emit-plan",
+        metavar="PLAN_FILE",
+        help="In PLAN mode, write the compiled execution plan to PLAN_FILE",
+    )
+    ai_assistant_group.add_argument(
+        "--query-storage-log",
+        metavar="DATE",
+        help="List storage log entries for a day (YYYY-MM-DD), month (YYYY-MM) or year",
+    )
+    ai_assistant_group.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted run from its operation journal",
+    )
+    ai_assistant_group.add_argument(
+        "--discard-journal",
+        action="store_true",
+        help="Delete the journal of an interrupted run instead of resuming it",
+    )
+    ai_assistant_group.add_argument(
+        "--apply-plan",
+        metavar="PLAN_FILE",
+        help="Execute a plan written by --emit-plan (implies ACT mode)",
+    )
+
+    performance_group = parser.add_argument_group("Performance options")
+    performance_group.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Run independent copy, verify and recycle operations on N worker threads (default: 1)",
+    )
+    performance_group.add_argument(
+        "--copy-backend",
+        choices=["auto"] + COPY_BACKENDS,
+        help="File copy backend: auto tries reflink, copy_file_range, sendfile, then buffered "
+        "(default: options.copy_backend from the config file, or auto)",
+    )
+    performance_group.add_argument(
+        "--fast-move",
+        action="store_true",
+        help="Hardlink files into the archive when source and archive share a filesystem, "
+        "then unlink the originals instead of recycling them",
+    )
+    performance_group.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Store archived content once in the blob store, linking copies of "
+        "content that is already stored instead of copying it",
+    )
+    performance_group.add_argument(
+        "--classify-mode",
+        choices=CLASSIFY_MODES,
+        default="auto",
+        help="How content-based detection classifies many files: serially, on a thread "
+        "pool or on a process pool (default: auto, chosen from a timed sample)",
+    )
+    performance_group.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="In ACT mode, stream each operation through version, copy, verify and "
+        "recycle stages instead of running each phase over every operation in turn",
+    )
+    performance_group.add_argument(
+        "--no-catalog",
+        action="store_true",
+        help=f"Scan directories directly instead of using the persistent file catalog ({CATALOG_FILENAME})",
+    )
+    performance_group.add_argument(
+        "--no-search-index",
+        action="store_true",
+        help="Do not update the full-text search index "
+        f"({SEARCH_INDEX_FILENAME}) while moving files",
+    )
+
+    search_group = parser.add_argument_group("Search options")
+    search_group.add_argument(
+        "--search",
+        metavar="QUERY",
+        help="Search active and archived memory files, ranked by BM25, and print "
+        "each result's file, version and best-matching heading",
+    )
+    search_group.add_argument(
+        "--search-limit",
+        type=int,
+        default=SEARCH_DEFAULT_LIMIT,
+        metavar="N",
+        help=f"Maximum number of search results (default: {SEARCH_DEFAULT_LIMIT})",
+    )
+    search_group.add_argument(
+        "--search-type",
+        choices=MEMORY_TYPES,
+        help="Only search files of this memory type",
+    )
+    search_group.add_argument(
+        "--search-category",
+        metavar="CATEGORY",
+        help="Only search files in this archive category folder",
+    )
+
+    output_group = parser.add_argument_group("Output options")
+    output_group.add_argument(
+        "--verbosity",
+        choices=VERBOSITY_LEVELS,
+        default="detail",
+        help="Console output: detail prints every line, summary leaves out the "
+        "per-file lines, quiet prints only warnings and errors (the log file keeps "
+        "everything; default: detail)",
+    )
+    output_group.add_argument(
+        "--log-format",
+        choices=LOG_FORMATS,
+        default="text",
+        help="Log file format: text, or json for one JSON object per line with "
+        "operation IDs and phase durations (default: text)",
+    )
+    output_group.add_argument(
+        "--metrics-dir",
+        metavar="DIR",
+        help="Write each run's timing and resource metrics to DIR as a JSON run "
+        f"summary and a Prometheus textfile, {METRICS_TEXTFILE_NAME} "
+        "(default: logs/metrics)",
+    )
+
+    watch_group = parser.add_argument_group("Watch options")
+    watch_group.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and organize the memory bank incrementally as files change: "
+        "archive superseded versions, file loose archive files into category folders "
+        "and update the catalog (implies ACT mode; stop with Ctrl+C)",
+    )
+    watch_group.add_argument(
+        "--watch-backend",
+        choices=WATCH_BACKENDS,
+        default="auto",
+        help="How to watch for changes: inotify, poll, or auto for inotify where "
+        "available (default: auto)",
+    )
+    watch_group.add_argument(
+        "--watch-debounce",
+        type=float,
+        default=WATCH_DEBOUNCE_SECONDS,
+        metavar="SECONDS",
+        help="Wait until files have stopped changing for SECONDS before organizing "
+        f"them (default: {WATCH_DEBOUNCE_SECONDS:g})",
+    )
+
+    args = parser.parse_args()
+
+    global logger, catalog_enabled, fast_move_enabled, dedupe_enabled
+    global delta_versions_enabled, delta_keyframe_interval, classification_mode
+    global search_index_enabled, console_verbosity
+
+    # Set up logging
+    console_verbosity = args.verbosity
+    configure_logging(args.log_format)
+    logger = logging.getLogger(__name__)
+    catalog_enabled = not args.no_catalog
+    search_index_enabled = not args.no_search_index
+    classification_mode = args.classify_mode
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.search is not None and args.no_search_index:
+        parser.error("--search cannot be used with --no-search-index")
+    if args.search_limit < 1:
+        parser.error("--search-limit must be at least 1")
+    if args.apply_plan and args.mode == "plan":
+        parser.error("--apply-plan executes a plan and cannot be used with --mode plan")
+    if args.apply_plan and args.emit_plan:
+        parser.error("--emit-plan and --apply-plan cannot be used together")
+    if args.pipeline and args.apply_plan:
+        parser.error("--pipeline cannot be used with --apply-plan")
+    if args.resume and (args.apply_plan or args.emit_plan or args.recycle_confirmed):
+        parser.error(
+            "--resume cannot be combined with --apply-plan, --emit-plan or --recycle-confirmed"
+        )
+    if args.resume and args.discard_journal:
+        parser.error("--resume and --discard-journal cannot be used together")
+    if args.watch and args.mode == "plan":
+        parser.error("--watch modifies files and cannot be used with --mode plan")
+    if args.watch and (
+        args.apply_plan
+        or args.emit_plan
+        or args.resume
+        or args.recycle_confirmed
+        or args.analyze_organization
+        or args.reorganize_existing
+        or args.pack_archive
+        or args.dedupe_archive
+        or args.delta_archive
+    ):
+        parser.error(
+            "--watch cannot be combined with --apply-plan, --emit-plan, --resume, "
+            "--recycle-confirmed, --analyze-organization, --reorganize-existing, "
+            "--pack-archive, --dedupe-archive or --delta-archive"
+        )
+    if args.delta_keyframe is not None and args.delta_keyframe < 1:
+        parser.error("--delta-keyframe must be at least 1")
+    if args.watch_debounce < 0:
+        parser.error("--watch-debounce cannot be negative")
+
+    # Convert relative config path to absolute
+    config_path = Path(args.config_file)
+    if not config_path.is_absolute():
+        config_path = Path.cwd() / config_path
+
+    # Command-line options take precedence over config file options
+    try:
+        set_copy_backend(
+            args.copy_backend or read_config_option(config_path, "copy_backend", "auto")
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    fast_move_enabled = args.fast_move or bool(
+        read_config_option(config_path, "fast_move", False)
+    )
+    dedupe_enabled = args.dedupe or bool(
+        read_config_option(config_path, "dedupe_archive", False)
+    )
+    delta_versions_enabled = args.delta_versions or bool(
+        read_config_option(config_path, "delta_versions", False)
+    )
+    delta_keyframe_interval = args.delta_keyframe or int(
+        read_config_option(
+            config_path, "delta_keyframe_interval", DELTA_DEFAULT_KEYFRAME_INTERVAL
+        )
+    )
+    # Only runs that organize the memory bank write metrics, unless
+    # --metrics-dir asks for them
+    metrics_dir = Path(
+        args.metrics_dir
+        or read_config_option(config_path, "metrics_dir")
+        or logs_dir / "metrics"
+    )
+    if args.metrics_dir:
+        run_metrics.output_dir = metrics_dir
+
+    content_keywords = read_config_option(config_path, "content_keywords")
+    if content_keywords:
+        set_content_keywords(content_keywords)
+
+    # Standalone modes work on the memory bank as it is, whatever the workflow mode
+    if args.search is not None:
+        sys.exit(run_search(memory_bank_root, args))
+    if args.query_storage_log:
+        sys.exit(run_query_storage_log(memory_bank_root, args))
+    if args.pack_archive:
+        sys.exit(run_pack_archive(memory_bank_root, args, config_path))
+    if args.dedupe_archive:
+        sys.exit(run_dedupe_archive(memory_bank_root, args))
+    if args.delta_archive:
+        sys.exit(run_delta_archive(memory_bank_root, args))
+
+    print_header("MEMORY MANAGER SCRIPT")
+    print_info("Starting memory management process...")
+
+    print_info(f"Memory bank root identified as: {memory_bank_root}")
+
+    # Log memory usage if available
+    if _import_optional("psutil") is not None:
+        print_info(log_memory_usage())
+    else:
+        print_info("Note: psutil not available. Memory usage monitoring disabled.")
+
+    # Determine workflow mode
+    workflow_mode = args.mode
+    if workflow_mode == "auto":
+        if args.apply_plan or args.watch:
+            workflow_mode = "act"
+        else:
+            workflow_mode = determine_workflow_mode(memory_bank_root)
+
+    print_info(f"Operating in {workflow_mode.upper()} mode")
+    run_metrics.mode = workflow_mode
+
+    # If in plan mode and not specifically requested to perform operations,
+    # override to non-interactive and skip recycle bin operations
+    if workflow_mode == "plan" and not args.recycle_confirmed:
+        if not args.non_interactive:
+            print_info(
+                "PLAN mode enabled: Running in analysis mode only (no file changes)"
+            )
+        args.non_interactive = True
+        args.skip_recycle = True
+    else:
+        args.skip_recycle = False
+
+    # Runs that journal their operations must not replace an interrupted
+    # run's journal
+    journaled = args.watch or (
+        workflow_mode == "act"
+        and not (
+            args.resume
+            or args.recycle_confirmed
+            or args.analyze_organization
+            or args.reorganize_existing
+        )
+    )
+    if (journaled or args.discard_journal) and not check_leftover_journal(
+        args.discard_journal
+    ):
+        sys.exit(1)
+
+    # Resume an interrupted run from its journal
+    if args.resume:
+        run_metrics.output_dir = metrics_dir
+        print_header("RESUMING INTERRUPTED RUN")
+        resumed = resume_interrupted_run(
+            memory_bank_root, args.workers, args.non_interactive
+        )
+        trigger_garbage_collection()
+        sys.exit(0 if resumed else 1)
+
+    # Keep organizing the memory bank as it changes
+    if args.watch:
+        run_metrics.output_dir = metrics_dir
+        run_watch(memory_bank_root, args)
+        sys.exit(0)
+
+    # Special case for recycle operation only
+    if args.recycle_confirmed:
+        print_warning(
+            "RECYCLE CONFIRMATION FLAG DETECTED. Will only perform recycling bin operations."
+        )
+        print_warning(
+            "This assumes you've previously run the script and confirmed all file copies."
+        )
+        print_warning(
+            "Make sure versioned files exist in the active directories before proceeding."
+        )
+
+        # Load config
+        config = load_config(config_path)
+
+        # Use memory-bank root as the root directory instead of going up multiple levels
+        root_dir = memory_bank_root
+        logger.info(f"Using memory-bank root directory: {root_dir}")
+
+        operations = config["operations"]
+        recycling_success = process_recycling_operations(
+            operations, root_dir, False, args.workers
+        )
+
+        if recycling_success:
+            print_success("Memory files successfully moved to recycling bin.")
+            trigger_garbage_collection()
+            sys.exit(0)
+        else:
+            print_error("Failed to move some files to recycling bin.")
+            trigger_garbage_collection()
+            sys.exit(1)
+    # Check if organization analysis is requested
+    elif args.analyze_organization:
+        print_info("Analyzing current organization of memory files...")
+        config = load_config(config_path)
+
+        # Use memory-bank root as the root directory
+        root_dir = memory_bank_root
+
+        # Analyze all memory types in a single pass over the memory bank
+        all_analyses = {}
+        bank_analysis = analyze_long_term_memory(root_dir, args.category_detection)
+
+        for memory_type, analysis in bank_analysis.get("memory_types", {}).items():
+            if analysis["status"] == "success":
+                all_analyses[memory_type] = analysis
+
+        # Generate a report
+        if args.report_file:
+            report_content = "# Memory Organization Analysis Report\n\n"
+            report_content += (
+                f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+            )
+
+            for memory_type, analysis in all_analyses.items():
+                report_content += f"## {memory_type.capitalize()} Memory\n\n"
+                report_content += f"- **Loose Files:** {analysis['loose_file_count']}\n"
+                report_content += f"- **Categories:** {analysis['category_count']}\n"
+                report_content += f"- **Total Files:** {analysis['total_files']}\n"
+                packed_count = sum(
+                    category.get("packed_count", 0)
+                    for category in analysis["categories"].values()
+                )
+                if packed_count:
+                    report_content += f"- **Packed Files:** {packed_count}\n"
+                delta_count = sum(
+                    category.get("delta_count", 0)
+                    for category in analysis["categories"].values()
+                )
+                if delta_count:
+                    report_content += f"- **Delta-Encoded Versions:** {delta_count}\n"
+                report_content += f"- **Organization:** {analysis['organization_percentage']:.1f}%\n\n"
+
+                if analysis["loose_file_count"] > 0:
+                    report_content += "### Recommended Categorization\n\n"
+                    report_content += "| Category | File Count |\n"
+                    report_content += "|----------|------------|\n"
+
+                    for category, files in analysis["file_categories"].items():
+                        report_content += f"| {category} | {len(files)} |\n"
+
+                report_content += "\n"
+
+            # Write report
+            try:
+                with open(args.report_file, "w", encoding="utf-8") as f:
+                    f.write(report_content)
+                print_success(f"Analysis report written to {args.report_file}")
+            except Exception as e:
+                print_error(f"Error writing analysis report: {e}")
+
+        print_success("Organization analysis completed successfully.")
+        trigger_garbage_collection()
+        sys.exit(0)
+    # Check if reorganization is requested
+    elif args.reorganize_existing:
+        run_metrics.output_dir = metrics_dir
+        print_info("Reorganizing existing files in archive directories...")
+        config = load_config(config_path)
+
+        # Use memory-bank root as the root directory
+        root_dir = memory_bank_root
+
+        # Process each memory type
+        all_successful_ops = []
+        all_failed_ops = []
+        bank_analysis = analyze_long_term_memory(root_dir, args.category_detection)
+
+        for memory_type in MEMORY_TYPES:
+            archive_dir = root_dir / memory_type / "archive"
+            if not archive_dir.exists():
+                print_warning(
+                    f"{memory_type.capitalize()} archive directory does not exist: {archive_dir}"
+                )
+                continue
+
+            # First perform a dry run
+            print_header(f"Performing DRY RUN for {memory_type} reorganization")
+            options = {
+                "force_overwrite": args.force_overwrite,
+                "create_metadata": True,
+                "category_detection": args.category_detection,
+            }
+
+            analysis = bank_analysis["memory_types"][memory_type]
+            successful_dry_run, failed_dry_run = reorganize_existing_files(
+                archive_dir, analysis, True, options
+            )
+
+            if not successful_dry_run:
+                print_info(
+                    f"No {memory_type} files to reorganize or all operations would fail."
+                )
+                continue
+
+            # Ask for confirmation unless in non-interactive mode
+            if not get_user_confirmation(
+                f"Do you want to proceed with the {memory_type} reorganization?",
+                args.non_interactive,
+            ):
+                print_info(f"{memory_type.capitalize()} reorganization cancelled.")
+                continue
+
+            # Perform the actual reorganization
+            successful_ops, failed_ops = reorganize_existing_files(
+                archive_dir, analysis, False, options
+            )
+
+            all_successful_ops.extend(successful_ops)
+            all_failed_ops.extend(failed_ops)
+
+            # Update the storage log
+            if successful_ops:
+                update_storage_log_with_organization(archive_dir, successful_ops)
+
+            if failed_ops:
+                print_warning(
+                    f"{len(failed_ops)} operations failed during {memory_type} reorganization."
+                )
+
+            print_success(
+                f"Successfully reorganized {len(successful_ops)} {memory_type} files."
+            )
+
+        # Generate report if requested
+        if args.report_file:
+            combined_ops = all_successful_ops + all_failed_ops
+            generate_operation_report(
+                combined_ops,
+                all_successful_ops,
+                all_failed_ops,
+                Path(args.report_file),
+                args.report_format,
+            )
+
+        trigger_garbage_collection()
+        sys.exit(0 if not all_failed_ops else 1)
+
+    # Normal workflow for memory management
+    if workflow_mode == "act":
+        run_metrics.output_dir = metrics_dir
+    # Load a compiled plan, or load config or auto-detect files
+    plan = None
+    pipeline_enabled = args.pipeline and workflow_mode == "act"
+    if args.pipeline and not pipeline_enabled:
+        print_warning("--pipeline only applies in ACT mode; ignoring it")
+    if args.apply_plan:
+        plan = load_applied_plan(memory_bank_root, args)
+        if plan is None:
+            sys.exit(1)
+        operations = plan["operations"]
+    elif args.auto_detect and pipeline_enabled:
+        # The pipeline consumes detected files while the scan is still running
+        print_info("Auto-detecting files to archive...")
+        operations = iter_files_to_archive()
+    elif args.auto_detect:
+        print_info("Auto-detecting files to archive...")
+        operations = auto_detect_files_to_archive()
+        if not operations:
+            print_info("No files detected for archiving.")
+            sys.exit(0)
+        print_info(f"Detected {len(operations)} files to archive.")
+    else:
+        # Load config
+        if not config_path.exists():
+            print_error(f"Configuration file does not exist: {config_path}")
+            sys.exit(1)
+
+        try:
+            config = load_config(config_path)
+            operations = config["operations"]
+        except Exception as e:
+            print_error(f"Error loading configuration: {e}")
+            sys.exit(1)
+
+    # Use memory-bank root as the root directory instead of going up multiple levels
+    root_dir = memory_bank_root
+    logger.info(f"Using memory-bank root directory: {root_dir}")
+
+    if pipeline_enabled:
+        sys.exit(0 if run_pipeline(operations, root_dir, args) else 1)
+
+    # Auto-version files if requested
+    if args.auto_version and plan is not None:
+        print_info("Ignoring --auto-version: versions were resolved when the plan was compiled")
+    elif args.auto_version:
+        print_header("CREATING VERSIONED COPIES")
+        for operation in operations:
+            if operation.get("operation_type") == "move":
+                source_path = root_dir / operation["source"]
+                memory_type = operation.get(
+                    "memory_type", determine_memory_type(source_path)
+                )
+
+                if source_path.exists():
+                    versioned_path = create_versioned_file(
+                        source_path, memory_type, True, root_dir
+                    )
+                    if versioned_path:
+                        print_success(f"Created versioned copy: {versioned_path}")
+                    else:
+                        print_error(
+                            f"Failed to create versioned copy for: {source_path}"
+                        )
+
+    # In PLAN mode without specific override, we only analyze and don't modify files
+    if workflow_mode == "plan" and not args.recycle_confirmed:
+        print_header("PLAN MODE: ANALYZING OPERATIONS")
+
+        # Compile and write the execution plan if requested
+        if args.emit_plan:
+            operations = run_emit_plan(operations, root_dir, args)
+            if operations is None:
+                sys.exit(1)
+
+        # Generate dry run report
+        if args.report_file:
+            generate_operation_report(
+                operations, None, None, Path(args.report_file), args.report_format
+            )
+        print_info("Operation plan generated")
+
+        print_success("Plan mode analysis completed.")
+        print_info("To execute these operations, run again with --mode act")
+        sys.exit(0)
+
+    if args.emit_plan:
+        print_warning("--emit-plan only writes a plan in PLAN mode; ignoring it")
+
+    # A plan whose files are unchanged since it was compiled (and checked in
+    # PLAN mode) needs no second dry run. Otherwise resolve every operation
+    # once here, so later passes do not repeat the work.
+    skip_dry_run = False
+    if plan is not None:
+        if compute_plan_fingerprint(operations) == plan.get("fingerprint"):
+            print_success("Plan fingerprint matches the filesystem; skipping dry run.")
+            skip_dry_run = True
+        else:
+            print_warning(
+                "Files changed since the plan was compiled; recompiling and running a dry run."
+            )
+            logger.warning("Plan fingerprint mismatch; recompiling plan.")
+
+    if not skip_dry_run:
+        operations = compile_plan(
+            operations,
+            root_dir,
+            args.organize_by_category,
+            args.category_detection,
+            args.force_overwrite,
+            include_hashes=False,
+        )["operations"]
+
+        # Perform dry run of all operations first
+        print_header("PERFORMING DRY RUN")
+        dry_run_success = run_dry_run(
+            operations,
+            root_dir,
+            args.force_overwrite,
+            args.organize_by_category,
+            args.category_detection,
+        )
+
+        if not dry_run_success:
+            print_error("Dry run failed. Please fix the errors and try again.")
+            trigger_garbage_collection()
+            sys.exit(1)
+
+        print_success("Dry run completed successfully.")
+
+    # Ask for confirmation before proceeding with actual operations
+    if not get_user_confirmation(
+        "Do you want to proceed with the memory file operations?", args.non_interactive
+    ):
+        print_info("Operations cancelled by user.")
+        trigger_garbage_collection()
+        sys.exit(0)
+
+    # Journal every state change from here on so an interrupted run can resume
+    start_journal(
+        operations,
+        {
+            "organize_by_category": args.organize_by_category,
+            "category_detection": args.category_detection,
+            "force_overwrite": args.force_overwrite,
+        },
     )
-    organization_group.add_argument(
-        "--analyze-organization",
-        action="store_true",
-        help="Analyze current organization without making changes",
+
+    # Perform all operations
+    print_header("PERFORMING FILE COPYING OPERATIONS")
+    ops_success = perform_operations(
+        operations,
+        root_dir,
+        args.force_overwrite,
+        args.organize_by_category,
+        args.category_detection,
+        args.workers,
     )
-    organization_group.add_argument(
-        "--category-detection",
-        choices=["basic", "smart", "content-based"],
-        default="smart",
-        help="Method for detecting file categories (default: smart)",
+
+    if journal is not None:
+        journal.sync()
+
+    if not ops_success:
+        print_error("Some operations failed. Please check the logs.")
+        trigger_garbage_collection()
+        sys.exit(1)
+
+    print_success("All file copying operations completed successfully.")
+
+    # Verify operations
+    print_header("VERIFYING FILE COPYING OPERATIONS")
+    verification_success = verify_operations(operations, root_dir, args.workers)
+    if journal is not None:
+        journal.sync()
+
+    if not verification_success:
+        print_error(
+            "Some operations could not be verified. Please check the logs and investigate."
+        )
+        trigger_garbage_collection()
+        sys.exit(1)
+
+    print_success("All operations verified successfully.")
+
+    # Skip recycling bin operations if in PLAN mode or explicitly skipped
+    if args.skip_recycle:
+        print_info("Skipping recycling bin operations.")
+        print_info("To move files to recycling bin, run with --recycle-confirmed flag.")
+
+        # Generate report if requested
+        if args.report_file:
+            # Get successful operations
+            successful_ops = [
+                {
+                    "source": str(root_dir / operation["source"]),
+                    "destination": str(
+                        root_dir
+                        / operation["destination_folder"]
+                        / (
+                            operation.get("source", "").split("/")[-1]
+                            if operation.get("source")
+                            else "unknown"
+                        )
+                    ),
+                    "memory_type": operation.get("memory_type", "unknown"),
+                    "description": operation.get("description", ""),
+                    "status": "success",
+                }
+                for operation in operations
+            ]
+
+            generate_operation_report(
+                operations,
+                successful_ops,
+                [],
+                Path(args.report_file),
+                args.report_format,
+                root_dir,
+            )
+
+        trigger_garbage_collection()
+        sys.exit(0)
+
+    # Ask for confirmation before recycling
+    if not get_user_confirmation(
+        "Do you want to move the original files to the recycle bin?",
+        args.non_interactive,
+    ):
+        print_info("Recycling cancelled by user.")
+        print_info(
+            "To complete the process later, run the script with the --resume flag."
+        )
+        trigger_garbage_collection()
+        sys.exit(0)
+
+    # Move original files to recycle bin
+    print_header("MOVING ORIGINAL FILES TO RECYCLE BIN")
+    recycling_success = process_recycling_operations(
+        operations, root_dir, False, args.workers
     )
 
-    # Add new AI assistant friendly options
-    ai_assistant_group = parser.add_argument_group("AI assistant options")
-    ai_assistant_group.add_argument(
-        "--non-interactive",
-        action="store_true",
-        help="Run all operations without prompting for confirmation (for AI assistants)",
+    if not recycling_success:
+        print_error("Some files could not be moved to the recycle bin.")
+        print_info(
+            "You may need to manually delete these files or run the script with the --recycle-confirmed flag."
+        )
+        trigger_garbage_collection()
+        sys.exit(1)
+
+    print_success("All original files successfully moved to recycle bin.")
+    if journal is not None:
+        journal.finish()
+    print_success("Memory management process completed successfully.")
+
+    # Generate final report if requested
+    if args.report_file:
+        # Get successful operations
+        successful_ops = [
+            {
+                "source": str(root_dir / operation["source"]),
+                "destination": str(
+                    root_dir
+                    / operation["destination_folder"]
+                    / (
+                        operation.get("source", "").split("/")[-1]
+                        if operation.get("source")
+                        else "unknown"
+                    )
+                ),
+                "memory_type": operation.get("memory_type", "unknown"),
+                "description": operation.get("description", ""),
+                "status": "success",
+                "recycled": True,
+            }
+            for operation in operations
+        ]
+
+        generate_operation_report(
+            operations,
+            successful_ops,
+            [],
+            Path(args.report_file),
+            args.report_format,
+            root_dir,
+        )
+
+    trigger_garbage_collection()
+    sys.exit(0)
+
+
+def run_search(root_dir: Path, args: Any) -> int:
+    """
+    Search the memory bank through the full-text index (--search).
+
+    Args:
+        root_dir: Root directory of the memory bank
+        args: Parsed command-line arguments
+
+    Returns:
+        Exit code for the run
+    """
+    search_memory_bank(
+        root_dir,
+        args.search,
+        args.search_limit,
+        args.search_type,
+        args.search_category,
     )
-    ai_assistant_group.add_argument(
-        "--report-file",
-        type=str,
-        help="Path to write operation report (useful with --non-interactive)",
+    return 0
+
+
+def run_query_storage_log(root_dir: Path, args: Any) -> int:
+    """
+    Print the storage log entries of a date (--query-storage-log).
+
+    Args:
+        root_dir: Root directory of the memory bank
+        args: Parsed command-line arguments
+
+    Returns:
+        Exit code for the run
+    """
+    print_header(f"STORAGE LOG ENTRIES FOR {args.query_storage_log}")
+    found = 0
+    for memory_type in MEMORY_TYPES:
+        archive_dir = root_dir / memory_type / "archive"
+        for entry in StorageLog(archive_dir).query(args.query_storage_log):
+            found += 1
+            print_result(
+                f"[{memory_type}] {entry['timestamp']}: "
+                f"{entry['organization_type']}, {entry['file_count']} files"
+            )
+            for category, files in entry["categories"].items():
+                print_result(f"    {category}: {', '.join(files)}")
+    if not found:
+        print_result("No storage log entries found.")
+    return 0
+
+
+def run_pack_archive(root_dir: Path, args: Any, config_path: Path) -> int:
+    """
+    Pack cold archive files into their category packs (--pack-archive).
+
+    Args:
+        root_dir: Root directory of the memory bank
+        args: Parsed command-line arguments
+        config_path: Path to the configuration file
+
+    Returns:
+        Exit code for the run
+    """
+    print_info("Packing cold archive files...")
+    max_age_days = (
+        args.pack_age
+        if args.pack_age is not None
+        else read_config_option(config_path, "pack_age_days", PACK_DEFAULT_AGE_DAYS)
     )
-    ai_assistant_group.add_argument(
-        "--mode",
-        choices=["plan", "act", "auto"],
-        default="auto",
-        help="Operation mode: plan (analyze only), act (perform operations), auto (determine from activeContext.md)",
+    codec = args.pack_codec or read_config_option(config_path, "pack_codec", "zlib")
+    try:
+        _pack_codec(codec)
+    except ValueError as e:
+        print_error(str(e))
+        return 1
+
+    # First perform a dry run
+    successful_dry_run, _ = pack_cold_archive_files(
+        root_dir, max_age_days, codec, True
     )
-    ai_assistant_group.add_argument(
-        "--auto-version",
-        action="store_true",
-        help="Automatically create versioned copies of files before archiving",
+    if not successful_dry_run:
+        print_info(f"No archive files older than {max_age_days:g} days to pack.")
+        return 0
+
+    if not get_user_confirmation(
+        f"Do you want to pack {len(successful_dry_run)} cold archive files?",
+        args.non_interactive,
+    ):
+        print_info("Packing cancelled by user.")
+        return 0
+
+    successful_ops, failed_ops = pack_cold_archive_files(
+        root_dir, max_age_days, codec, False
     )
-    ai_assistant_group.add_argument(
-        "--auto-detect",
-        action="store_true",
-        help="Automatically detect files to archive (ignores config file operations)",
+
+    # Update the storage log of each archive that was packed
+    for memory_type in MEMORY_TYPES:
+        packed_ops = [op for op in successful_ops if op["memory_type"] == memory_type]
+        if packed_ops:
+            update_storage_log_with_organization(
+                root_dir / memory_type / "archive", packed_ops, "packing"
+            )
+
+    if args.report_file:
+        generate_operation_report(
+            successful_ops + failed_ops,
+            successful_ops,
+            failed_ops,
+            Path(args.report_file),
+            args.report_format,
+        )
+
+    trigger_garbage_collection()
+    return 0 if not failed_ops else 1
+
+
+def run_dedupe_archive(root_dir: Path, args: Any) -> int:
+    """
+    Hard-link duplicate archived files to shared blobs (--dedupe-archive).
+
+    Args:
+        root_dir: Root directory of the memory bank
+        args: Parsed command-line arguments
+
+    Returns:
+        Exit code for the run
+    """
+    print_info("Deduplicating archived files...")
+
+    # First perform a dry run
+    dry_run_stats = dedupe_archive(root_dir, True)
+    if not dry_run_stats["linked"]:
+        print_info("No duplicate archive files to link.")
+        return 0
+
+    if not get_user_confirmation(
+        f"Do you want to link {dry_run_stats['linked']} duplicate archive files?",
+        args.non_interactive,
+    ):
+        print_info("Deduplication cancelled by user.")
+        return 0
+
+    stats = dedupe_archive(root_dir, False)
+    logger.info(
+        f"Deduplicated archive: {stats['linked']} files linked, "
+        f"{stats['bytes_reclaimed']} bytes reclaimed"
     )
+    trigger_garbage_collection()
+    return 0 if not stats["failed"] else 1
 
-    args = parser.parse_args()
 
-    # Set up logging
-    configure_logging()
-    global logger
-    logger = logging.getLogger(__name__)
+def run_delta_archive(root_dir: Path, args: Any) -> int:
+    """
+    Delta-encode the archived versions of each file (--delta-archive).
 
-    print_header("MEMORY MANAGER SCRIPT")
-    print_info("Starting memory management process...")
+    Args:
+        root_dir: Root directory of the memory bank
+        args: Parsed command-line arguments
 
-    # Log memory usage if available
-    if PSUTIL_AVAILABLE:
-        print_info(log_memory_usage())
+    Returns:
+        Exit code for the run
+    """
+    print_info("Delta-encoding archived versions...")
 
-    # Convert relative config path to absolute
-    config_path = Path(args.config_file)
-    if not config_path.is_absolute():
-        config_path = Path.cwd() / config_path
+    # First perform a dry run
+    successful_dry_run, _ = delta_encode_archive_versions(
+        root_dir, delta_keyframe_interval, True
+    )
+    if not successful_dry_run:
+        print_info("No archived version series to delta-encode.")
+        return 0
 
-    # Determine workflow mode
-    workflow_mode = args.mode
-    if workflow_mode == "auto":
-        workflow_mode = determine_workflow_mode(memory_bank_root)
+    if not get_user_confirmation(
+        f"Do you want to delta-encode {len(successful_dry_run)} archived versions?",
+        args.non_interactive,
+    ):
+        print_info("Delta encoding cancelled by user.")
+        return 0
 
-    print_info(f"Operating in {workflow_mode.upper()} mode")
-    logger.info(f"Operating in {workflow_mode.upper()} mode")
+    successful_ops, failed_ops = delta_encode_archive_versions(
+        root_dir, delta_keyframe_interval, False
+    )
 
-    # If in plan mode and not specifically requested to perform operations,
-    # override to non-interactive and skip recycle bin operations
-    if workflow_mode == "plan" and not args.recycle_confirmed:
-        if not args.non_interactive:
-            print_info(
-                "PLAN mode enabled: Running in analysis mode only (no file changes)"
+    # Update the storage log of each archive that was encoded
+    for memory_type in MEMORY_TYPES:
+        encoded_ops = [op for op in successful_ops if op["memory_type"] == memory_type]
+        if encoded_ops:
+            update_storage_log_with_organization(
+                root_dir / memory_type / "archive", encoded_ops, "delta encoding"
             )
-        args.non_interactive = True
-        args.skip_recycle = True
-    else:
-        args.skip_recycle = False
 
-    # Special case for recycle operation only
-    if args.recycle_confirmed:
-        print_warning(
-            "RECYCLE CONFIRMATION FLAG DETECTED. Will only perform recycling bin operations."
-        )
-        print_warning(
-            "This assumes you've previously run the script and confirmed all file copies."
-        )
-        print_warning(
-            "Make sure versioned files exist in the active directories before proceeding."
+    if args.report_file:
+        generate_operation_report(
+            successful_ops + failed_ops,
+            successful_ops,
+            failed_ops,
+            Path(args.report_file),
+            args.report_format,
         )
 
-        # Load config
-        config = load_config(config_path)
+    trigger_garbage_collection()
+    return 0 if not failed_ops else 1
 
-        # Use memory-bank root as the root directory instead of going up multiple levels
-        root_dir = memory_bank_root
-        logger.info(f"Using memory-bank root directory: {root_dir}")
 
-        operations = config["operations"]
-        recycling_success = process_recycling_operations(operations, root_dir, False)
+def load_applied_plan(root_dir: Path, args: Any) -> dict[str, Any] | None:
+    """
+    Load the plan given with --apply-plan for this memory bank.
 
-        if recycling_success:
-            print_success("Memory files successfully moved to recycling bin.")
-            logger.info("Memory files successfully moved to recycling bin.")
-            trigger_garbage_collection()
-            sys.exit(0)
-        else:
-            print_error("Failed to move some files to recycling bin.")
-            logger.error("Failed to move some files to recycling bin.")
-            trigger_garbage_collection()
-            sys.exit(1)
-    # Check if organization analysis is requested
-    elif args.analyze_organization:
-        print_info("Analyzing current organization of memory files...")
-        config = load_config(config_path)
+    The plan's options take the place of the command-line options in args.
 
-        # Use memory-bank root as the root directory
-        root_dir = memory_bank_root
+    Args:
+        root_dir: Root directory of the memory bank
+        args: Parsed command-line arguments
 
-        # Analyze each memory type
-        all_analyses = {}
+    Returns:
+        The plan, or None if it could not be loaded or belongs to another bank
+    """
+    plan = load_plan(Path(args.apply_plan))
+    if plan is None:
+        return None
+    if plan.get("root_dir") != str(root_dir):
+        print_error(
+            f"Plan was compiled for a different memory bank: {plan.get('root_dir')}"
+        )
+        return None
 
-        for memory_type in MEMORY_TYPES:
-            memory_dir = root_dir / memory_type
-            if not memory_dir.exists():
-                print_warning(
-                    f"{memory_type.capitalize()} memory directory does not exist: {memory_dir}"
-                )
-                continue
+    plan_options = plan.get("options", {})
+    args.organize_by_category = plan_options.get("organize_by_category", False)
+    args.category_detection = plan_options.get("category_detection", "smart")
+    args.force_overwrite = plan_options.get("force_overwrite", False)
+    return plan
 
-            archive_dir = memory_dir / "archive"
-            if not archive_dir.exists():
-                print_warning(
-                    f"{memory_type.capitalize()} archive directory does not exist: {archive_dir}"
-                )
-                continue
 
-            analysis = analyze_long_term_memory(archive_dir, args.category_detection)
-            if analysis["status"] == "success":
-                all_analyses[memory_type] = analysis
+def run_emit_plan(
+    operations: list[dict[str, Any]], root_dir: Path, args: Any
+) -> list[dict[str, Any]] | None:
+    """
+    Compile the operations into a plan and write it (--emit-plan).
 
-        # Generate a report
-        if args.report_file:
-            report_content = "# Memory Organization Analysis Report\n\n"
-            report_content += (
-                f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-            )
+    Args:
+        operations: Operations to compile
+        root_dir: Root directory of the memory bank
+        args: Parsed command-line arguments
 
-            for memory_type, analysis in all_analyses.items():
-                report_content += f"## {memory_type.capitalize()} Memory\n\n"
-                report_content += f"- **Loose Files:** {analysis['loose_file_count']}\n"
-                report_content += f"- **Categories:** {analysis['category_count']}\n"
-                report_content += f"- **Total Files:** {analysis['total_files']}\n"
-                report_content += f"- **Organization:** {analysis['organization_percentage']:.1f}%\n\n"
+    Returns:
+        The compiled operations, or None if the plan would fail or could not
+        be written
+    """
+    print_info("Compiling execution plan...")
+    plan = compile_plan(
+        operations,
+        root_dir,
+        args.organize_by_category,
+        args.category_detection,
+        args.force_overwrite,
+    )
+    problems = check_plan(plan)
+    if problems:
+        for problem in problems:
+            print_error(problem)
+        print_error("Plan would fail; not writing it.")
+        return None
+    if not write_plan(plan, Path(args.emit_plan)):
+        return None
+    return plan["operations"]
 
-                if analysis["loose_file_count"] > 0:
-                    report_content += "### Recommended Categorization\n\n"
-                    report_content += "| Category | File Count |\n"
-                    report_content += "|----------|------------|\n"
 
-                    for category, files in analysis["file_categories"].items():
-                        report_content += f"| {category} | {len(files)} |\n"
+@timed_phase("pipeline")
+def run_pipeline(
+    operations: Iterable[dict[str, Any]], root_dir: Path, args: Any
+) -> bool:
+    """
+    Run the ACT workflow through an OperationPipeline.
 
-                report_content += "\n"
+    Each operation is checked on its own as it enters the pipeline, in place
+    of a dry run over all of them. The confirmation before file operations
+    is asked before the pipeline starts; the recycling confirmation is the
+    pipeline's recycle checkpoint.
 
-            # Write report
-            try:
-                with open(args.report_file, "w", encoding="utf-8") as f:
-                    f.write(report_content)
-                print_success(f"Analysis report written to {args.report_file}")
-            except Exception as e:
-                print_error(f"Error writing analysis report: {e}")
+    Args:
+        operations: Operations to perform, consumed lazily
+        root_dir: Root directory for resolving relative paths
+        args: Parsed command-line arguments
 
-        print_success("Organization analysis completed successfully.")
-        trigger_garbage_collection()
-        sys.exit(0)
-    # Check if reorganization is requested
-    elif args.reorganize_existing:
-        print_info("Reorganizing existing files in archive directories...")
-        config = load_config(config_path)
+    Returns:
+        True if the run completed (or was cancelled by the user), False otherwise
+    """
+    global journal
 
-        # Use memory-bank root as the root directory
-        root_dir = memory_bank_root
+    if not get_user_confirmation(
+        "Do you want to proceed with the memory file operations?", args.non_interactive
+    ):
+        print_info("Operations cancelled by user.")
+        return True
 
-        # Process each memory type
-        all_successful_ops = []
-        all_failed_ops = []
+    # Operations are journaled as they enter the pipeline
+    start_journal(
+        [],
+        {
+            "organize_by_category": args.organize_by_category,
+            "category_detection": args.category_detection,
+            "force_overwrite": args.force_overwrite,
+        },
+    )
 
-        for memory_type in MEMORY_TYPES:
-            archive_dir = root_dir / memory_type / "archive"
-            if not archive_dir.exists():
-                print_warning(
-                    f"{memory_type.capitalize()} archive directory does not exist: {archive_dir}"
-                )
-                continue
+    print_header("RUNNING OPERATION PIPELINE")
+    pipeline = OperationPipeline(
+        root_dir,
+        args.force_overwrite,
+        args.organize_by_category,
+        args.category_detection,
+        args.auto_version,
+        args.workers,
+        args.non_interactive,
+        keep_completed=bool(args.report_file),
+    )
+    success = pipeline.run(operations)
+    if journal is not None:
+        journal.sync()
 
-            # First perform a dry run
-            print_header(f"Performing DRY RUN for {memory_type} reorganization")
-            options = {
-                "force_overwrite": args.force_overwrite,
-                "create_metadata": True,
-                "category_detection": args.category_detection,
-            }
+    counts = pipeline.counts
+    summary = ", ".join(f"{count} {state}" for state, count in counts.items())
+    print_info(f"Pipeline finished: {summary}")
+    if copy_backend_counts:
+        print_info(f"Copy backends used: {format_copy_backend_counts()}")
 
-            analysis = analyze_long_term_memory(archive_dir, args.category_detection)
-            successful_dry_run, failed_dry_run = reorganize_existing_files(
-                archive_dir, analysis, True, options
-            )
+    if args.report_file:
+        generate_operation_report(
+            pipeline.completed,
+            pipeline.succeeded,
+            pipeline.failed,
+            Path(args.report_file),
+            args.report_format,
+            root_dir,
+        )
+    trigger_garbage_collection()
 
-            if not successful_dry_run:
-                print_info(
-                    f"No {memory_type} files to reorganize or all operations would fail."
-                )
-                continue
+    if counts["failed"]:
+        print_error("Some operations failed. Please check the logs.")
+        print_info("To retry them, fix the errors and run the script again.")
+        return False
 
-            # Ask for confirmation unless in non-interactive mode
-            if not get_user_confirmation(
-                f"Do you want to proceed with the {memory_type} reorganization?",
-                args.non_interactive,
-            ):
-                print_info(f"{memory_type.capitalize()} reorganization cancelled.")
-                continue
+    if not pipeline.recycle_confirmed:
+        print_info("Recycling cancelled by user.")
+        print_info(
+            "To complete the process later, run the script with the --resume flag."
+        )
+        return True
 
-            # Perform the actual reorganization
-            successful_ops, failed_ops = reorganize_existing_files(
-                archive_dir, analysis, False, options
-            )
+    if journal is not None:
+        journal.finish()
+        journal = None
+    if not counts["planned"] and not counts["failed"]:
+        print_info("No files detected for archiving.")
+    print_success("Memory management process completed successfully.")
+    return True
 
-            all_successful_ops.extend(successful_ops)
-            all_failed_ops.extend(failed_ops)
 
-            # Update the storage log
-            if successful_ops:
-                update_storage_log_with_organization(archive_dir, successful_ops)
+def run_watch(root_dir: Path, args: Any) -> None:
+    """
+    Keep the memory bank organized as files change, until interrupted.
 
-            if failed_ops:
-                print_warning(
-                    f"{len(failed_ops)} operations failed during {memory_type} reorganization."
-                )
-                logger.warning(
-                    f"{len(failed_ops)} operations failed during {memory_type} reorganization."
-                )
+    A first pass brings the whole bank up to date. After that, each burst of
+    changes to the active and archive directories is handled once it has
+    gone quiet (see process_watch_changes), so a later bedtime run finds
+    little or nothing left to do.
 
-            print_success(
-                f"Successfully reorganized {len(successful_ops)} {memory_type} files."
-            )
+    Args:
+        root_dir: Root directory of the memory bank
+        args: Parsed command-line arguments
+    """
+    if not get_user_confirmation(
+        "Watch mode archives superseded versions (moving their originals to the "
+        "recycle bin) and files loose archive files into category folders as "
+        "they change. Do you want to start watching?",
+        args.non_interactive,
+    ):
+        print_info("Watch mode cancelled by user.")
+        return
 
-        # Generate report if requested
-        if args.report_file:
-            combined_ops = all_successful_ops + all_failed_ops
-            report = generate_operation_report(
-                combined_ops, all_successful_ops, all_failed_ops, Path(args.report_file)
-            )
+    roots = []
+    for memory_type in MEMORY_TYPES:
+        roots.append((root_dir / memory_type / "active", 0))
+        roots.append((root_dir / memory_type / "archive", 1))
 
+    print_header("WATCHING MEMORY BANK")
+    # Start watching before the first pass, so that no change is missed
+    watcher = get_directory_watcher(roots, args.watch_backend)
+    print_info(f"Watching with {type(watcher).__name__}; press Ctrl+C to stop.")
+    logger.info(f"Watch mode started with {type(watcher).__name__}")
+
+    try:
+        process_watch_changes(root_dir, {directory for directory, _ in roots}, args)
+        while True:
+            process_watch_changes(
+                root_dir, watcher.collect(args.watch_debounce), args
+            )
+    except KeyboardInterrupt:
+        print_info("\nWatch mode stopped.")
+        logger.info("Watch mode stopped.")
+    finally:
+        watcher.close()
         trigger_garbage_collection()
-        sys.exit(0 if not all_failed_ops else 1)
 
-    # Normal workflow for memory management
-    # Load config or auto-detect files
-    if args.auto_detect:
-        print_info("Auto-detecting files to archive...")
-        operations = auto_detect_files_to_archive()
-        if not operations:
-            print_info("No files detected for archiving.")
-            sys.exit(0)
-        print_info(f"Detected {len(operations)} files to archive.")
-    else:
-        # Load config
-        if not config_path.exists():
-            print_error(f"Configuration file does not exist: {config_path}")
-            sys.exit(1)
 
+def process_watch_changes(root_dir: Path, changed: set[Path], args: Any) -> None:
+    """
+    Bring the parts of the memory bank touched by a burst of changes up to date.
+
+    Older versions in each changed active directory are archived into
+    category folders through an OperationPipeline; loose files in each
+    changed archive directory are moved into category folders; and the
+    catalog is updated for everything touched, including files rewritten in
+    place. Only the affected memory types are scanned. Each step works from
+    the current state of the bank, so the changes it makes itself settle in
+    one more pass that finds nothing to do.
+
+    Args:
+        root_dir: Root directory of the memory bank
+        changed: Changed files and directories, as reported by the watcher
+        args: Parsed command-line arguments
+    """
+    global journal
+
+    active_types: set[str] = set()
+    archive_types: set[str] = set()
+    changed_files = []
+    for path in changed:
         try:
-            config = load_config(config_path)
-            operations = config["operations"]
-        except Exception as e:
-            print_error(f"Error loading configuration: {e}")
-            sys.exit(1)
+            parts = path.relative_to(root_dir).parts
+        except ValueError:
+            continue
+        if len(parts) < 2 or parts[0] not in MEMORY_TYPES:
+            continue
+        if parts[1] == "active":
+            active_types.add(parts[0])
+        elif parts[1] == "archive":
+            archive_types.add(parts[0])
+        if path.suffix == ".md":
+            changed_files.append(path)
+
+    archived = 0
+    organized = 0
+    failed = 0
+
+    # Archive superseded versions straight into their category folders
+    operations = list(
+        iter_files_to_archive(
+            root_dir, [t for t in MEMORY_TYPES if t in active_types]
+        )
+    )
+    if operations:
+        start_journal(
+            [],
+            {
+                "organize_by_category": True,
+                "category_detection": args.category_detection,
+                "force_overwrite": args.force_overwrite,
+            },
+        )
+        pipeline = OperationPipeline(
+            root_dir,
+            args.force_overwrite,
+            True,
+            args.category_detection,
+            args.auto_version,
+            args.workers,
+            non_interactive=True,
+        )
+        pipeline.run(operations)
+        if journal is not None:
+            # Failed operations are retried by the next pass over their directory
+            journal.finish()
+            atexit.unregister(journal.close)
+            journal = None
+        archived = pipeline.counts["recycled"]
+        failed += pipeline.counts["failed"]
+
+    # File loose archive files into category folders
+    reorganize_options = {
+        "force_overwrite": args.force_overwrite,
+        "create_metadata": True,
+        "category_detection": args.category_detection,
+    }
+    for memory_type in MEMORY_TYPES:
+        if memory_type not in archive_types:
+            continue
+        archive_dir = root_dir / memory_type / "archive"
+        listing = scan_directory(archive_dir)
+        if listing is None:
+            continue
 
-    # Use memory-bank root as the root directory instead of going up multiple levels
-    root_dir = memory_bank_root
-    logger.info(f"Using memory-bank root directory: {root_dir}")
+        # The storage log stays at the top of the archive
+        storage_log_name = StorageLog(archive_dir).markdown_file.name
+        loose_files = [f.path for f in listing.files if f.name != storage_log_name]
+        if not loose_files:
+            continue
 
-    # Auto-version files if requested
-    if args.auto_version:
-        print_header("CREATING VERSIONED COPIES")
-        for operation in operations:
-            if operation.get("operation_type") == "move":
-                source_path = root_dir / operation["source"]
-                memory_type = operation.get(
-                    "memory_type", determine_memory_type(source_path)
-                )
+        file_categories: dict[str, list[str]] = {}
+        categories = categorize_files(loose_files, args.category_detection)
+        for file_path, category in zip(loose_files, categories):
+            file_categories.setdefault(category, []).append(file_path.name)
 
-                if source_path.exists():
-                    versioned_path = create_versioned_file(
-                        source_path, memory_type, True, root_dir
-                    )
-                    if versioned_path:
-                        print_success(f"Created versioned copy: {versioned_path}")
-                    else:
-                        print_error(
-                            f"Failed to create versioned copy for: {source_path}"
-                        )
+        successful_ops, failed_ops = reorganize_existing_files(
+            archive_dir,
+            {
+                "status": "success",
+                "loose_files": [file_path.name for file_path in loose_files],
+                "file_categories": file_categories,
+            },
+            False,
+            reorganize_options,
+        )
+        if successful_ops:
+            update_storage_log_with_organization(archive_dir, successful_ops, "watch")
+        organized += len(successful_ops)
+        failed += len(failed_ops)
+
+    # Keep the catalog warm for the next analysis or bedtime run
+    catalog = get_catalog()
+    if catalog is not None:
+        for memory_type in MEMORY_TYPES:
+            if memory_type in active_types:
+                catalog.refresh(root_dir / memory_type / "active")
+            if memory_type in active_types or memory_type in archive_types:
+                catalog.refresh(root_dir / memory_type / "archive")
+        catalog.update_files(changed_files)
+
+    if archived or organized or failed:
+        summary = (
+            f"Watch pass at {datetime.now().strftime('%H:%M:%S')}: "
+            f"{archived} versions archived, {organized} archive files organized"
+        )
+        if failed:
+            summary += f", {failed} failed"
+        print_info(summary)
 
-    # In PLAN mode without specific override, we only analyze and don't modify files
-    if workflow_mode == "plan" and not args.recycle_confirmed:
-        print_header("PLAN MODE: ANALYZING OPERATIONS")
 
-        # Generate dry run report
-        report = generate_operation_report(operations, None, None)
-        print_info("Operation plan generated")
+def start_journal(
+    operations: list[dict[str, Any]], options: dict[str, Any]
+) -> OperationJournal | None:
+    """
+    Start the write-ahead journal for a run that is about to modify files.
+
+    The storage modes (fast moves, deduplication, delta versions and the copy
+    backend) are recorded along with the options, so that --resume copies
+    the way the interrupted run did.
 
-        if args.report_file:
-            try:
-                with open(args.report_file, "w", encoding="utf-8") as f:
-                    f.write(report)
-                print_success(f"Operation plan written to {args.report_file}")
-            except Exception as e:
-                print_error(f"Error writing operation plan: {e}")
+    Args:
+        operations: Operations the run will perform
+        options: Options the run uses
 
-        print_success("Plan mode analysis completed.")
-        print_info("To execute these operations, run again with --mode act")
-        sys.exit(0)
+    Returns:
+        The journal, or None if it could not be created
+    """
+    global journal
 
-    # Perform dry run of all operations first
-    print_header("PERFORMING DRY RUN")
-    dry_run_success = run_dry_run(
+    journal = safe_operation(
+        OperationJournal.start,
+        "Error creating operation journal; continuing without crash recovery",
+        script_dir / JOURNAL_FILENAME,
         operations,
-        root_dir,
-        args.force_overwrite,
-        args.organize_by_category,
-        args.category_detection,
+        {
+            **options,
+            "fast_move": fast_move_enabled,
+            "dedupe": dedupe_enabled,
+            "delta_versions": delta_versions_enabled,
+            "delta_keyframe_interval": delta_keyframe_interval,
+            "copy_backend": copy_backend,
+        },
     )
+    if journal is not None:
+        atexit.register(journal.close)
+        logger.info(f"Journaling operations to {journal.journal_path}")
+    return journal
 
-    if not dry_run_success:
-        print_error("Dry run failed. Please fix the errors and try again.")
-        logger.error("Dry run failed. Please fix the errors and try again.")
-        trigger_garbage_collection()
-        sys.exit(1)
 
-    print_success("Dry run completed successfully.")
-    logger.info("Dry run completed successfully.")
+def check_leftover_journal(discard: bool = False) -> bool:
+    """
+    Keep a new run from replacing the journal of an interrupted run.
 
-    # Ask for confirmation before proceeding with actual operations
-    if not get_user_confirmation(
-        "Do you want to proceed with the memory file operations?", args.non_interactive
-    ):
-        print_info("Operations cancelled by user.")
-        logger.info("Operations cancelled by user.")
-        trigger_garbage_collection()
-        sys.exit(0)
+    Args:
+        discard: If True, delete a leftover journal (--discard-journal)
 
-    # Perform all operations
-    print_header("PERFORMING FILE COPYING OPERATIONS")
-    ops_success = perform_operations(
-        operations,
-        root_dir,
-        args.force_overwrite,
-        args.organize_by_category,
-        args.category_detection,
+    Returns:
+        True if the run may start its own journal, False if an interrupted
+        run's journal is in the way
+    """
+    journal_path = script_dir / JOURNAL_FILENAME
+    if not journal_path.exists():
+        return True
+
+    if discard:
+        print_warning(f"Discarding the journal of an interrupted run: {journal_path}")
+        journal_path.unlink(missing_ok=True)
+        return True
+
+    print_error(f"An interrupted run left its journal behind: {journal_path}")
+    print_info(
+        "Run with --resume to finish that run, or with --discard-journal to "
+        "start over without it."
     )
+    return False
 
-    if not ops_success:
-        print_error("Some operations failed. Please check the logs.")
-        logger.error("Some operations failed. Please check the logs.")
-        trigger_garbage_collection()
-        sys.exit(1)
 
-    print_success("All file copying operations completed successfully.")
-    logger.info("All file copying operations completed successfully.")
+def _sort_resumed_operations(
+    operations: list[dict[str, Any]], root_dir: Path
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Work out what is left to do for each operation of an interrupted run.
 
-    # Verify operations
-    print_header("VERIFYING FILE COPYING OPERATIONS")
-    verification_success = verify_operations(operations, root_dir)
+    Operations journaled as copied (or still planned) are checked by content
+    hash: a destination that already holds the source's data counts as
+    verified and is not copied again.
 
-    if not verification_success:
-        print_error(
-            "Some operations could not be verified. Please check the logs and investigate."
-        )
-        logger.error(
-            "Some operations could not be verified. Please check the logs and investigate."
-        )
-        trigger_garbage_collection()
-        sys.exit(1)
+    Args:
+        operations: Operations replayed from the journal
+        root_dir: Root directory for resolving relative paths
 
-    print_success("All operations verified successfully.")
-    logger.info("All operations verified successfully.")
+    Returns:
+        Tuple of (operations to copy again, operations to recycle, unrecoverable operations)
+    """
+    to_copy, to_recycle, unrecoverable = [], [], []
 
-    # Skip recycling bin operations if in PLAN mode or explicitly skipped
-    if args.skip_recycle:
-        print_info("Skipping recycling bin operations.")
-        logger.info("Skipping recycling bin operations.")
-        print_info("To move files to recycling bin, run with --recycle-confirmed flag.")
+    for operation in operations:
+        state = operation.get("journal_state", "planned")
+        if state == "recycled":
+            continue
+        if state == "verified":
+            to_recycle.append(operation)
+            continue
 
-        # Generate report if requested
-        if args.report_file:
-            # Get successful operations
-            successful_ops = [
-                {
-                    "source": str(root_dir / operation["source"]),
-                    "destination": str(
-                        root_dir
-                        / operation["destination_folder"]
-                        / (
-                            operation.get("source", "").split("/")[-1]
-                            if operation.get("source")
-                            else "unknown"
-                        )
-                    ),
-                    "memory_type": operation.get("memory_type", "unknown"),
-                    "description": operation.get("description", ""),
-                    "status": "success",
-                }
-                for operation in operations
-            ]
+        source_path = root_dir / operation["source"]
+        destination = Path(
+            operation.get("destination") or operation["destination_path"]
+        )
+
+        if archive_file_exists(destination):
+            if operation.get("linked") and source_path.exists():
+                complete = _is_same_file(source_path, destination)
+            else:
+                expected_hash = operation.get("content_hash") or operation.get(
+                    "expected_hash"
+                )
+                if expected_hash is None and source_path.exists():
+                    expected_hash = compute_file_hash(source_path)
+                complete = (
+                    expected_hash is not None
+                    and archived_file_hash(destination) == expected_hash
+                )
+
+            if complete:
+                print_info(f"Already copied, hash verified: {destination}", detail=True)
+                operation["destination"] = str(destination)
+                journal_record(operation, "verified")
+                to_recycle.append(operation)
+                continue
 
-            report = generate_operation_report(
-                operations, successful_ops, [], Path(args.report_file)
+        if not source_path.exists():
+            print_error(
+                f"Cannot resume: source is gone and no verified copy exists: {source_path}"
             )
+            unrecoverable.append(operation)
+            continue
 
-        trigger_garbage_collection()
-        sys.exit(0)
+        to_copy.append(operation)
 
-    # Ask for confirmation before recycling
-    if not get_user_confirmation(
-        "Do you want to move the original files to the recycle bin?",
-        args.non_interactive,
-    ):
-        print_info("Recycling cancelled by user.")
-        logger.info("Recycling cancelled by user.")
-        print_info(
-            "To complete the process later, run the script with the --recycle-confirmed flag."
-        )
-        trigger_garbage_collection()
-        sys.exit(0)
+    return to_copy, to_recycle, unrecoverable
 
-    # Move original files to recycle bin
-    print_header("MOVING ORIGINAL FILES TO RECYCLE BIN")
-    recycling_success = process_recycling_operations(operations, root_dir, False)
 
-    if not recycling_success:
-        print_error("Some files could not be moved to the recycle bin.")
-        logger.error("Some files could not be moved to the recycle bin.")
-        print_info(
-            "You may need to manually delete these files or run the script with the --recycle-confirmed flag."
-        )
-        trigger_garbage_collection()
-        sys.exit(1)
+def resume_interrupted_run(
+    root_dir: Path, workers: int = 1, non_interactive: bool = False
+) -> bool:
+    """
+    Continue a run that was interrupted, using its operation journal.
 
-    print_success("All original files successfully moved to recycle bin.")
-    logger.info("All original files successfully moved to recycle bin.")
-    print_success("Memory management process completed successfully.")
-    logger.info("Memory management process completed successfully.")
+    Only the remaining work is done: copies that the journal (or a hash check)
+    shows as complete are not repeated, and sources already recycled are
+    left alone. Partial copies are overwritten.
 
-    # Generate final report if requested
-    if args.report_file:
-        # Get successful operations
-        successful_ops = [
-            {
-                "source": str(root_dir / operation["source"]),
-                "destination": str(
-                    root_dir
-                    / operation["destination_folder"]
-                    / (
-                        operation.get("source", "").split("/")[-1]
-                        if operation.get("source")
-                        else "unknown"
-                    )
-                ),
-                "memory_type": operation.get("memory_type", "unknown"),
-                "description": operation.get("description", ""),
-                "status": "success",
-                "recycled": True,
-            }
-            for operation in operations
-        ]
+    Args:
+        root_dir: Root directory for resolving relative paths
+        workers: Number of worker threads
+        non_interactive: If True, do not ask before recycling
 
-        report = generate_operation_report(
-            operations, successful_ops, [], Path(args.report_file)
-        )
+    Returns:
+        True if the run was completed (or there was nothing to resume), False otherwise
+    """
+    global journal, fast_move_enabled, dedupe_enabled
+    global delta_versions_enabled, delta_keyframe_interval
 
-    trigger_garbage_collection()
-    sys.exit(0)
+    journal_path = script_dir / JOURNAL_FILENAME
+    run = OperationJournal.replay(journal_path)
+    if run is None:
+        print_info("No interrupted run to resume.")
+        return True
+
+    if run.get("root_dir") != str(root_dir):
+        print_error(f"Journal belongs to a different memory bank: {run.get('root_dir')}")
+        return False
+
+    operations = run["operations"]
+    options = run.get("options", {})
+
+    # Copy the way the interrupted run did
+    fast_move_enabled = options.get("fast_move", fast_move_enabled)
+    dedupe_enabled = options.get("dedupe", dedupe_enabled)
+    delta_versions_enabled = options.get("delta_versions", delta_versions_enabled)
+    delta_keyframe_interval = options.get(
+        "delta_keyframe_interval", delta_keyframe_interval
+    )
+    set_copy_backend(options.get("copy_backend", copy_backend))
+
+    state_counts = {state: 0 for state in JOURNAL_STATES}
+    for operation in operations:
+        state_counts[operation.get("journal_state", "planned")] += 1
+    print_info(
+        f"Resuming run from {run.get('time', 'unknown')}: "
+        + ", ".join(f"{count} {state}" for state, count in state_counts.items())
+    )
+
+    journal = OperationJournal(journal_path)
+    atexit.register(journal.close)
+
+    print_header("CHECKING COMPLETED COPIES")
+    to_copy, to_recycle, unrecoverable = _sort_resumed_operations(operations, root_dir)
+    journal.sync()
+    if unrecoverable:
+        return False
+
+    if to_copy:
+        print_header("PERFORMING REMAINING FILE COPYING OPERATIONS")
+        if not perform_operations(
+            to_copy,
+            root_dir,
+            True,
+            options.get("organize_by_category", False),
+            options.get("category_detection", "smart"),
+            workers,
+        ):
+            return False
+        journal.sync()
+
+        print_header("VERIFYING FILE COPYING OPERATIONS")
+        if not verify_operations(to_copy, root_dir, workers):
+            return False
+        journal.sync()
+
+    remaining = to_recycle + to_copy
+    if remaining:
+        if not get_user_confirmation(
+            "Do you want to move the original files to the recycle bin?",
+            non_interactive,
+        ):
+            print_info("Recycling cancelled by user. Run with --resume to continue later.")
+            return True
+
+        print_header("MOVING ORIGINAL FILES TO RECYCLE BIN")
+        if not process_recycling_operations(remaining, root_dir, False, workers):
+            return False
+
+    journal.finish()
+    journal = None
+    print_success("Interrupted run completed.")
+    return True
 
 
+@timed_phase("dry_run")
 def run_dry_run(
     operations: list[dict[str, Any]],
     root_dir: Path,
@@ -1935,28 +7535,23 @@ def run_dry_run(
         True if all operations would succeed, False otherwise
     """
     print_info(f"Performing dry run of {len(operations)} operations...")
-    logger.info(f"Performing dry run of {len(operations)} operations...")
 
     any_failure = False
 
     for operation in operations:
         if "operation_type" in operation and operation["operation_type"] == "move":
-            if organize_by_category:
-                # Add category information based on the file
-                source_path = root_dir / operation["source"]
-                if source_path.exists():
-                    category = determine_file_category(source_path, category_detection)
-                    operation["category"] = category
-                    print_info(f"Detected category for {source_path.name}: {category}")
-                else:
-                    print_warning(f"Source file does not exist: {source_path}")
-                    any_failure = True
-                    continue
-            else:
+            source_path = root_dir / operation["source"]
+            if not source_path.exists():
                 print_warning(f"Source file does not exist: {source_path}")
                 any_failure = True
                 continue
 
+            if organize_by_category and "destination_path" not in operation:
+                # Add category information based on the file
+                category = determine_file_category(source_path, category_detection)
+                operation["category"] = category
+                print_info(f"Detected category for {source_path.name}: {category}")
+
         # Process the operation in dry run mode
         success = process_operation(
             operation, True, root_dir, force_overwrite, organize_by_category
@@ -1966,20 +7561,140 @@ def run_dry_run(
 
     if any_failure:
         print_warning("Some operations would fail.")
-        logger.warning("Dry run: Some operations would fail.")
     else:
         print_success("All operations would succeed.")
-        logger.info("Dry run: All operations would succeed.")
 
     return not any_failure
 
 
+def _operation_lane_key(operation: dict[str, Any]) -> str:
+    """
+    Key operations that must not run concurrently with each other.
+
+    Operations writing the same file name into the same destination folder
+    (and therefore possibly the same destination path) share a lane.
+    """
+    return f"{operation.get('destination_folder', '')}|{Path(operation.get('source', '')).name}"
+
+
+def run_parallel_operations(
+    operations: list[dict[str, Any]],
+    handler: Callable[[dict[str, Any]], bool],
+    workers: int,
+    lane_key: Callable[[dict[str, Any]], str] | None = None,
+) -> list[bool]:
+    """
+    Run a handler over operations on a bounded thread pool.
+
+    Operations that share a lane key run sequentially, in order, on the same
+    worker. Console output and log records of each operation are captured and
+    replayed in operation order, so output is identical to a serial run.
+
+    Args:
+        operations: Operations to process
+        handler: Function processing one operation, returning True on success
+        workers: Maximum number of worker threads
+        lane_key: Function mapping an operation to its lane (default: one lane per operation)
+
+    Returns:
+        Success flag for each operation, in operation order
+    """
+    if workers <= 1 or len(operations) <= 1:
+        return [handler(operation) for operation in operations]
+
+    import queue
+    from concurrent.futures import ThreadPoolExecutor
+
+    if _capture_filter not in logger.filters:
+        logger.addFilter(_capture_filter)
+
+    lanes: dict[str, list[int]] = {}
+    for index, operation in enumerate(operations):
+        key = lane_key(operation) if lane_key else str(index)
+        lanes.setdefault(key, []).append(index)
+
+    completed: queue.Queue = queue.Queue()
+
+    def run_lane(indices: list[int]) -> None:
+        for index in indices:
+            _output_capture.lines = []
+            try:
+                success = bool(handler(operations[index]))
+            except Exception as e:
+                handle_exception(
+                    e, f"Error processing {operations[index].get('source', 'operation')}"
+                )
+                success = False
+            finally:
+                lines = _output_capture.lines
+                _output_capture.lines = None
+            completed.put((index, success, lines))
+
+    results: list[bool] = [False] * len(operations)
+    pending_output: dict[int, list[str | logging.LogRecord]] = {}
+    next_index = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_lane, indices) for indices in lanes.values()]
+
+        # Replay output as soon as every earlier operation has finished
+        for _ in range(len(operations)):
+            index, success, lines = completed.get()
+            results[index] = success
+            pending_output[index] = lines
+            while next_index in pending_output:
+                _replay_output(pending_output.pop(next_index))
+                next_index += 1
+
+        for future in futures:
+            future.result()
+
+    return results
+
+
+def _perform_single_operation(
+    operation: dict[str, Any],
+    root_dir: Path,
+    force_overwrite: bool,
+    organize_by_category: bool,
+    category_detection: str,
+) -> bool:
+    """Internal function to perform one operation for perform_operations."""
+    with operation_log_context(operation, "copy"):
+        if "operation_type" in operation and operation["operation_type"] == "move":
+            if organize_by_category and "destination_path" not in operation:
+                # Add category information based on the file
+                source_path = root_dir / operation["source"]
+                if source_path.exists():
+                    category = determine_file_category(source_path, category_detection)
+                    operation["category"] = category
+                    print_info(
+                        f"Using category for {source_path.name}: {category}",
+                        detail=True,
+                    )
+                else:
+                    print_warning(f"Source file does not exist: {source_path}")
+                    return False
+
+        # Process the operation
+        success = process_operation(
+            operation, False, root_dir, force_overwrite, organize_by_category
+        )
+        if success:
+            journal_record(operation, "copied")
+            if "destination" in operation:
+                update_search_index([Path(operation["destination"])])
+        return success
+
+
+@timed_phase("perform")
 def perform_operations(
     operations: list[dict[str, Any]],
     root_dir: Path,
     force_overwrite: bool,
     organize_by_category: bool,
     category_detection: str,
+    workers: int = 1,
 ) -> bool:
     """
     Perform all operations.
@@ -1990,88 +7705,176 @@ def perform_operations(
         force_overwrite: If True, allow overwriting of existing files
         organize_by_category: If True, organize files into category folders
         category_detection: Method for detecting file categories
+        workers: Number of worker threads (1 runs operations one at a time)
 
     Returns:
         True if all operations succeeded, False otherwise
     """
     print_info(f"Performing {len(operations)} operations...")
-    logger.info(f"Performing {len(operations)} operations...")
 
     any_failure = False
 
-    for i, operation in enumerate(operations):
-        if "operation_type" in operation and operation["operation_type"] == "move":
-            if organize_by_category:
-                # Add category information based on the file
-                source_path = root_dir / operation["source"]
-                if source_path.exists():
-                    category = determine_file_category(source_path, category_detection)
-                    operation["category"] = category
-                    print_info(f"Using category for {source_path.name}: {category}")
-                else:
-                    print_warning(f"Source file does not exist: {source_path}")
-                    any_failure = True
-                    continue
-
-        # Process the operation
-        success = process_operation(
-            operation, False, root_dir, force_overwrite, organize_by_category
+    if workers > 1:
+        results = run_parallel_operations(
+            operations,
+            lambda operation: _perform_single_operation(
+                operation,
+                root_dir,
+                force_overwrite,
+                organize_by_category,
+                category_detection,
+            ),
+            workers,
+            _operation_lane_key,
         )
-        if not success:
-            any_failure = True
+        any_failure = not all(results)
+    else:
+        for i, operation in enumerate(operations):
+            success = _perform_single_operation(
+                operation,
+                root_dir,
+                force_overwrite,
+                organize_by_category,
+                category_detection,
+            )
+            if not success:
+                any_failure = True
 
-        # Free up memory periodically
-        if (i + 1) % 5 == 0:
-            trigger_garbage_collection()
+            # Free up memory periodically
+            if (i + 1) % 5 == 0:
+                trigger_garbage_collection()
+
+    if copy_backend_counts:
+        print_info(f"Copy backends used: {format_copy_backend_counts()}")
 
     if any_failure:
         print_warning("Some operations failed.")
-        logger.warning("Some operations failed.")
     else:
         print_success("All operations succeeded.")
-        logger.info("All operations succeeded.")
 
     return not any_failure
 
 
-def verify_operations(operations: list[dict[str, Any]], root_dir: Path) -> bool:
+@timed_phase("verify")
+def verify_operations(
+    operations: list[dict[str, Any]], root_dir: Path, workers: int = 1
+) -> bool:
     """
     Verify all operations were completed successfully.
 
     Args:
         operations: List of operations to verify
         root_dir: Root directory for resolving relative paths
+        workers: Number of worker threads (1 verifies operations one at a time)
 
     Returns:
         True if all operations verified successfully, False otherwise
     """
     print_info(f"Verifying {len(operations)} operations...")
-    logger.info(f"Verifying {len(operations)} operations...")
-
-    any_failure = False
 
-    for operation in operations:
-        if "operation_type" not in operation:
-            continue
-
-        # Only verify file copy operations
-        if operation["operation_type"] == "move":
-            success = verify_operation(operation, root_dir)
-            if not success:
-                any_failure = True
+    # Only verify file copy operations
+    move_operations = [
+        operation
+        for operation in operations
+        if operation.get("operation_type") == "move"
+    ]
+
+    results = run_parallel_operations(
+        move_operations,
+        lambda operation: _verify_and_record(operation, root_dir),
+        workers,
+    )
+    any_failure = not all(results)
 
     if any_failure:
         print_warning("Some operations could not be verified.")
-        logger.warning("Some operations could not be verified.")
     else:
         print_success("All operations verified successfully.")
-        logger.info("All operations verified successfully.")
 
     return not any_failure
 
 
+def _verify_and_record(operation: dict[str, Any], root_dir: Path) -> bool:
+    """Internal function to verify one operation and journal the result."""
+    with operation_log_context(operation, "verify"):
+        verified = verify_operation(operation, root_dir)
+    if verified:
+        journal_record(operation, "verified")
+    return verified
+
+
+def _recycle_operation_source(
+    operation: dict[str, Any], root_dir: Path, dry_run: bool
+) -> bool | Path:
+    """
+    Internal function to recycle the source file of one operation.
+
+    Sources that need to go to the recycle bin are returned rather than
+    recycled here, so that process_recycling_operations can recycle them
+    in batches.
+    """
+    with operation_log_context(operation, "recycle"):
+        recycled = _recycle_source_file(operation, root_dir, dry_run)
+    if recycled is True and not dry_run:
+        journal_record(operation, "recycled")
+    return recycled
+
+
+def _recycle_source_file(
+    operation: dict[str, Any], root_dir: Path, dry_run: bool
+) -> bool | Path:
+    """Internal function to unlink or skip a source, or return it for recycling."""
+    source_path = root_dir / operation["source"]
+
+    # Check if source exists before attempting to recycle
+    if not source_path.exists():
+        print_warning(f"Source file does not exist, skipping: {source_path}")
+        return True
+
+    # A hardlinked original shares its data with the archive copy, so it can
+    # simply be unlinked
+    destination = operation.get("destination")
+    if (
+        operation.get("linked")
+        and destination
+        and _is_same_file(source_path, Path(destination))
+    ):
+        if dry_run:
+            print_info(
+                f"[DRY RUN] Would unlink hardlinked original: {source_path}",
+                detail=True,
+            )
+            return True
+        return (
+            safe_operation(
+                _unlink_linked_original,
+                f"Error unlinking original: {source_path}",
+                source_path,
+            )
+            is not None
+        )
+
+    # Send to recycle bin
+    if dry_run:
+        return send_to_recycle_bin(source_path, dry_run)
+    return source_path
+
+
+def _unlink_linked_original(source_path: Path) -> bool:
+    """Internal function to remove an original that is hardlinked into the archive."""
+    source_path.unlink()
+    update_search_index([source_path])
+    success_msg = f"Unlinked original (kept in archive): {source_path}"
+    print_success(success_msg, detail=True)
+    return True
+
+
+@timed_phase("recycle")
 def process_recycling_operations(
-    operations: list[dict[str, Any]], root_dir: Path, dry_run: bool
+    operations: list[dict[str, Any]],
+    root_dir: Path,
+    dry_run: bool,
+    workers: int = 1,
 ) -> bool:
     """
     Process recycling operations, moving original files to the recycle bin.
@@ -2080,46 +7883,707 @@ def process_recycling_operations(
         operations: List of operations to process
         root_dir: Root directory for resolving relative paths
         dry_run: If True, only simulate operations
+        workers: Number of worker threads (1 recycles files one at a time)
 
     Returns:
         True if all recycling operations succeeded, False otherwise
     """
     print_info(f"Processing {len(operations)} recycling operations...")
-    logger.info(f"Processing {len(operations)} recycling operations...")
-
-    any_failure = False
 
-    for operation in operations:
-        if "operation_type" not in operation:
-            continue
-
-        # Only move files to recycle bin for file copy operations
-        if operation["operation_type"] == "move":
-            source_path = root_dir / operation["source"]
+    # Only move files to recycle bin for file copy operations
+    move_operations = [
+        operation
+        for operation in operations
+        if operation.get("operation_type") == "move"
+    ]
+
+    # Unlink hardlinked originals and skip missing ones, collecting the
+    # sources that go to the recycle bin
+    to_recycle: dict[int, Path] = {}
+
+    def prepare(operation: dict[str, Any]) -> bool:
+        outcome = _recycle_operation_source(operation, root_dir, dry_run)
+        if isinstance(outcome, Path):
+            to_recycle[id(operation)] = outcome
+            return True
+        return outcome
 
-            # Check if source exists before attempting to recycle
-            if not source_path.exists():
-                print_warning(f"Source file does not exist, skipping: {source_path}")
-                logger.warning(f"Source file does not exist, skipping: {source_path}")
-                continue
+    results = run_parallel_operations(
+        move_operations,
+        prepare,
+        workers,
+        lambda operation: operation["source"],
+    )
+    any_failure = not all(results)
+
+    # Recycle the collected sources in batches, in operation order
+    if to_recycle:
+        operations_by_source: dict[Path, list[dict[str, Any]]] = {}
+        for operation in move_operations:
+            if id(operation) in to_recycle:
+                operations_by_source.setdefault(to_recycle[id(operation)], []).append(
+                    operation
+                )
 
-            # Send to recycle bin
-            success = send_to_recycle_bin(source_path, dry_run)
-            if not success:
+        sources = list(operations_by_source)
+        for source_path, recycled in zip(sources, send_files_to_recycle_bin(sources)):
+            if not recycled:
                 any_failure = True
+                continue
+            for operation in operations_by_source[source_path]:
+                journal_record(operation, "recycled")
 
     if any_failure:
         print_warning("Some files could not be moved to the recycle bin.")
-        logger.warning("Some files could not be moved to the recycle bin.")
     else:
         print_success("All files successfully moved to the recycle bin.")
-        logger.info("All files successfully moved to the recycle bin.")
 
     return not any_failure
 
 
-def configure_logging() -> None:
-    """Configure logging for the script."""
+PIPELINE_QUEUE_DEPTH = 2  # Operations buffered between stages, per worker
+
+
+class OperationPipeline:
+    """
+    Stream operations through version, copy, verify and recycle stages.
+
+    Instead of finishing each phase for every operation before starting the
+    next, each operation moves on as soon as its previous stage is done, so
+    scanning, copying, verification and recycling overlap. Stages are joined
+    by bounded asyncio queues, and blocking file work runs on a thread pool:
+    each of the version, copy and verify stages runs on up to `workers`
+    threads, and a single recycle stage sends sources to the recycle bin in
+    batches. Operations are pulled from their source only as fast as the
+    stages drain, so memory stays flat however many there are.
+
+    An operation that fails a stage is reported and goes no further; the
+    others carry on. The recycle stage opens only once the user confirms
+    recycling. When confirmation is interactive, that question is asked after
+    every copy has been verified, as in a serial run, and verified operations
+    wait in memory until then.
+    """
+
+    def __init__(
+        self,
+        root_dir: Path,
+        force_overwrite: bool = False,
+        organize_by_category: bool = False,
+        category_detection: str = "smart",
+        auto_version: bool = False,
+        workers: int = 1,
+        non_interactive: bool = False,
+        keep_completed: bool = False,
+    ) -> None:
+        self.root_dir = root_dir
+        self.force_overwrite = force_overwrite
+        self.organize_by_category = organize_by_category
+        self.category_detection = category_detection
+        self.auto_version = auto_version
+        self.workers = workers
+        self.non_interactive = non_interactive
+        self.keep_completed = keep_completed
+
+        self.counts = {
+            "planned": 0,
+            "copied": 0,
+            "verified": 0,
+            "recycled": 0,
+            "failed": 0,
+        }
+        self.recycle_confirmed = False
+        self.completed: list[dict[str, Any]] = []
+        self.succeeded: list[dict[str, Any]] = []
+        self.failed: list[dict[str, Any]] = []
+        self._writing: dict[str, Any] = {}
+        self._executor: Any = None
+
+    def run(self, operations: Iterable[dict[str, Any]]) -> bool:
+        """
+        Run operations through the pipeline.
+
+        Args:
+            operations: Operations to perform, consumed lazily
+
+        Returns:
+            True if every operation was copied, verified and recycled
+        """
+        import asyncio
+
+        return asyncio.run(self._run(iter(operations)))
+
+    async def _run(self, operations: Iterator[dict[str, Any]]) -> bool:
+        """Wire up the stages and wait for every operation to pass through."""
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+
+        if _capture_filter not in logger.filters:
+            logger.addFilter(_capture_filter)
+
+        depth = PIPELINE_QUEUE_DEPTH * self.workers
+        to_version: asyncio.Queue = asyncio.Queue(depth)
+        to_copy: asyncio.Queue = asyncio.Queue(depth)
+        to_verify: asyncio.Queue = asyncio.Queue(depth)
+        # Verified operations wait unbounded while an interactive user has
+        # not yet been asked about recycling
+        to_recycle: asyncio.Queue = asyncio.Queue(depth if self.non_interactive else 0)
+        verified_all = asyncio.Event()
+
+        async def scan() -> None:
+            # Operations may come from a generator that scans the memory bank
+            loop = asyncio.get_running_loop()
+            while True:
+                operation = await loop.run_in_executor(
+                    self._executor, next, operations, None
+                )
+                if operation is None:
+                    break
+                await to_version.put(operation)
+            for _ in range(self.workers):
+                await to_version.put(None)
+
+        async def stage(worker, inbox, outbox, readers) -> None:
+            await asyncio.gather(*(worker(inbox, outbox) for _ in range(self.workers)))
+            for _ in range(readers):
+                await outbox.put(None)
+
+        async def verify_stage() -> None:
+            await stage(self._verify_worker, to_verify, to_recycle, 1)
+            verified_all.set()
+
+        self._executor = ThreadPoolExecutor(max_workers=3 * self.workers + 2)
+        try:
+            await asyncio.gather(
+                scan(),
+                stage(self._version_worker, to_version, to_copy, self.workers),
+                stage(self._copy_worker, to_copy, to_verify, self.workers),
+                verify_stage(),
+                self._recycle_worker(to_recycle, verified_all),
+            )
+        finally:
+            self._executor.shutdown()
+
+        return self.counts["failed"] == 0 and self.recycle_confirmed
+
+    async def _call(self, handler: Callable[..., T], *args: Any) -> T | None:
+        """
+        Run a blocking handler on the thread pool, then replay its output.
+
+        Returns:
+            The handler's result, or None if it raised
+        """
+        import asyncio
+
+        subject = args[0].get("source") if isinstance(args[0], dict) else None
+
+        def call() -> tuple[T | None, list[str | logging.LogRecord]]:
+            _output_capture.lines = []
+            try:
+                result = handler(*args)
+            except Exception as e:
+                handle_exception(e, f"Error processing {subject or 'operation'}")
+                result = None
+            finally:
+                lines = _output_capture.lines
+                _output_capture.lines = None
+            return result, lines
+
+        result, lines = await asyncio.get_running_loop().run_in_executor(
+            self._executor, call
+        )
+        _replay_output(lines)
+        return result
+
+    def _fail(self, operation: dict[str, Any], reason: str) -> None:
+        """Count an operation as failed and keep it for the report."""
+        self.counts["failed"] += 1
+        if self.keep_completed:
+            self.completed.append(operation)
+            self.failed.append({"source": operation.get("source"), "reason": reason})
+
+    def _prepare(self, operation: dict[str, Any]) -> dict[str, Any] | None:
+        """Version, compile and journal one operation; None if it would fail."""
+        source_path = self.root_dir / operation["source"]
+        if self.auto_version and source_path.exists():
+            memory_type = operation.get(
+                "memory_type", determine_memory_type(source_path)
+            )
+            versioned_path = create_versioned_file(
+                source_path, memory_type, True, self.root_dir
+            )
+            if versioned_path:
+                print_success(f"Created versioned copy: {versioned_path}")
+            else:
+                print_error(f"Failed to create versioned copy for: {source_path}")
+
+        compiled = compile_plan(
+            [operation],
+            self.root_dir,
+            self.organize_by_category,
+            self.category_detection,
+            self.force_overwrite,
+            include_hashes=False,
+        )["operations"][0]
+
+        problems = check_plan(
+            {
+                "operations": [compiled],
+                "options": {"force_overwrite": self.force_overwrite},
+            }
+        )
+        for problem in problems:
+            print_error(problem)
+        if problems:
+            return None
+
+        if journal is not None:
+            journal.add(compiled)
+        return compiled
+
+    async def _version_worker(self, inbox, outbox) -> None:
+        """Version and compile operations, passing on those that would succeed."""
+        while (operation := await inbox.get()) is not None:
+            compiled = await self._call(self._prepare, operation)
+            if compiled is None:
+                self._fail(operation, "Would fail (dry run)")
+                continue
+            self.counts["planned"] += 1
+            await outbox.put(compiled)
+
+    async def _copy_worker(self, inbox, outbox) -> None:
+        """Copy operations, one at a time per destination."""
+        import asyncio
+
+        while (operation := await inbox.get()) is not None:
+            destination = operation["destination_path"]
+            while destination in self._writing:
+                await self._writing[destination].wait()
+            writing = self._writing[destination] = asyncio.Event()
+            try:
+                copied = await self._call(
+                    _perform_single_operation,
+                    operation,
+                    self.root_dir,
+                    self.force_overwrite,
+                    self.organize_by_category,
+                    self.category_detection,
+                )
+            finally:
+                del self._writing[destination]
+                writing.set()
+
+            if not copied:
+                self._fail(operation, "Copy failed")
+                continue
+            self.counts["copied"] += 1
+            await outbox.put(operation)
+
+    async def _verify_worker(self, inbox, outbox) -> None:
+        """Verify copied operations."""
+        while (operation := await inbox.get()) is not None:
+            if not await self._call(_verify_and_record, operation, self.root_dir):
+                self._fail(operation, "Verification failed")
+                continue
+            self.counts["verified"] += 1
+            await outbox.put(operation)
+
+    async def _confirm_recycling(self, verified_all) -> bool:
+        """Ask whether verified sources may be recycled (the recycle checkpoint)."""
+        import asyncio
+
+        prompt = "Do you want to move the original files to the recycle bin?"
+        if self.non_interactive:
+            return get_user_confirmation(prompt, True)
+
+        await verified_all.wait()
+        if not self.counts["verified"]:
+            return True
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, get_user_confirmation, prompt, False
+        )
+
+    async def _recycle_worker(self, inbox, verified_all) -> None:
+        """Recycle verified sources in batches once recycling is confirmed."""
+        self.recycle_confirmed = await self._confirm_recycling(verified_all)
+        if not self.recycle_confirmed:
+            # The copies are verified and journaled; --resume recycles them later
+            while (operation := await inbox.get()) is not None:
+                self._done(operation)
+            return
+
+        batch: list[tuple[Path, dict[str, Any]]] = []
+        while True:
+            operation = await inbox.get()
+            if operation is not None:
+                outcome = await self._call(
+                    _recycle_operation_source, operation, self.root_dir, False
+                )
+                if isinstance(outcome, Path):
+                    batch.append((outcome, operation))
+                elif outcome:
+                    self.counts["recycled"] += 1
+                    self._done(operation)
+                else:
+                    self._fail(operation, "Recycling failed")
+
+            if batch and (operation is None or len(batch) >= RECYCLE_BATCH_SIZE):
+                await self._flush_recycle_batch(batch)
+                batch = []
+
+            if operation is None:
+                break
+
+    async def _flush_recycle_batch(
+        self, batch: list[tuple[Path, dict[str, Any]]]
+    ) -> None:
+        """Send a batch of sources to the recycle bin and journal the result."""
+        sources = [source_path for source_path, _ in batch]
+        recycled = await self._call(send_files_to_recycle_bin, sources)
+        for (_, operation), success in zip(batch, recycled or [False] * len(batch)):
+            if success:
+                journal_record(operation, "recycled")
+                self.counts["recycled"] += 1
+                self._done(operation)
+            else:
+                self._fail(operation, "Could not move source to the recycle bin")
+
+    def _done(self, operation: dict[str, Any]) -> None:
+        """Keep a successful operation for the report."""
+        if self.keep_completed:
+            self.completed.append(operation)
+            self.succeeded.append(operation)
+
+
+WATCH_BACKENDS = ["auto", "inotify", "poll"]
+WATCH_DEBOUNCE_SECONDS = 2.0  # Quiet time that ends a burst of changes
+WATCH_MAX_DELAY_SECONDS = 30.0  # Longest a burst may hold off processing
+WATCH_POLL_INTERVAL = 1.0  # Seconds between scans of the polling watcher
+
+
+class DirectoryWatcher(ABC):
+    """
+    Watch directory trees for changes to markdown files.
+
+    Each root is a (directory, depth) pair: the directory is watched along
+    with its subdirectories down to `depth` levels, including subdirectories
+    created later. Missing directories are skipped.
+    """
+
+    def __init__(self, roots: list[tuple[Path, int]]) -> None:
+        self.roots = roots
+
+    @abstractmethod
+    def wait(self, timeout: float | None) -> set[Path]:
+        """
+        Wait for changes.
+
+        Args:
+            timeout: Seconds to wait, or None to wait until something changes
+
+        Returns:
+            Changed markdown files and created or removed directories (empty
+            if the timeout passed first)
+        """
+
+    def collect(self, debounce: float) -> set[Path]:
+        """
+        Wait for a burst of changes and return it once it has gone quiet.
+
+        The burst ends when nothing has changed for `debounce` seconds, or
+        WATCH_MAX_DELAY_SECONDS after it began, so that steady writes cannot
+        hold off processing forever.
+
+        Args:
+            debounce: Seconds without changes that end a burst
+
+        Returns:
+            Every path changed during the burst
+        """
+        changed: set[Path] = set()
+        while not changed:
+            changed = self.wait(None)
+
+        deadline = time.monotonic() + WATCH_MAX_DELAY_SECONDS
+        while (remaining := deadline - time.monotonic()) > 0:
+            more = self.wait(min(debounce, remaining))
+            if not more:
+                break
+            changed |= more
+        return changed
+
+    def close(self) -> None:
+        """Release the watcher's resources."""
+
+
+class InotifyWatcher(DirectoryWatcher):
+    """Directory watcher using Linux inotify, called through libc."""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT_HEADER_SIZE = 16  # struct inotify_event: int wd; uint32 mask, cookie, len
+
+    def __init__(self, roots: list[tuple[Path, int]]) -> None:
+        import ctypes
+        import ctypes.util
+
+        super().__init__(roots)
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._watches: dict[int, tuple[Path, int]] = {}
+        try:
+            for directory, depth in roots:
+                self._add_tree(directory, depth)
+        except OSError:
+            self.close()
+            raise
+
+    def _add_tree(self, directory: Path, depth: int) -> None:
+        """Watch a directory and its subdirectories down to `depth` levels."""
+        import ctypes
+        import errno
+
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), self.WATCH_MASK
+        )
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error in (errno.ENOENT, errno.ENOTDIR):
+                return
+            raise OSError(error, f"Cannot watch {directory}: {os.strerror(error)}")
+        self._watches[wd] = (directory, depth)
+
+        if depth > 0:
+            listing = scan_directory(directory)
+            for subdirectory in listing.subdirectories if listing else []:
+                self._add_tree(subdirectory, depth - 1)
+
+    def wait(self, timeout: float | None) -> set[Path]:
+        import select
+        import struct
+
+        changed: set[Path] = set()
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return changed
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = struct.unpack_from("iIII", data, offset)
+            start = offset + self.EVENT_HEADER_SIZE
+            name = data[start : start + length]
+            offset = start + length
+
+            if mask & self.IN_Q_OVERFLOW:
+                # Events were dropped, so report every root for a full pass
+                changed.update(directory for directory, _ in self.roots)
+                continue
+            if mask & self.IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            if wd not in self._watches:
+                continue
+
+            directory, depth = self._watches[wd]
+            path = directory / os.fsdecode(name.rstrip(b"\0"))
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO) and depth > 0:
+                    self._add_tree(path, depth - 1)
+                changed.add(path)
+            elif path.suffix == ".md":
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher(DirectoryWatcher):
+    """
+    Portable directory watcher that compares periodic scans.
+
+    Each scan lists the watched directories and stats their markdown files;
+    a file counts as changed when it appears, disappears, or its size or
+    mtime changes.
+    """
+
+    def __init__(
+        self, roots: list[tuple[Path, int]], interval: float = WATCH_POLL_INTERVAL
+    ) -> None:
+        super().__init__(roots)
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int] | None]:
+        """Map each watched directory to None and each file to (size, mtime)."""
+        snapshot: dict[Path, tuple[int, int] | None] = {}
+        scanner = DirectoryScanner()
+        for root, depth in self.roots:
+            for directory, listing in scanner.walk(root, max_depth=depth):
+                snapshot[directory] = None
+                for scanned in listing.files:
+                    file_stat = scanned.stat()
+                    if file_stat is not None:
+                        snapshot[scanned.path] = (
+                            file_stat.st_size,
+                            file_stat.st_mtime_ns,
+                        )
+        return snapshot
+
+    def wait(self, timeout: float | None) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+
+            snapshot = self._scan()
+            changed = snapshot.keys() ^ self._snapshot.keys()
+            changed.update(
+                path
+                for path, state in snapshot.items()
+                if path in self._snapshot and self._snapshot[path] != state
+            )
+            self._snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+
+def get_directory_watcher(
+    roots: list[tuple[Path, int]], backend: str = "auto"
+) -> DirectoryWatcher:
+    """
+    Create a directory watcher, falling back to polling if inotify is unavailable.
+
+    Args:
+        roots: (directory, depth) pairs to watch
+        backend: "inotify", "poll", or "auto" for inotify where available
+
+    Returns:
+        The watcher
+    """
+    if backend != "poll" and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(roots)
+        except (AttributeError, OSError) as e:
+            message = f"inotify unavailable, polling for changes instead: {e}"
+            if backend == "inotify":
+                print_warning(message)
+            logger.info(message)
+    elif backend == "inotify":
+        print_warning("inotify is only available on Linux; polling for changes instead")
+    return PollingWatcher(roots)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Log formatter writing each record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for field in ("operation_id", "phase", "duration_ms"):
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _LogQueueHandler(logging.Handler):
+    """
+    Handler putting log records on a queue for a background QueueListener.
+
+    Like logging.handlers.QueueHandler, but the record's message and traceback
+    are rendered on the calling thread into separate fields, so the JSON log
+    keeps the exception apart from the message, and the current operation ID
+    is attached before the record leaves the thread.
+    """
+
+    def __init__(self, log_queue: Any) -> None:
+        super().__init__()
+        self.queue = log_queue
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            _stamp_operation(record)
+            prepared = copy.copy(record)
+            prepared.msg = record.getMessage()
+            prepared.args = None
+            if record.exc_info:
+                prepared.exc_text = logging.Formatter().formatException(
+                    record.exc_info
+                )
+            prepared.exc_info = None
+            self.queue.put_nowait(prepared)
+        except Exception:
+            self.handleError(record)
+
+
+class _ConsoleHandler(logging.Handler):
+    """
+    Console handler for warnings and errors logged without a print helper.
+
+    Records written through the print helpers are already on the console and
+    are skipped, so each message reaches the console once.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if getattr(record, "console", False):
+            return
+        if record.levelno >= logging.ERROR:
+            prefix, color = "✗ ERROR: ", Colors.RED
+        else:
+            prefix, color = "⚠ WARNING: ", Colors.YELLOW
+        try:
+            _emit(f"{color}{prefix}{record.getMessage()}{Colors.END}")
+        except Exception:
+            self.handleError(record)
+
+
+def configure_logging(log_format: str = "text") -> None:
+    """
+    Configure logging for the script.
+
+    Log records are put on a queue by the calling thread and written to the
+    rotating log file by a background listener, so worker threads never wait
+    on file I/O or on each other for the file handler's lock. The console is
+    written synchronously by the print helpers, so prompts and output keep
+    their order.
+
+    Args:
+        log_format: "text" for a plain log file, "json" for JSON lines
+    """
+    import queue
+    from logging.handlers import QueueListener, RotatingFileHandler
+
     global logs_dir
 
     # Create logs directory if it doesn't exist
@@ -2127,33 +8591,40 @@ def configure_logging() -> None:
         logs_dir.mkdir(parents=True, exist_ok=True)
 
     # Set up logging configuration
+    extension = "jsonl" if log_format == "json" else "log"
     log_file = (
-        logs_dir / f"memory_manager_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        logs_dir
+        / f"memory_manager_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
     )
 
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
 
-    # Create file handler
+    # Create file handler, fed from the queue
     file_handler = RotatingFileHandler(
-        log_file, maxBytes=1024 * 1024 * 5, backupCount=3
+        log_file, maxBytes=1024 * 1024 * 5, backupCount=3, encoding="utf-8"
     )
     file_handler.setLevel(logging.INFO)
+    if log_format == "json":
+        file_handler.setFormatter(JsonLinesFormatter())
+    else:
+        file_handler.setFormatter(
+            logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        )
 
-    # Create console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.WARNING)  # Only warnings and errors to console
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _LogQueueHandler(log_queue)
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
 
-    # Create formatter
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
+    # Warnings and errors logged without a print helper also go to the console
+    console_handler = _ConsoleHandler()
+    console_handler.setLevel(logging.WARNING)
 
     # Add handlers to root logger
-    root_logger.addHandler(file_handler)
+    root_logger.addHandler(queue_handler)
     root_logger.addHandler(console_handler)
 
     # Log starting message
@@ -2232,45 +8703,27 @@ def create_versioned_file(
         logger.error(f"Source file does not exist: {source_path}")
         return None
 
-    # Extract base name and determine current version
-    base_name = source_path.stem
+    # Determine the base name and current version
+    base_name, current_version = parse_version(source_path.stem)
     extension = source_path.suffix
 
-    # Parse current version if present
-    current_version = None
-    if "_v" in base_name:
-        base_parts = base_name.split("_v")
-        base_name = base_parts[0]
-        try:
-            version_str = base_parts[1]
-            if version_str:  # Check if version_str is not None or empty
-                version_parts = version_str.split(".")
-                if len(version_parts) == 2:
-                    current_version = (int(version_parts[0]), int(version_parts[1]))
-                else:
-                    current_version = (int(version_parts[0]), 0)
-        except (ValueError, IndexError):
-            current_version = None
-
-    # Determine new version
-    if current_version is None:
-        new_version = (1, 0)  # Start at v1.0
-    elif version_increment:
-        new_version = (
-            current_version[0],
-            current_version[1] + 1,
-        )  # Increment minor version
-    else:
-        new_version = current_version  # Keep same version
-
-    # Create new filename with version
-    new_filename = f"{base_name}_v{new_version[0]}.{new_version[1]}{extension}"
-
     # Determine target directory
     target_dir = root_dir / memory_type / "active"
     ensure_directory_exists(target_dir)
+    registry = get_version_registry(target_dir)
+
+    # Determine new version: the source's next minor version, moved past the
+    # newest existing version so that no existing version is overwritten
+    if version_increment:
+        new_version = registry.next_version(base_name)
+        if current_version is not None:
+            major, minor = current_version
+            new_version = max(new_version, (major, minor + 1))
+    else:
+        new_version = current_version or (1, 0)  # Keep same version
 
     # Create the target path
+    new_filename = f"{base_name}_v{new_version[0]}.{new_version[1]}{extension}"
     target_path = target_dir / new_filename
 
     # Copy the file
@@ -2280,17 +8733,22 @@ def create_versioned_file(
         "Error creating versioned file",
         source_path,
         target_path,
+        registry,
     )
 
 
-def _create_versioned_copy(source_path: Path, target_path: Path) -> Path:
+def _create_versioned_copy(
+    source_path: Path, target_path: Path, registry: VersionRegistry
+) -> Path:
     """Internal function to create a versioned copy of a file."""
-    shutil.copy2(source_path, target_path)
-    logger.info(f"Created versioned file: {target_path}")
-    print_success(f"Created versioned file: {target_path}")
+    backend, _ = copy_file_data(source_path, target_path)
+    registry.add(target_path)
+    logger.info(f"Created versioned file ({backend}): {target_path}")
+    print_success(f"Created versioned file: {target_path}", detail=True)
     return target_path
 
 
+@timed_phase("auto_detect")
 def auto_detect_files_to_archive(root_dir: Path | None = None) -> list[dict[str, str]]:
     """
     Automatically detect files that should be archived based on version patterns.
@@ -2301,179 +8759,363 @@ def auto_detect_files_to_archive(root_dir: Path | None = None) -> list[dict[str,
     Returns:
         List of operations for detected files
     """
+    return list(iter_files_to_archive(root_dir))
+
+
+def iter_files_to_archive(
+    root_dir: Path | None = None, memory_types: Iterable[str] | None = None
+) -> Iterator[dict[str, str]]:
+    """
+    Detect files to archive one memory type at a time, yielding operations.
+
+    Every version of a file except the newest is archived. Versions are
+    ordered by their `_vMAJOR.MINOR` suffix (see VersionRegistry), so no file
+    needs to be stat()ed.
+
+    Args:
+        root_dir: Root directory of the memory bank
+        memory_types: Memory types to scan (default: all)
+
+    Yields:
+        Operations for detected files, as each memory type is scanned
+    """
     if root_dir is None:
         root_dir = memory_bank_root
 
-    operations = []
+    catalog = get_catalog()
 
-    for memory_type in MEMORY_TYPES:
+    for memory_type in MEMORY_TYPES if memory_types is None else memory_types:
         active_dir = root_dir / memory_type / "active"
         archive_dir = root_dir / memory_type / "archive"
 
-        if not active_dir.exists():
-            continue
+        # List active files (from the catalog when available)
+        if catalog is not None:
+            if not active_dir.exists():
+                continue
+            active_files = [Path(row["path"]) for row in catalog.list_files(active_dir)]
+        else:
+            listing = scan_directory(active_dir)
+            if listing is None:
+                continue
+            active_files = [scanned.path for scanned in listing.files]
+
+        # For each base name with multiple versions, keep the newest version
+        # and archive the others
+        registry = VersionRegistry(active_files)
+        for base_name in registry.bases():
+            for file_to_archive in registry.superseded(base_name):
+                yield {
+                    "operation_type": "move",
+                    "source": str(file_to_archive.relative_to(root_dir)),
+                    "destination_folder": str(archive_dir.relative_to(root_dir)),
+                    "description": f"Archive older version of {base_name}",
+                    "memory_type": memory_type,
+                }
 
-        # Group files by base name
-        file_groups = {}
-        for file_path in active_dir.glob("*.md"):
-            base_name = file_path.stem
-            if "_v" in base_name:
-                base_name = base_name.split("_v")[0]
 
-            if base_name not in file_groups:
-                file_groups[base_name] = []
-            file_groups[base_name].append(file_path)
+REPORT_FORMATS = ["md", "json", "csv"]
+REPORT_FIELDS = [
+    "memory_type",
+    "source",
+    "destination",
+    "status",
+    "description",
+    "reason",
+]
+REPORT_STATUS_LABELS = {
+    "planned": "Planned",
+    "success": "✅ Success",
+    "failed": "❌ Failed",
+    "unknown": "❓ Unknown",
+}
+
+
+def report_format_for_file(
+    output_file: Path | None, report_format: str | None
+) -> str:
+    """
+    Pick the report format, inferring it from the file extension if not given.
 
-        # For each group with multiple versions, keep newest and archive others
-        for base_name, files in file_groups.items():
-            if len(files) <= 1:
-                continue
+    Args:
+        output_file: Path the report will be written to (if any)
+        report_format: Explicitly requested format (md, json or csv)
 
-            # Sort by version, newest first
-            files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+    Returns:
+        Report format
+    """
+    if report_format:
+        return report_format
+    if output_file is not None:
+        suffix = output_file.suffix.lower().lstrip(".")
+        if suffix in REPORT_FORMATS:
+            return suffix
+    return "md"
 
-            # Keep the newest file, archive others
-            for file_to_archive in files[1:]:
-                operations.append(
-                    {
-                        "operation_type": "move",
-                        "source": str(file_to_archive.relative_to(root_dir)),
-                        "destination_folder": str(archive_dir.relative_to(root_dir)),
-                        "description": f"Archive older version of {base_name}",
-                        "memory_type": memory_type,
-                    }
-                )
 
-    return operations
+def _report_key(source: str, root_dir: Path | None) -> str:
+    """Normalize an operation source so relative and absolute paths match."""
+    if root_dir is None:
+        return source
+    return str(root_dir / source)
 
 
-def generate_operation_report(
+def _build_status_index(
+    successful_ops: list[dict[str, Any]] | None,
+    failed_ops: list[dict[str, Any]] | None,
+    root_dir: Path | None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Index operation results by source path.
+
+    Successful results take precedence over failed ones for the same source.
+
+    Args:
+        successful_ops: List of successful operations
+        failed_ops: List of failed operations
+        root_dir: Root directory for resolving relative source paths
+
+    Returns:
+        Dict mapping normalized source path to its result record
+    """
+    index: dict[str, dict[str, Any]] = {}
+    for status, results in (("failed", failed_ops), ("success", successful_ops)):
+        for result in results or []:
+            source = result.get("source")
+            if source is not None:
+                index[_report_key(source, root_dir)] = {
+                    "status": status,
+                    "reason": result.get("reason", ""),
+                }
+    return index
+
+
+def _iter_report_rows(
     operations: list[dict[str, Any]],
-    successful_ops: list[dict[str, Any]] | None = None,
-    failed_ops: list[dict[str, Any]] | None = None,
-    output_file: Path | None = None,
-) -> str:
+    status_index: dict[str, dict[str, Any]] | None,
+    root_dir: Path | None,
+) -> Iterator[dict[str, Any]]:
     """
-    Generate a markdown report of all operations.
+    Yield one flat report row per operation.
 
     Args:
         operations: List of all operations
-        successful_ops: List of successful operations (if None, reports as planned)
-        failed_ops: List of failed operations (if None, not included)
-        output_file: Path to write the report to (if None, not written to file)
+        status_index: Result index from _build_status_index (None when planned)
+        root_dir: Root directory for resolving relative source paths
 
-    Returns:
-        Report as a string
+    Yields:
+        Dict with the REPORT_FIELDS of an operation
     """
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    for op in operations:
+        source = op.get("source", "N/A")
+        dest = op.get("destination", "N/A")
+        if dest == "N/A" and "destination_folder" in op:
+            dest = op.get("destination_folder", "N/A")
 
-    if successful_ops is None and failed_ops is None:
-        status = "📋 Planned"
-    elif failed_ops and len(failed_ops) > 0:
-        status = "⚠️ Partially Completed"
-    else:
-        status = "✅ Completed"
+        if status_index is None:
+            result = {"status": "planned", "reason": ""}
+        else:
+            result = status_index.get(
+                _report_key(source, root_dir), {"status": "unknown", "reason": ""}
+            )
+
+        yield {
+            "memory_type": op.get("memory_type", "unknown"),
+            "source": source,
+            "destination": dest,
+            "status": result["status"],
+            "description": op.get("description", ""),
+            "reason": result["reason"],
+        }
 
-    # Create report header
-    report = f"""# Memory Bank Operations Report
 
-**Generated:** {timestamp}
-**Status:** {status}
+def _write_markdown_report(
+    out: TextIO,
+    operations: list[dict[str, Any]],
+    status_index: dict[str, dict[str, Any]] | None,
+    summary: dict[str, Any],
+    failed_ops: list[dict[str, Any]] | None,
+    root_dir: Path | None,
+) -> None:
+    """Stream a markdown report to a text stream."""
+    out.write(
+        f"""# Memory Bank Operations Report
+
+**Generated:** {summary["generated"]}
+**Status:** {summary["status_label"]}
 
 ## Summary
 
 """
+    )
 
-    # Add summary statistics
-    total_ops = len(operations)
-    successful_count = len(successful_ops) if successful_ops is not None else 0
-    failed_count = len(failed_ops) if failed_ops is not None else 0
-
-    if successful_ops is None and failed_ops is None:
-        report += f"- **Planned Operations:** {total_ops}\n"
+    if status_index is None:
+        out.write(f"- **Planned Operations:** {summary['total']}\n")
     else:
-        report += f"- **Total Operations:** {total_ops}\n"
-        report += f"- **Successful Operations:** {successful_count}\n"
-        if failed_count > 0:
-            report += f"- **Failed Operations:** {failed_count}\n"
+        out.write(f"- **Total Operations:** {summary['total']}\n")
+        out.write(f"- **Successful Operations:** {summary['successful']}\n")
+        if summary["failed"] > 0:
+            out.write(f"- **Failed Operations:** {summary['failed']}\n")
 
-    # Group operations by memory type
+    # Group operations by memory type, keeping first-seen order
     memory_type_groups: dict[str, list[dict[str, Any]]] = {}
     for op in operations:
-        memory_type = op.get("memory_type", "unknown")
-        if memory_type not in memory_type_groups:
-            memory_type_groups[memory_type] = []
-        memory_type_groups[memory_type].append(op)
+        memory_type_groups.setdefault(op.get("memory_type", "unknown"), []).append(op)
 
-    # Add operation details by memory type
-    report += "\n## Operations by Memory Type\n\n"
+    out.write("\n## Operations by Memory Type\n\n")
 
     for memory_type, ops in memory_type_groups.items():
-        report += f"### {memory_type.capitalize()} Memory\n\n"
+        out.write(f"### {memory_type.capitalize()} Memory\n\n")
+        out.write("| Source | Destination | Status | Description |\n")
+        out.write("|--------|-------------|--------|-------------|\n")
+
+        for row in _iter_report_rows(ops, status_index, root_dir):
+            out.write(
+                f"| {row['source']} | {row['destination']} | "
+                f"{REPORT_STATUS_LABELS[row['status']]} | {row['description']} |\n"
+            )
 
-        if len(ops) == 0:
-            report += "No operations planned or executed.\n\n"
-            continue
+        out.write("\n")
+
+    # Add failure details if any
+    if failed_ops:
+        out.write("## Failed Operations Details\n\n")
 
-        report += "| Source | Destination | Status | Description |\n"
-        report += "|--------|-------------|--------|-------------|\n"
+        for i, op in enumerate(failed_ops):
+            out.write(f"### Failure {i + 1}: {op.get('source', 'N/A')}\n\n")
+            out.write(f"**Reason:** {op.get('reason', 'Unknown reason')}\n\n")
 
-        for op in ops:
-            source = op.get("source", "N/A")
-            dest = op.get("destination", "N/A")
-            if dest == "N/A" and "destination_folder" in op:
-                dest = op.get("destination_folder", "N/A")
 
-            desc = op.get("description", "")
+def _write_json_report(
+    out: TextIO,
+    operations: list[dict[str, Any]],
+    status_index: dict[str, dict[str, Any]] | None,
+    summary: dict[str, Any],
+    failed_ops: list[dict[str, Any]] | None,
+    root_dir: Path | None,
+) -> None:
+    """Stream a JSON report to a text stream, one operation per line."""
+    out.write("{\n")
+    for key in ("generated", "status", "total", "successful", "failed"):
+        out.write(f'  "{key}": {json.dumps(summary[key])},\n')
+
+    out.write('  "operations": [')
+    for i, row in enumerate(_iter_report_rows(operations, status_index, root_dir)):
+        out.write(",\n    " if i else "\n    ")
+        out.write(json.dumps(row, ensure_ascii=False))
+    out.write("\n  ]\n}\n")
+
+
+def _write_csv_report(
+    out: TextIO,
+    operations: list[dict[str, Any]],
+    status_index: dict[str, dict[str, Any]] | None,
+    summary: dict[str, Any],
+    failed_ops: list[dict[str, Any]] | None,
+    root_dir: Path | None,
+) -> None:
+    """Stream a CSV report to a text stream, one operation per row."""
+    import csv
 
-            # Determine status
-            if successful_ops is None and failed_ops is None:
-                status = "Planned"
-            elif successful_ops and any(
-                s.get("source") == source for s in successful_ops
-            ):
-                status = "✅ Success"
-            elif failed_ops and any(f.get("source") == source for f in failed_ops):
-                status = "❌ Failed"
-            else:
-                status = "❓ Unknown"
+    writer = csv.DictWriter(out, fieldnames=REPORT_FIELDS)
+    writer.writeheader()
+    for row in _iter_report_rows(operations, status_index, root_dir):
+        writer.writerow(row)
 
-            report += f"| {source} | {dest} | {status} | {desc} |\n"
 
-        report += "\n"
+_REPORT_WRITERS = {
+    "md": _write_markdown_report,
+    "json": _write_json_report,
+    "csv": _write_csv_report,
+}
 
-    # Add failure details if any
-    if failed_ops and len(failed_ops) > 0:
-        report += "## Failed Operations Details\n\n"
 
-        for i, op in enumerate(failed_ops):
-            source = op.get("source", "N/A")
-            reason = op.get("reason", "Unknown reason")
+@timed_phase("report")
+def generate_operation_report(
+    operations: list[dict[str, Any]],
+    successful_ops: list[dict[str, Any]] | None = None,
+    failed_ops: list[dict[str, Any]] | None = None,
+    output_file: Path | None = None,
+    report_format: str | None = None,
+    root_dir: Path | None = None,
+) -> str:
+    """
+    Generate a report of all operations in markdown, JSON or CSV.
 
-            report += f"### Failure {i + 1}: {source}\n\n"
-            report += f"**Reason:** {reason}\n\n"
+    The report is streamed straight to output_file when one is given, so it
+    is never held in memory as a whole. Operation statuses come from an index
+    of successful_ops and failed_ops keyed by source path.
+
+    Args:
+        operations: List of all operations
+        successful_ops: List of successful operations (if None, reports as planned)
+        failed_ops: List of failed operations (if None, not included)
+        output_file: Path to stream the report to (if None, returned as a string)
+        report_format: md, json or csv (if None, inferred from output_file)
+        root_dir: Root directory for matching relative operation sources
+            against absolute result sources
+
+    Returns:
+        Report as a string, or an empty string if it was written to output_file
+    """
+    report_format = report_format_for_file(output_file, report_format)
+    planned = successful_ops is None and failed_ops is None
+
+    if planned:
+        status, status_label = "planned", "📋 Planned"
+    elif failed_ops:
+        status, status_label = "partial", "⚠️ Partially Completed"
+    else:
+        status, status_label = "completed", "✅ Completed"
+
+    summary = {
+        "generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "status": status,
+        "status_label": status_label,
+        "total": len(operations),
+        "successful": len(successful_ops) if successful_ops is not None else 0,
+        "failed": len(failed_ops) if failed_ops is not None else 0,
+    }
+    status_index = (
+        None if planned else _build_status_index(successful_ops, failed_ops, root_dir)
+    )
+
+    def write_report(out: TextIO) -> None:
+        _REPORT_WRITERS[report_format](
+            out, operations, status_index, summary, failed_ops, root_dir
+        )
 
-    # Write report to file if requested
     if output_file:
         safe_file_operation(
             _write_report_to_file,
             output_file,
             "Error writing report to file",
             output_file,
-            report,
+            write_report,
         )
+        return ""
 
-    return report
+    buffer = io.StringIO()
+    write_report(buffer)
+    return buffer.getvalue()
 
 
-def _write_report_to_file(output_file: Path, report: str) -> bool:
-    """Internal function to write a report to a file."""
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(report)
-    logger.info(f"Operation report written to {output_file}")
+def _write_report_to_file(
+    output_file: Path, write_report: Callable[[TextIO], None]
+) -> bool:
+    """Internal function to stream a report to a file."""
+    with open(output_file, "w", encoding="utf-8", newline="") as f:
+        write_report(f)
     print_success(f"Operation report written to {output_file}")
     return True
 
 
 if __name__ == "__main__":
-    main()
+    exit_code = 1
+    try:
+        main()
+        exit_code = 0
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else int(e.code is not None)
+        raise
+    finally:
+        run_metrics.write(exit_code)
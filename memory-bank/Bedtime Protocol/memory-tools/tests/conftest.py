@@ -0,0 +1,60 @@
+"""Shared fixtures for the memory manager tests."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TOOLS_DIR))
+
+import memory_manager as mm  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def isolated_tool_dir(tmp_path, monkeypatch):
+    """Keep the tool's databases, journal and logs out of its real directory."""
+    monkeypatch.setattr(mm, "script_dir", tmp_path)
+    monkeypatch.setattr(mm, "logs_dir", tmp_path / "logs")
+    # The catalog and the search index are off unless a test asks for them
+    monkeypatch.setattr(mm, "catalog_enabled", False)
+    monkeypatch.setattr(mm, "_catalog", None)
+    monkeypatch.setattr(mm, "search_index_enabled", False)
+    monkeypatch.setattr(mm, "_search_index", None)
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    """A file catalog in a temporary directory, used as the shared catalog."""
+    catalog = mm.MemoryCatalog(tmp_path / mm.CATALOG_FILENAME)
+    monkeypatch.setattr(mm, "_catalog", catalog)
+    monkeypatch.setattr(mm, "catalog_enabled", True)
+    yield catalog
+    catalog.close()
+
+
+def write(path, text="note\n"):
+    """Write a UTF-8 text file, creating its directory, and return its path."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def memory_bank(tmp_path):
+    """An empty memory bank with active and archive directories."""
+    root = tmp_path / "memory-bank"
+    for memory_type in mm.MEMORY_TYPES:
+        (root / memory_type / "active").mkdir(parents=True)
+        (root / memory_type / "archive").mkdir(parents=True)
+    return root
+
+
+@pytest.fixture
+def search_index(tmp_path, monkeypatch):
+    """A search index in a temporary directory, used as the shared index."""
+    index = mm.SearchIndex(tmp_path / mm.SEARCH_INDEX_FILENAME)
+    monkeypatch.setattr(mm, "_search_index", index)
+    monkeypatch.setattr(mm, "search_index_enabled", True)
+    yield index
+    index.close()
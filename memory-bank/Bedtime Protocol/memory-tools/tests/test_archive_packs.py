@@ -0,0 +1,66 @@
+"""Round-trip and crash-recovery tests for the compressed archive packs."""
+
+import os
+
+import pytest
+
+import memory_manager as mm
+
+
+def write_notes(folder, count):
+    """Write count small notes into a folder."""
+    folder.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(count):
+        path = folder / f"note_{index}.md"
+        path.write_text(f"# Note {index}\n\n" + "text\n" * index, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma"])
+def test_members_round_trip(tmp_path, codec):
+    paths = write_notes(tmp_path, 5)
+    pack = mm.ArchivePack(tmp_path)
+    for path in paths:
+        pack.add(path, codec)
+
+    reloaded = mm.ArchivePack(tmp_path)
+    assert reloaded.names() == sorted(path.name for path in paths)
+    for path in paths:
+        assert reloaded.read(path.name) == path.read_bytes()
+
+
+def test_append_after_torn_index_tail_keeps_every_member(tmp_path):
+    paths = write_notes(tmp_path, 3)
+    pack = mm.ArchivePack(tmp_path)
+    for path in paths[:2]:
+        pack.add(path)
+
+    # An index append interrupted halfway through its line
+    with open(tmp_path / mm.PACK_INDEX_FILENAME, "ab") as f:
+        f.write(b'{"name": "note_9.md", "offset": 12')
+
+    pack = mm.ArchivePack(tmp_path)
+    pack.add(paths[2])
+
+    reloaded = mm.ArchivePack(tmp_path)
+    assert reloaded.names() == sorted(path.name for path in paths)
+    for path in paths:
+        assert reloaded.read(path.name) == path.read_bytes()
+
+
+def test_packed_files_read_back_through_the_archive(tmp_path):
+    category_dir = tmp_path / "semantic" / "archive" / "concepts"
+    paths = write_notes(category_dir, 4)
+    contents = {path: path.read_bytes() for path in paths}
+    for path in paths:
+        os.utime(path, (0, 0))
+
+    successful, failed = mm.pack_cold_archive_files(tmp_path, dry_run=False)
+
+    assert not failed and len(successful) == len(paths)
+    for path, content in contents.items():
+        assert not path.exists()
+        assert mm.archive_file_exists(path)
+        assert mm.read_archived_file(path) == content
@@ -0,0 +1,57 @@
+"""Tests for the persistent file catalog."""
+
+import os
+
+import memory_manager as mm
+
+
+def catalogued(catalog, directory):
+    """Return the names of the catalogued files in a directory."""
+    return [row["name"] for row in catalog.list_files(directory)]
+
+
+def test_refresh_tracks_added_and_removed_files(catalog, memory_bank):
+    active = memory_bank / "core" / "active"
+    (active / "progress.md").write_text("# Progress\n", encoding="utf-8")
+    catalog.refresh(memory_bank)
+    assert catalogued(catalog, active) == ["progress.md"]
+
+    (active / "notes.md").write_text("# Notes\n", encoding="utf-8")
+    (active / "progress.md").unlink()
+    assert catalogued(catalog, active) == ["notes.md"]
+
+
+def test_catalog_persists_across_reopening(tmp_path, memory_bank):
+    active = memory_bank / "core" / "active"
+    path = active / "progress.md"
+    path.write_text("# Progress\n", encoding="utf-8")
+
+    db_path = tmp_path / "reopened.db"
+    catalog = mm.MemoryCatalog(db_path)
+    content_hash = catalog.file_hash(path)
+    catalog.close()
+
+    reopened = mm.MemoryCatalog(db_path)
+    try:
+        assert catalogued(reopened, active) == ["progress.md"]
+        assert reopened.known_hash(path) == content_hash == mm.compute_file_hash(path)
+    finally:
+        reopened.close()
+
+
+def test_in_place_edit_never_serves_a_stale_hash(catalog, memory_bank):
+    active = memory_bank / "core" / "active"
+    path = active / "progress.md"
+    path.write_text("# Progress\n", encoding="utf-8")
+    catalog.refresh(memory_bank)
+    catalog.file_hash(path)
+    directory_mtime = os.stat(active).st_mtime_ns
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("- a milestone reached\n")
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+    assert os.stat(active).st_mtime_ns == directory_mtime
+
+    catalog.refresh(memory_bank)
+    assert catalog.known_hash(path) is None
+    assert catalog.file_hash(path) == mm.compute_file_hash(path)
@@ -0,0 +1,61 @@
+"""Round-trip tests for the content-addressed archive blob store."""
+
+import os
+
+import memory_manager as mm
+from conftest import write
+
+NOTE = "# Decision\n\nWe decided to keep the kafka streams design.\n"
+
+
+def test_duplicates_are_linked_to_one_blob(catalog, memory_bank):
+    archive = memory_bank / "episodic" / "archive"
+    paths = [write(archive / f"decision_{n}.md", NOTE) for n in range(3)]
+    write(archive / "other.md", "# Other\n\nsomething else\n")
+
+    stats = mm.dedupe_archive(memory_bank, dry_run=False)
+    assert stats["linked"] == 2
+    assert stats["bytes_reclaimed"] == 2 * len(NOTE)
+
+    blob = mm.get_blob_store(memory_bank).blob_path(mm.compute_file_hash(paths[0]))
+    assert os.stat(blob).st_nlink == 4
+    for path in paths:
+        assert os.path.samefile(path, blob)
+        assert path.read_text(encoding="utf-8") == NOTE
+
+
+def test_reorganizing_keeps_links_to_blobs(catalog, memory_bank):
+    archive = memory_bank / "episodic" / "archive"
+    paths = [write(archive / f"decision_{n}.md", NOTE) for n in range(2)]
+    mm.dedupe_archive(memory_bank, dry_run=False)
+    blob = mm.get_blob_store(memory_bank).blob_path(mm.compute_file_hash(paths[0]))
+
+    analysis = mm.analyze_long_term_memory(memory_bank)["memory_types"]["episodic"]
+    successful, failed = mm.reorganize_existing_files(archive, analysis, False)
+    assert len(successful) == 2 and not failed
+    for operation in successful:
+        destination = operation["destination"]
+        assert os.path.dirname(destination) != str(archive)
+        assert os.path.samefile(destination, blob)
+    assert os.stat(blob).st_nlink == 3
+    assert mm.get_blob_store(memory_bank).prune() == 0
+
+
+def test_overwriting_a_deduplicated_entry_leaves_its_blob_alone(
+    tmp_path, catalog, memory_bank
+):
+    archive = memory_bank / "episodic" / "archive"
+    paths = [write(archive / f"decision_{n}.md", NOTE) for n in range(3)]
+    mm.dedupe_archive(memory_bank, dry_run=False)
+    content_hash = mm.compute_file_hash(paths[0])
+    blob = mm.get_blob_store(memory_bank).blob_path(content_hash)
+
+    new_source = write(tmp_path / "decision_new.md", "# Decision\n\nrevised\n")
+    assert mm.safe_copy_file(new_source, paths[0], False, True)
+
+    assert paths[0].read_text(encoding="utf-8") == "# Decision\n\nrevised\n"
+    assert not os.path.samefile(paths[0], blob)
+    for path in paths[1:]:
+        assert path.read_text(encoding="utf-8") == NOTE
+        assert os.path.samefile(path, blob)
+    assert mm.compute_file_hash(blob) == content_hash
@@ -0,0 +1,24 @@
+"""Import-time budget and side-effect checks for memory_manager."""
+
+import py_compile
+
+from benchmarks.import_time import (
+    DEFAULT_BUDGET_MS,
+    TOOLS_DIR,
+    measure_import_ms,
+    snapshot_tree,
+)
+
+
+def test_import_is_within_budget_and_creates_no_files():
+    # Compile the bytecode up front (even under PYTHONDONTWRITEBYTECODE), so
+    # compilation is not part of the measurement
+    py_compile.compile(str(TOOLS_DIR / "memory_manager.py"), doraise=True)
+    measure_import_ms()
+
+    before = snapshot_tree(TOOLS_DIR)
+    best = min(measure_import_ms() for _ in range(3))
+    created = snapshot_tree(TOOLS_DIR) - before
+
+    assert best <= DEFAULT_BUDGET_MS, f"import took {best:.1f} ms"
+    assert not created, f"importing memory_manager created {sorted(created)}"
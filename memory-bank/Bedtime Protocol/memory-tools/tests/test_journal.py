@@ -0,0 +1,109 @@
+"""Replay and resume tests for the write-ahead operation journal."""
+
+import os
+import shutil
+
+import pytest
+
+import memory_manager as mm
+
+
+@pytest.fixture
+def bank_run(tmp_path, monkeypatch, catalog, search_index, memory_bank):
+    """Point the script at a temporary memory bank, journal and trash."""
+    monkeypatch.setattr(mm, "memory_bank_root", memory_bank)
+    monkeypatch.setattr(mm, "journal", None)
+    monkeypatch.setattr(mm, "_recycle_backend", None)
+    monkeypatch.setattr(mm, "copy_backend", "auto")
+    monkeypatch.setattr(mm, "delta_keyframe_interval", 10)
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    return memory_bank
+
+
+def archive_operations(root, names):
+    operations = []
+    for name in names:
+        source = root / "core" / "active" / name
+        source.write_text(f"# {name}\n\nold version\n", encoding="utf-8")
+        operations.append(
+            {
+                "operation_type": "move",
+                "source": f"core/active/{name}",
+                "destination_folder": "core/archive",
+                "memory_type": "core",
+            }
+        )
+    return mm.compile_plan(operations, root, include_hashes=False)["operations"]
+
+
+def test_replay_restores_the_last_state_of_each_operation(tmp_path, bank_run):
+    operations = archive_operations(bank_run, ["a_v1.0.md", "b_v1.0.md"])
+    journal_path = tmp_path / mm.JOURNAL_FILENAME
+    journal = mm.OperationJournal.start(journal_path, operations, {"force": False})
+    journal.record({**operations[0], "content_hash": "abc"}, "copied")
+    journal.record(operations[0], "verified")
+    journal.add({"source": "core/active/c_v1.0.md"})
+    journal.close()
+    # A record torn by a crash mid-write
+    with open(journal_path, "a", encoding="utf-8") as f:
+        f.write('{"event": "state", "id": 1, "sta')
+
+    run = mm.OperationJournal.replay(journal_path)
+    assert run["options"] == {"force": False}
+    assert run["root_dir"] == str(bank_run)
+    states = [operation["journal_state"] for operation in run["operations"]]
+    assert states == ["verified", "planned", "planned"]
+    assert run["operations"][0]["content_hash"] == "abc"
+    assert run["operations"][2]["journal_id"] == 2
+
+
+def test_resume_finishes_only_the_remaining_work(tmp_path, bank_run):
+    operations = archive_operations(bank_run, ["a_v1.0.md", "b_v1.0.md"])
+    journal_path = tmp_path / mm.JOURNAL_FILENAME
+    mm.set_copy_backend("buffered")
+    mm.delta_keyframe_interval = 7
+    journal = mm.start_journal(operations, {})
+
+    # The run died after copying the first file
+    copied = operations[0]
+    shutil.copy2(copied["source_path"], copied["destination_path"])
+    journal.record({**copied, "destination": copied["destination_path"]}, "copied")
+    journal.close()
+    copied_mtime = os.stat(copied["destination_path"]).st_mtime_ns
+    os.utime(copied["destination_path"], ns=(copied_mtime, copied_mtime - 10**9))
+
+    assert mm.resume_interrupted_run(bank_run, 1, True)
+    # The hash-verified copy was not made again
+    assert os.stat(copied["destination_path"]).st_mtime_ns == copied_mtime - 10**9
+    for operation in operations:
+        destination = bank_run / "core" / "archive" / operation["source"].split("/")[-1]
+        assert destination.read_text(encoding="utf-8").endswith("old version\n")
+        assert not (bank_run / operation["source"]).exists()
+    assert not journal_path.exists()
+    # The resumed run copied with the interrupted run's settings
+    assert (mm.copy_backend, mm.delta_keyframe_interval) == ("buffered", 7)
+
+
+def test_state_records_for_unknown_operations_are_ignored(tmp_path, bank_run):
+    operations = archive_operations(bank_run, ["a_v1.0.md"])
+    journal_path = tmp_path / mm.JOURNAL_FILENAME
+    journal = mm.OperationJournal.start(journal_path, operations, {})
+    journal._write({"event": "state", "id": 5, "state": "copied"})
+    journal._write({"event": "state", "id": "0", "state": "copied"})
+    journal.record(operations[0], "verified")
+    journal.close()
+
+    run = mm.OperationJournal.replay(journal_path)
+    assert [operation["journal_state"] for operation in run["operations"]] == [
+        "verified"
+    ]
+
+
+def test_leftover_journal_blocks_a_new_run_until_discarded(tmp_path, bank_run):
+    journal_path = tmp_path / mm.JOURNAL_FILENAME
+    mm.OperationJournal.start(journal_path, [], {}).close()
+
+    assert not mm.check_leftover_journal()
+    assert journal_path.exists()
+    assert mm.check_leftover_journal(discard=True)
+    assert not journal_path.exists()
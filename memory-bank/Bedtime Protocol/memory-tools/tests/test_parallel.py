@@ -0,0 +1,91 @@
+"""Tests for parallel operations and the operation pipeline."""
+
+import time
+
+import pytest
+
+import memory_manager as mm
+from conftest import write
+
+
+@pytest.fixture
+def bank_run(tmp_path, monkeypatch, memory_bank):
+    """Point the script at a temporary memory bank, journal and trash."""
+    monkeypatch.setattr(mm, "memory_bank_root", memory_bank)
+    monkeypatch.setattr(mm, "journal", None)
+    monkeypatch.setattr(mm, "_recycle_backend", None)
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    return memory_bank
+
+
+def test_parallel_results_and_output_follow_operation_order(capsys):
+    operations = [{"source": f"note_{n}.md", "index": n} for n in range(8)]
+
+    def handler(operation):
+        # Later operations finish first
+        time.sleep(0.002 * (8 - operation["index"]))
+        mm.print_info(f"handled {operation['source']}")
+        if operation["index"] == 5:
+            raise OSError("disk on fire")
+        return operation["index"] != 2
+
+    results = mm.run_parallel_operations(operations, handler, workers=4)
+    assert results == [True, True, False, True, True, False, True, True]
+
+    lines = [
+        line
+        for line in capsys.readouterr().out.splitlines()
+        if "note_" in line
+    ]
+    assert [line.split("note_")[1][0] for line in lines] == [
+        "0", "1", "2", "3", "4", "5", "5", "6", "7"
+    ]
+    assert "Error processing note_5.md: disk on fire" in lines[6]
+
+
+def test_pipeline_counts_and_journals_every_operation(tmp_path, bank_run):
+    active = bank_run / "core" / "active"
+    for name in ("progress", "activeContext", "techContext"):
+        write(active / f"{name}_v1.0.md", f"# {name}\n\nold\n")
+        write(active / f"{name}_v1.1.md", f"# {name}\n\nnew\n")
+    operations = [
+        {
+            "operation_type": "move",
+            "source": f"core/active/{name}_v1.0.md",
+            "destination_folder": "core/archive",
+            "memory_type": "core",
+        }
+        for name in ("progress", "activeContext", "techContext", "missing")
+    ]
+
+    mm.start_journal([], {})
+    pipeline = mm.OperationPipeline(
+        bank_run, workers=4, non_interactive=True, keep_completed=True
+    )
+    assert not pipeline.run(operations)
+    mm.journal.close()
+
+    assert pipeline.counts == {
+        "planned": 3,
+        "copied": 3,
+        "verified": 3,
+        "recycled": 3,
+        "failed": 1,
+    }
+    assert pipeline.failed == [
+        {"source": "core/active/missing_v1.0.md", "reason": "Would fail (dry run)"}
+    ]
+    # Operations that would fail are never journaled
+    run = mm.OperationJournal.replay(tmp_path / mm.JOURNAL_FILENAME)
+    states = {
+        operation["source"]: operation["journal_state"]
+        for operation in run["operations"]
+    }
+    assert states == {
+        "core/active/progress_v1.0.md": "recycled",
+        "core/active/activeContext_v1.0.md": "recycled",
+        "core/active/techContext_v1.0.md": "recycled",
+    }
+    for name in ("progress", "activeContext", "techContext"):
+        assert (bank_run / "core" / "archive" / f"{name}_v1.0.md").exists()
+        assert not (active / f"{name}_v1.0.md").exists()
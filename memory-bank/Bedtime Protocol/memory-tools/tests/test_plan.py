@@ -0,0 +1,72 @@
+"""Round-trip and fingerprint tests for compiled execution plans."""
+
+from types import SimpleNamespace
+
+import memory_manager as mm
+
+
+def compile_bank_plan(root, names):
+    operations = []
+    for name in names:
+        source = root / "core" / "active" / name
+        source.write_text(f"# {name}\n\nold version\n", encoding="utf-8")
+        operations.append(
+            {
+                "operation_type": "move",
+                "source": f"core/active/{name}",
+                "destination_folder": "core/archive",
+                "memory_type": "core",
+            }
+        )
+    return mm.compile_plan(operations, root, force_overwrite=True)
+
+
+def test_plan_round_trips_through_its_file(tmp_path, catalog, memory_bank):
+    plan = compile_bank_plan(memory_bank, ["a_v1.0.md", "b_v1.0.md"])
+    plan_path = tmp_path / "plan.json"
+    assert mm.write_plan(plan, plan_path)
+
+    loaded = mm.load_plan(plan_path)
+    assert loaded == plan
+    assert mm.check_plan(loaded) == []
+    assert mm.compute_plan_fingerprint(loaded["operations"]) == loaded["fingerprint"]
+    first = loaded["operations"][0]
+    assert first["destination_path"] == str(memory_bank / "core/archive/a_v1.0.md")
+    assert first["expected_hash"] == mm.compute_file_hash(memory_bank / first["source"])
+
+    # Applying the plan takes its options in place of the command line's
+    args = SimpleNamespace(
+        apply_plan=str(plan_path),
+        organize_by_category=True,
+        category_detection="keyword",
+        force_overwrite=False,
+    )
+    assert mm.load_applied_plan(memory_bank, args) == plan
+    assert (args.organize_by_category, args.force_overwrite) == (False, True)
+    assert mm.load_applied_plan(tmp_path, args) is None
+
+
+def test_fingerprint_changes_when_planned_files_change(catalog, memory_bank):
+    plan = compile_bank_plan(memory_bank, ["a_v1.0.md"])
+    operation = plan["operations"][0]
+
+    # An in-place edit of a source
+    source = operation["source_path"]
+    with open(source, "a", encoding="utf-8") as f:
+        f.write("edited\n")
+    assert mm.compute_plan_fingerprint(plan["operations"]) != plan["fingerprint"]
+
+    # A destination appearing since the plan was compiled
+    plan = compile_bank_plan(memory_bank, ["b_v1.0.md"])
+    operation = plan["operations"][0]
+    with open(operation["destination_path"], "w", encoding="utf-8") as f:
+        f.write("# b\n")
+    assert mm.compute_plan_fingerprint(plan["operations"]) != plan["fingerprint"]
+
+
+def test_unsupported_plan_format_is_rejected(tmp_path, catalog, memory_bank):
+    plan = compile_bank_plan(memory_bank, ["a_v1.0.md"])
+    plan["format"] = mm.PLAN_FORMAT_VERSION + 1
+    plan_path = tmp_path / "plan.json"
+    mm.write_plan(plan, plan_path)
+    assert mm.load_plan(plan_path) is None
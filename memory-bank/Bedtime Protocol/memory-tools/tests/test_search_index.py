@@ -0,0 +1,83 @@
+"""Tests for the BM25 full-text search index."""
+
+import os
+
+import memory_manager as mm
+from conftest import write
+
+
+def result_names(results):
+    return [os.path.basename(result["path"]) for result in results]
+
+
+def test_bm25_ranks_the_denser_match_first(search_index, memory_bank):
+    archive = memory_bank / "semantic" / "archive"
+    write(archive / "sparse.md", "# Sparse\n\nkafka mentioned once among many words\n")
+    write(archive / "dense.md", "# Dense\n\nkafka kafka kafka streams\n")
+    write(archive / "other.md", "# Other\n\nnothing relevant here\n")
+    search_index.sync(memory_bank)
+
+    results = search_index.search("kafka")
+    assert result_names(results) == ["dense.md", "sparse.md"]
+    assert results[0]["score"] > results[1]["score"] > 0
+    assert search_index.search("kafka", memory_type="core") == []
+
+
+def test_index_persists_across_reopening(tmp_path, memory_bank):
+    write(memory_bank / "core" / "active" / "brief.md", "# Brief\n\nzeppelin\n")
+    db_path = tmp_path / "reopened.db"
+    index = mm.SearchIndex(db_path)
+    index.sync(memory_bank)
+    index.close()
+
+    reopened = mm.SearchIndex(db_path)
+    try:
+        assert result_names(reopened.search("zeppelin")) == ["brief.md"]
+    finally:
+        reopened.close()
+
+
+def test_sync_finds_words_added_by_an_in_place_edit(
+    search_index, catalog, memory_bank
+):
+    active = memory_bank / "core" / "active"
+    path = write(active / "activeContext.md", "# Active Context\n\ncurrent focus\n")
+    search_index.sync(memory_bank)
+    assert search_index.search("quetzalcoatl") == []
+
+    directory_mtime = os.stat(active).st_mtime_ns
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("quetzalcoatl\n")
+    file_stat = os.stat(path)
+    os.utime(path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10**9))
+    assert os.stat(active).st_mtime_ns == directory_mtime
+
+    search_index.sync(memory_bank)
+    assert result_names(search_index.search("quetzalcoatl")) == ["activeContext.md"]
+
+
+def test_results_are_printed_at_quiet_verbosity(
+    search_index, memory_bank, monkeypatch, capsys
+):
+    write(memory_bank / "core" / "active" / "brief.md", "# Brief\n\nzeppelin\n")
+    monkeypatch.setattr(mm, "console_verbosity", "quiet")
+
+    mm.search_memory_bank(memory_bank, "zeppelin")
+    assert "1. core/active/brief.md (core) score" in capsys.readouterr().out
+
+
+def test_results_go_through_the_output_capture(
+    search_index, memory_bank, monkeypatch, capsys
+):
+    write(memory_bank / "core" / "active" / "brief.md", "# Brief\n\nzeppelin\n")
+    monkeypatch.setattr(mm, "console_verbosity", "quiet")
+
+    mm._output_capture.lines = []
+    try:
+        mm.search_memory_bank(memory_bank, "zeppelin")
+        lines = mm._output_capture.lines
+    finally:
+        mm._output_capture.lines = None
+    assert capsys.readouterr().out == ""
+    printed = [line for line in lines if isinstance(line, str)]
+    assert any("1. core/active/brief.md (core) score" in line for line in printed)
@@ -0,0 +1,89 @@
+"""Round-trip and recovery tests for the indexed storage log."""
+
+import memory_manager as mm
+
+
+def make_entry(day, file_count, organization_type="reorganization"):
+    return {
+        "date": f"2025-03-{day:02d}",
+        "timestamp": f"2025-03-{day:02d}T01:45:00",
+        "organization_type": organization_type,
+        "file_count": file_count,
+        "categories": {"decisions": [f"note_{n}.md" for n in range(file_count)]},
+    }
+
+
+def add_entry(storage_log, entry):
+    storage_log.append(entry)
+    storage_log.update_markdown()
+
+
+def table_rows(storage_log):
+    lines = storage_log.markdown_file.read_text(encoding="utf-8").splitlines()
+    start = lines.index(mm.STORAGE_LOG_TABLE_SEPARATOR) + 1
+    return lines[start:]
+
+
+def test_entries_round_trip_through_the_index(tmp_path):
+    storage_log = mm.StorageLog(tmp_path)
+    for day in (22, 23, 23):
+        storage_log.append(make_entry(day, day))
+
+    reopened = mm.StorageLog(tmp_path)
+    assert [entry["file_count"] for entry in reopened.query("2025-03-23")] == [23, 23]
+    assert reopened.latest(1)[0]["date"] == "2025-03-23"
+
+    # A missing index is rebuilt from the log
+    storage_log.index_file.unlink()
+    assert len(mm.StorageLog(tmp_path).query("2025-03")) == 3
+
+
+def test_markdown_rows_are_appended_without_rewriting(tmp_path):
+    storage_log = mm.StorageLog(tmp_path)
+    add_entry(storage_log, make_entry(22, 1))
+    before = storage_log.markdown_file.read_text(encoding="utf-8")
+
+    add_entry(storage_log, make_entry(23, 2, "packing"))
+    after = storage_log.markdown_file.read_text(encoding="utf-8")
+    assert after == before + "| 2025-03-23 01:45:00 | packing | 2 | decisions (2) |\n"
+    assert after.startswith("# Storage Log\n")
+
+
+def test_first_format_block_is_replaced_by_the_table(tmp_path):
+    storage_log = mm.StorageLog(tmp_path)
+    storage_log.markdown_file.write_text(
+        "# Storage Log\n\n## Latest Operations\n\n"
+        "<!-- storage-log:begin (generated from storage_log.jsonl) -->\n"
+        "### 2025-03-22: Memory Organization - Reorganization\n"
+        "<!-- storage-log:end -->\n"
+        "### 2025-01-01: Hand-written entry\n",
+        encoding="utf-8",
+    )
+    storage_log.append(make_entry(22, 1))
+    add_entry(storage_log, make_entry(23, 2))
+
+    content = storage_log.markdown_file.read_text(encoding="utf-8")
+    assert "storage-log:end" not in content
+    assert "### 2025-01-01: Hand-written entry\n" in content
+    assert len(table_rows(storage_log)) == 2
+
+
+def test_row_missed_in_a_crash_is_recovered(tmp_path):
+    storage_log = mm.StorageLog(tmp_path)
+    add_entry(storage_log, make_entry(21, 1))
+    # A crash between the log append and the markdown append
+    storage_log.append(make_entry(22, 2))
+
+    add_entry(storage_log, make_entry(23, 3))
+    assert [row.split(" | ")[2] for row in table_rows(storage_log)] == ["1", "2", "3"]
+
+
+def test_storage_log_is_not_reorganized_as_a_loose_file(catalog, memory_bank):
+    archive = memory_bank / "episodic" / "archive"
+    (archive / "decision.md").write_text("# Decision\n\nkafka\n", encoding="utf-8")
+    mm.update_storage_log_with_organization(
+        archive, [{"source": str(archive / "old.md"), "category": "decisions"}]
+    )
+
+    analysis = mm.analyze_long_term_memory(memory_bank)["memory_types"]["episodic"]
+    assert analysis["loose_files"] == ["decision.md"]
@@ -0,0 +1,69 @@
+"""Tests for the freedesktop.org trash backend."""
+
+import os
+import sys
+
+import pytest
+
+import memory_manager as mm
+from conftest import write
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="freedesktop.org trash is POSIX only"
+)
+
+
+@pytest.fixture
+def trash(tmp_path, monkeypatch):
+    """A trash backend whose home trash is in a temporary directory."""
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    return mm.FreedesktopTrash()
+
+
+def test_recycled_file_has_an_info_record(tmp_path, trash):
+    path = write(tmp_path / "bank" / "progress.md")
+
+    assert trash.recycle([path]) == [None]
+    assert not path.exists()
+    assert (trash.home_trash / "files" / "progress.md").read_text() == "note\n"
+    info = (trash.home_trash / "info" / "progress.md.trashinfo").read_text()
+    assert info.startswith("[Trash Info]\n")
+    assert f"Path={path}\n" in info
+    assert "DeletionDate=" in info
+
+
+def test_name_collisions_get_numbered_names(tmp_path, trash):
+    write(trash.home_trash / "files" / "note.md", "already trashed\n")
+    paths = [write(tmp_path / folder / "note.md", folder) for folder in ("a", "b")]
+
+    assert trash.recycle(paths) == [None, None]
+    files = trash.home_trash / "files"
+    assert sorted(os.listdir(files)) == ["note.2.md", "note.3.md", "note.md"]
+    assert (files / "note.2.md").read_text() == "a"
+    assert (files / "note.3.md").read_text() == "b"
+    assert sorted(os.listdir(trash.home_trash / "info")) == [
+        "note.2.md.trashinfo",
+        "note.3.md.trashinfo",
+    ]
+
+
+def test_failed_rename_is_reported_even_if_cleanup_fails(
+    tmp_path, trash, monkeypatch
+):
+    path = write(tmp_path / "bank" / "progress.md")
+
+    def fail(*args, **kwargs):
+        raise PermissionError("denied")
+
+    monkeypatch.setattr(mm.os, "rename", fail)
+    monkeypatch.setattr(mm.os, "unlink", fail)
+    errors = trash.recycle([path])
+    monkeypatch.undo()
+
+    assert errors[0].startswith(f"Error moving {path} to trash")
+    assert path.exists()
+
+
+def test_recycle_backend_is_abstract():
+    with pytest.raises(TypeError):
+        mm.RecycleBackend()
@@ -0,0 +1,64 @@
+"""Tests for version parsing and the version registry."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+import memory_manager as mm
+from conftest import write
+
+
+@pytest.mark.parametrize(
+    "stem, expected",
+    [
+        ("dev_vision_v1.2", ("dev_vision", (1, 2))),
+        ("dev_vision", ("dev_vision", None)),
+        ("progress_v2", ("progress", (2, 0))),
+        ("activeContext_v1.10", ("activeContext", (1, 10))),
+        ("notes_v1.2_draft", ("notes_v1.2_draft", None)),
+    ],
+)
+def test_parse_version_only_counts_a_trailing_suffix(stem, expected):
+    assert mm.parse_version(stem) == expected
+
+
+def test_versions_are_ordered_semantically():
+    names = ["dev_vision_v1.10.md", "dev_vision.md", "dev_vision_v1.9.md"]
+    registry = mm.VersionRegistry(Path("active") / name for name in names)
+
+    assert [path.name for path in registry.versions("dev_vision")] == [
+        "dev_vision.md",
+        "dev_vision_v1.9.md",
+        "dev_vision_v1.10.md",
+    ]
+    assert registry.latest("dev_vision").name == "dev_vision_v1.10.md"
+    # The unversioned base file counts as superseded
+    assert [path.name for path in registry.superseded("dev_vision")] == [
+        "dev_vision.md",
+        "dev_vision_v1.9.md",
+    ]
+    assert registry.next_version("dev_vision") == (1, 11)
+
+
+def test_unknown_and_unversioned_bases():
+    registry = mm.VersionRegistry([Path("active/brief.md")])
+
+    assert registry.latest("brief").name == "brief.md"
+    assert registry.superseded("brief") == []
+    assert registry.next_version("brief") == (1, 0)
+    assert registry.latest("missing") is None
+    assert registry.superseded("missing") == []
+    assert registry.next_version("missing") == (1, 0)
+
+
+def test_registry_follows_changes_to_its_directory(memory_bank):
+    active = memory_bank / "core" / "active"
+    write(active / "progress_v1.0.md")
+    assert mm.get_version_registry(active).latest("progress").name == "progress_v1.0.md"
+
+    directory_mtime = os.stat(active).st_mtime_ns
+    write(active / "progress_v1.1.md")
+    # Make sure the new file changes the mtime even on a coarse clock
+    os.utime(active, ns=(directory_mtime, directory_mtime + 10**9))
+    assert mm.get_version_registry(active).latest("progress").name == "progress_v1.1.md"